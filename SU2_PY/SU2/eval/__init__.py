@@ -1,6 +1,7 @@
 from SU2.eval.functions import function as func
 from SU2.eval.functions import aerodynamics, geometry
 from SU2.eval.gradients import gradient as grad
+from SU2.eval.gradients import gradients as grads
 from SU2.eval.gradients import adjoint, findiff
 from SU2.eval.design import (
     Design,
@@ -10,6 +11,7 @@ from SU2.eval.design import (
     con_dceq,
     con_cieq,
     con_dcieq,
+    batch_gradients,
     touch,
     skip,
 )
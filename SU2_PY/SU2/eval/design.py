@@ -33,6 +33,9 @@ import os, copy
 from .. import io as su2io
 from . import func as su2func
 from . import grad as su2grad
+from . import grads as su2grads
+from .gradients import _adjoint_batch
+from .. import run as su2run
 from ..io import redirect_folder, save_data
 
 # todo:
@@ -331,6 +334,9 @@ def obj_df(dvs, config, state=None):
     state = su2io.State(state)
     grad_method = config.get("GRADIENT_METHOD", "CONTINUOUS_ADJOINT")
 
+    # all gradients of this design at once
+    batch_gradients(grad_method, config, state)
+
     def_objs = config["OPT_OBJECTIVE"]
     objectives = def_objs.keys()
 
@@ -474,6 +480,9 @@ def con_dceq(dvs, config, state=None):
     state = su2io.State(state)
     grad_method = config.get("GRADIENT_METHOD", "CONTINUOUS_ADJOINT")
 
+    # all gradients of this design at once
+    batch_gradients(grad_method, config, state)
+
     def_cons = config["OPT_CONSTRAINT"]["EQUALITY"]
     constraints = def_cons.keys()
 
@@ -573,6 +582,9 @@ def con_dcieq(dvs, config, state=None):
     state = su2io.State(state)
     grad_method = config.get("GRADIENT_METHOD", "CONTINUOUS_ADJOINT")
 
+    # all gradients of this design at once
+    batch_gradients(grad_method, config, state)
+
     def_cons = config["OPT_CONSTRAINT"]["INEQUALITY"]
     constraints = def_cons.keys()
 
@@ -607,6 +619,40 @@ def con_dcieq(dvs, config, state=None):
 #: def obj_dcieq()
 
 
+def batch_gradients(grad_method, config, state):
+    """SU2.eval.batch_gradients(grad_method,config,state)
+
+    Evaluates the objective and constraint gradients of a design
+    together with SU2.eval.grads(), so that their adjoint solutions
+    run concurrently. Does nothing if the core budget set by the
+    environment variable SU2_CORES fits only one run at a time.
+
+    Only adjoint gradients of aerodynamic coefficients are batched,
+    finite difference and geometry gradients are left to the callers.
+    Objectives evaluated one-by-one with their own
+    MARKER_MONITORING are left to SU2.eval.obj_df().
+    """
+
+    def_objs = config.get("OPT_OBJECTIVE", {})
+    def_cons = config.get("OPT_CONSTRAINT", {})
+
+    func_names = []
+    if len(def_objs) == 1:
+        func_names.extend(def_objs.keys())
+    func_names.extend(def_cons.get("EQUALITY", {}).keys())
+    func_names.extend(def_cons.get("INEQUALITY", {}).keys())
+
+    batch = _adjoint_batch(func_names, grad_method, config, state)
+    n_runs, number_part = su2run.split_partitions(config, len(batch))
+    if n_runs < 2:
+        return
+
+    su2grads(batch, grad_method, config, state)
+
+
+#: def batch_gradients()
+
+
 def touch(config, state):
     """SU2.eval.touch(config,state)
     resets state timestamp
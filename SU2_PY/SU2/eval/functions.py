@@ -41,8 +41,8 @@ from ..io import redirect_folder, redirect_output
 # ----------------------------------------------------------------------
 
 
-def function(func_name, config, state=None):
-    """val = SU2.eval.func(func_name,config,state=None)
+def function(func_name, config, state=None, cache=True):
+    """val = SU2.eval.func(func_name,config,state=None,cache=True)
 
     Evaluates the aerodynamics and geometry functions.
 
@@ -55,6 +55,8 @@ def function(func_name, config, state=None):
         Mesh need not be deformed.
         Updates config and state by reference.
         Redundancy if state.FUNCTIONS is not empty.
+        Redundancy if the evaluation cache has the design,
+        see SU2.io.get_evalCache().
 
     Executes in:
         ./DIRECT or ./GEOMETRY
@@ -63,6 +65,7 @@ def function(func_name, config, state=None):
         func_name - SU2 objective function name or 'ALL'
         config    - an SU2 config
         state     - optional, an SU2 state
+        cache     - optional, look up the evaluation cache
 
     Outputs:
         If func_name is 'ALL', returns a Bunch() of
@@ -82,6 +85,22 @@ def function(func_name, config, state=None):
     if multi_objective:
         func_name_string = func_name[0]
 
+    # evaluation cache
+    eval_cache = su2io.get_evalCache()
+    if (
+        eval_cache is not None
+        and not multi_objective
+        and not func_name_string in state["FUNCTIONS"]
+    ):
+        eval_key = su2io.get_evalKey(config)
+        cached = eval_cache.get(eval_key) if cache else None
+        if cached and (
+            func_name_string in cached.get("FUNCTIONS", {}) or func_name == "ALL"
+        ):
+            _fill_cached_functions(state, cached["FUNCTIONS"])
+    else:
+        eval_cache = None
+
     # redundancy check
     if not func_name_string in state["FUNCTIONS"]:
 
@@ -114,6 +133,11 @@ def function(func_name, config, state=None):
                 % func_name
             )
 
+        # store, the evaluation may have deformed the mesh
+        if eval_cache is not None:
+            eval_cache.put(eval_key, "FUNCTIONS", state["FUNCTIONS"])
+            eval_cache.alias(su2io.get_evalKey(config), eval_key)
+
     #: if not redundant
 
     # prepare output
@@ -138,6 +162,32 @@ def function(func_name, config, state=None):
 #: def function()
 
 
+def _fill_cached_functions(state, functions):
+    """fills the FUNCTIONS of state that it does not have from the
+    function values of an evaluation cache entry, and records them
+    in state.CACHED, they come without solution files
+    """
+    if not "CACHED" in state:
+        state["CACHED"] = su2util.ordered_bunch()
+    for key, value in functions.items():
+        if not key in state["FUNCTIONS"]:
+            state["FUNCTIONS"][key] = value
+            state["CACHED"][key] = True
+
+
+def _drop_cached_functions(state):
+    """removes the FUNCTIONS of state that came from the evaluation
+    cache, unless state has a direct solution, so that a solver
+    that needs the direct solution runs it
+    """
+    if "DIRECT" in state["FILES"]:
+        return
+    cached = state.get("CACHED", {})
+    for key in list(cached.keys()):
+        state["FUNCTIONS"].pop(key, None)
+        del cached[key]
+
+
 # ----------------------------------------------------------------------
 #  Aerodynamic Functions
 # ----------------------------------------------------------------------
@@ -207,10 +257,7 @@ def aerodynamics(config, state=None):
     # ----------------------------------------------------
     #  Direct Solution
     # ----------------------------------------------------
-    opt_names = []
-    for key in su2io.historyOutFields:
-        if su2io.historyOutFields[key]["TYPE"] == "COEFFICIENT":
-            opt_names.append(key)
+    opt_names = list(su2io.get_historyIndex().TYPE["COEFFICIENT"])
 
     # redundancy check
     direct_done = all([key in state.FUNCTIONS for key in opt_names])
@@ -264,6 +311,7 @@ def aerodynamics(config, state=None):
             config.get("TIME_DOMAIN", "NO") != "YES"
         ):  # rules out steady state optimization special cases.
             config["RESTART_SOL"] = "NO"  # for shape optimization with restart files.
+    restarted = "DIRECT" in files and config.get("RESTART_SOL", "NO") == "YES"
 
     # files: target equivarea distribution
     if "EQUIV_AREA" in special_cases and "TARGET_EA" in files:
@@ -299,6 +347,9 @@ def aerodynamics(config, state=None):
 
             su2io.restart2solution(konfig, info)
             state.update(info)
+            su2io.record_warm_start(
+                state, "DIRECT", info.HISTORY.DIRECT, restarted, konfig
+            )
 
             # direct files to push
             name = info.FILES["DIRECT"]
@@ -506,10 +557,10 @@ def multipoint(config, state=None, step=1e-2):
     for i in range(len(weight_list)):
         folder[i] = "MULTIPOINT_" + str(i)
 
-    opt_names = []
-    for key in su2io.historyOutFields:
-        if su2io.historyOutFields[key]["TYPE"] == "COEFFICIENT":
-            opt_names.append(key)
+    opt_names = list(su2io.get_historyIndex().TYPE["COEFFICIENT"])
+
+    # mpi ranks per point
+    partitions = su2run.multipoint_partitions(config, len(weight_list))
 
     # ----------------------------------------------------
     #  Initialize
@@ -567,7 +618,12 @@ def multipoint(config, state=None, step=1e-2):
         os.rename(state.FILES.MULTIPOINT_FLOW_META[0], "flow.meta")
         state.FILES["FLOW_META"] = "flow.meta"
 
-    func[0] = aerodynamics(config, state)
+    number_part = config.get("NUMBER_PART", 0)
+    config.NUMBER_PART = partitions[0]
+    try:
+        func[0] = aerodynamics(config, state)
+    finally:
+        config.NUMBER_PART = number_part
 
     # change name of flow.meta back to multipoint name
     if os.path.exists("flow.meta"):
@@ -615,11 +671,6 @@ def multipoint(config, state=None, step=1e-2):
     with redirect_folder(folder[0], pull, link) as push:
         with redirect_output(log_direct):
 
-            konfig = copy.deepcopy(config)
-            ztate = copy.deepcopy(state)
-            # Reset restart to original value
-            konfig["RESTART_SOL"] = restart_sol
-
             dst = os.getcwd()
             dst = os.path.abspath(dst).rstrip("/") + "/" + "DIRECT"
 
@@ -628,12 +679,20 @@ def multipoint(config, state=None, step=1e-2):
             stringlist = string.split()
             subprocess.Popen(stringlist)
 
+    # ----------------------------------------------------
+    #  OTHER POINTS
+    # ----------------------------------------------------
+
+    # the other points start from the config and state
+    # left by the first point
+    points = []
     for i in range(len(weight_list) - 1):
 
         konfig = copy.deepcopy(config)
         ztate = copy.deepcopy(state)
 
         konfig.SOLUTION_FILENAME = solution_flow_list[i + 1]
+        konfig.NUMBER_PART = partitions[i + 1]
 
         # delete direct solution file from previous point
         if "DIRECT" in ztate.FILES:
@@ -680,91 +739,45 @@ def multipoint(config, state=None, step=1e-2):
         if "FLOW_META" in files:
             pull.append(files["FLOW_META"])
 
-        # pull needed files, start folder_1
-        with redirect_folder(folder[i + 1], pull, link) as push:
-            with redirect_output(log_direct):
-
-                # Perform deformation on multipoint mesh
-                if "MULTIPOINT_MESH_FILENAME" in state.FILES:
-                    info = update_mesh(konfig, ztate)
-
-                # Update config values
-                konfig.AOA = aoa_list[i + 1]
-                konfig.SIDESLIP_ANGLE = sideslip_list[i + 1]
-                konfig.MACH_NUMBER = mach_list[i + 1]
-                konfig.REYNOLDS_NUMBER = reynolds_list[i + 1]
-                konfig.FREESTREAM_TEMPERATURE = freestream_temp_list[i + 1]
-                konfig.FREESTREAM_PRESSURE = freestream_press_list[i + 1]
-                konfig.TARGET_CL = target_cl_list[i + 1]
-                orig_marker_outlet = config["MARKER_OUTLET"]
-                orig_marker_outlet = (
-                    orig_marker_outlet.replace("(", "").replace(")", "").split(",")
-                )
-                new_marker_outlet = (
-                    "(" + orig_marker_outlet[0] + "," + outlet_value_list[i + 1] + ")"
-                )
-                konfig.MARKER_OUTLET = new_marker_outlet
-
-                ztate.FUNCTIONS.clear()
-
-                # rename meta data to flow.meta
-                if "FLOW_META" in ztate.FILES:
-                    ztate.FILES["FLOW_META"] = "flow.meta"
-                    os.rename(ztate.FILES.MULTIPOINT_FLOW_META[i + 1], "flow.meta")
-
-                func[i + 1] = aerodynamics(konfig, ztate)
-
-                dst = os.getcwd()
-
-                # revert name of flow.meta file to multipoint name
-                if os.path.exists("flow.meta"):
-                    os.rename("flow.meta", flow_meta_list[i + 1])
-                    ztate.FILES["FLOW_META"] = flow_meta_list[i + 1]
-                    dst_flow_meta = (
-                        os.path.abspath(dst).rstrip("/")
-                        + "/"
-                        + ztate.FILES["FLOW_META"]
-                    )
-                    push.append(ztate.FILES["FLOW_META"])
-
-                # direct files to push
-                dst_direct = (
-                    os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES["DIRECT"]
-                )
-                name = ztate.FILES["DIRECT"]
-                name = su2io.expand_zones(name, konfig)
-                name = su2io.expand_time(name, konfig)
-                push.extend(name)
-
-                if "MULTIPOINT_MESH_FILENAME" in state.FILES:
-                    # Mesh files to push
-                    dst_mesh = (
-                        os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES["MESH"]
-                    )
-                    name = ztate.FILES["MESH"]
-                    name = su2io.expand_part(name, konfig)
-                    push.extend(name)
-
-        # Link direct solution to MULTIPOINT_# folder
-        src = os.getcwd()
-        src_direct = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["DIRECT"]
-
-        # make unix link
-        os.symlink(src_direct, dst_direct)
-
-        # If the mesh doesn't already exist, link it
-        if "MULTIPOINT_MESH_FILENAME" in state.FILES:
-            src_mesh = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["MESH"]
-            if not os.path.exists(src_mesh):
-                os.symlink(src_mesh, dst_mesh)
-
-        # link flow.meta
-        if "MULTIPOINT_FLOW_META" in state.FILES:
-            src_flow_meta = (
-                os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["FLOW_META"]
+        # Update config values
+        konfig.AOA = aoa_list[i + 1]
+        konfig.SIDESLIP_ANGLE = sideslip_list[i + 1]
+        konfig.MACH_NUMBER = mach_list[i + 1]
+        konfig.REYNOLDS_NUMBER = reynolds_list[i + 1]
+        konfig.FREESTREAM_TEMPERATURE = freestream_temp_list[i + 1]
+        konfig.FREESTREAM_PRESSURE = freestream_press_list[i + 1]
+        konfig.TARGET_CL = target_cl_list[i + 1]
+        new_marker_outlet = (
+            "(" + orig_marker_outlet[0] + "," + outlet_value_list[i + 1] + ")"
+        )
+        konfig.MARKER_OUTLET = new_marker_outlet
+
+        points.append(
+            (
+                i + 1,
+                folder[i + 1],
+                konfig,
+                ztate,
+                pull,
+                link,
+                flow_meta_list[i + 1],
+                log_direct,
             )
-            if not os.path.exists(src_flow_meta):
-                os.symlink(src_flow_meta, dst_flow_meta)
+        )
+
+    #: for each other point
+
+    # the other points run concurrently if they fit in the core budget
+    n_workers = _multipoint_workers(partitions)
+    if n_workers > 1:
+        # a failed point stops the others, and their solvers
+        with su2util.EvalPool(n_workers) as pool:
+            results = pool.map(_multipoint_direct, *zip(*points))
+            for i, func_point in enumerate(results):
+                func[i + 1] = func_point
+    else:
+        for i, point in enumerate(points):
+            func[i + 1] = _multipoint_direct(*point)
 
     # Update MULTIPOINT_DIRECT in state.FILES
     state.FILES.MULTIPOINT_DIRECT = solution_flow_list
@@ -795,6 +808,99 @@ def multipoint(config, state=None, step=1e-2):
     return funcs
 
 
+#: def multipoint()
+
+
+def _multipoint_workers(partitions):
+    """n_workers = _multipoint_workers(partitions)
+    number of multipoint points after the first that can run
+    concurrently once the first one has finished, given the mpi
+    ranks of each point and the core budget of SU2.run.core_budget()
+    """
+    if len(partitions) < 2:
+        return 0
+    n_workers = su2run.core_budget() // max(max(partitions[1:]), 1)
+    return min(max(n_workers, 0), len(partitions) - 1)
+
+
+def _multipoint_direct(
+    i_point, folder, konfig, ztate, pull, link, flow_meta, log_direct
+):
+    """func = _multipoint_direct(i_point, folder, konfig, ztate, pull, link, ...)
+    evaluates the aerodynamics of one point of SU2.eval.multipoint()
+    after the first in ./MULTIPOINT_<i_point>, pushes the solution
+    and links it back to the point folder
+    """
+
+    # pull needed files, start folder
+    with redirect_folder(folder, pull, link) as push:
+        with redirect_output(log_direct):
+
+            # Perform deformation on multipoint mesh
+            if "MULTIPOINT_MESH_FILENAME" in ztate.FILES:
+                info = update_mesh(konfig, ztate)
+
+            ztate.FUNCTIONS.clear()
+
+            # rename meta data to flow.meta
+            if "FLOW_META" in ztate.FILES:
+                ztate.FILES["FLOW_META"] = "flow.meta"
+                os.rename(ztate.FILES.MULTIPOINT_FLOW_META[i_point], "flow.meta")
+
+            func = aerodynamics(konfig, ztate)
+
+            dst = os.getcwd()
+
+            # revert name of flow.meta file to multipoint name
+            if os.path.exists("flow.meta"):
+                os.rename("flow.meta", flow_meta)
+                ztate.FILES["FLOW_META"] = flow_meta
+                dst_flow_meta = (
+                    os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES["FLOW_META"]
+                )
+                push.append(ztate.FILES["FLOW_META"])
+
+            # direct files to push
+            dst_direct = os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES["DIRECT"]
+            name = ztate.FILES["DIRECT"]
+            name = su2io.expand_zones(name, konfig)
+            name = su2io.expand_time(name, konfig)
+            push.extend(name)
+
+            if "MULTIPOINT_MESH_FILENAME" in ztate.FILES:
+                # Mesh files to push
+                dst_mesh = os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES["MESH"]
+                name = ztate.FILES["MESH"]
+                name = su2io.expand_part(name, konfig)
+                push.extend(name)
+
+    # Link direct solution to MULTIPOINT_# folder
+    src = os.getcwd()
+    src_direct = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["DIRECT"]
+
+    # make unix link
+    os.symlink(src_direct, dst_direct)
+
+    # If the mesh doesn't already exist, link it
+    if "MULTIPOINT_MESH_FILENAME" in ztate.FILES:
+        src_mesh = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["MESH"]
+        if not os.path.exists(src_mesh):
+            os.symlink(src_mesh, dst_mesh)
+
+    # link flow.meta
+    if "MULTIPOINT_FLOW_META" in ztate.FILES:
+        src_flow_meta = (
+            os.path.abspath(src).rstrip("/") + "/" + ztate.FILES["FLOW_META"]
+        )
+        if not os.path.exists(src_flow_meta):
+            os.symlink(src_flow_meta, dst_flow_meta)
+
+    return copy.deepcopy(func)
+
+
+#: def _multipoint_direct()
+
+
 # ----------------------------------------------------------------------
 #  Geometric Functions
 # ----------------------------------------------------------------------
@@ -33,7 +33,8 @@ import os, sys, shutil, copy, subprocess
 from .. import run as su2run
 from .. import io as su2io
 from .. import util as su2util
-from .functions import function, update_mesh
+from .functions import function, update_mesh, _multipoint_workers
+from .functions import _fill_cached_functions, _drop_cached_functions
 from ..io import redirect_folder, redirect_output
 from SU2.eval import functions
 
@@ -85,6 +86,20 @@ def gradient(func_name, method, config, state=None):
         config.OPT_COMBINE_OBJECTIVE = "NO"
         config.OBJECTIVE_WEIGHT = "1.0"
 
+    # evaluation cache
+    eval_cache = su2io.get_evalCache()
+    cache_section = "GRADIENTS_%s" % method
+    if (
+        eval_cache is not None
+        and type(func_output) != list
+        and func_output != "COMBO"
+        and not func_output in state["GRADIENTS"]
+    ):
+        eval_key = su2io.get_evalKey(config)
+        _cached_gradient(eval_cache, eval_key, cache_section, func_output, state)
+    else:
+        eval_cache = None
+
     # redundancy check
     if not func_output in state["GRADIENTS"]:
 
@@ -128,6 +143,12 @@ def gradient(func_name, method, config, state=None):
         # store
         state["GRADIENTS"].update(grads)
 
+        # store, the evaluation may have deformed the mesh
+        if eval_cache is not None:
+            eval_cache.put(eval_key, "FUNCTIONS", state["FUNCTIONS"])
+            eval_cache.put(eval_key, cache_section, grads)
+            eval_cache.alias(su2io.get_evalKey(config), eval_key)
+
     # if not redundant
 
     # prepare output
@@ -139,6 +160,139 @@ def gradient(func_name, method, config, state=None):
 #: def gradient()
 
 
+def _cached_gradient(eval_cache, eval_key, cache_section, func_output, state):
+    """fills state with the FUNCTIONS and GRADIENTS of the evaluation
+    cache entry eval_key, if its cache_section has func_output
+    """
+    cached = eval_cache.get(eval_key)
+    if cached and func_output in cached.get(cache_section, {}):
+        _fill_cached_functions(state, cached.get("FUNCTIONS", {}))
+        for key, value in cached[cache_section].items():
+            if not key in state["GRADIENTS"]:
+                state["GRADIENTS"][key] = value
+
+
+def gradients(func_names, method, config, state=None):
+    """vals = SU2.eval.grads(func_names,method,config,state=None)
+
+    Evaluates the aerodynamic gradients of several functions
+    of one design.
+
+    Wraps:
+        SU2.eval.gradient()
+
+    Assumptions:
+        Config is already setup for deformation.
+        Mesh need not be deformed.
+        Updates config and state by reference.
+        Redundancy if state.GRADIENTS has the key func_name.
+
+    Concurrency:
+        With an adjoint method, the adjoint solutions of the
+        aerodynamic coefficients run concurrently after one shared
+        direct solution, when the core budget set by the environment
+        variable SU2_CORES allows, see SU2.run.split_partitions().
+        Other gradients are evaluated one after another.
+
+    Executes in:
+        ./ADJOINT_* or ./FINDIFF
+
+    Inputs:
+        func_names - list of SU2 objective function names
+        method     - 'CONTINUOUS_ADJOINT' or 'FINDIFF' or 'DISCRETE_ADJOINT'
+        config     - an SU2 config
+        state      - optional, an SU2 state
+
+    Outputs:
+        A Bunch() with keys of func_names and values of
+        list of floats of gradient values
+    """
+
+    # Initialize
+    state = su2io.State(state)
+
+    # independent adjoint solutions
+    batch = _adjoint_batch(func_names, method, config, state)
+
+    n_runs, number_part = su2run.split_partitions(config, len(batch))
+
+    if n_runs > 1:
+
+        # direct solution, shared by all adjoint solutions,
+        # function values from the evaluation cache come without one
+        _drop_cached_functions(state)
+        function(batch[0], config, state, cache=False)
+
+        # each adjoint solution runs in its own ./ADJOINT_<func_name>
+        jobs = []
+        for func_name in batch:
+            konfig = copy.deepcopy(config)
+            konfig.NUMBER_PART = number_part
+            jobs.append((func_name, method, konfig, copy.deepcopy(state)))
+
+        # a failed adjoint solution stops the others, and their solvers
+        with su2util.EvalPool(n_runs) as pool:
+            results = list(pool.map(_gradient_job, *zip(*jobs)))
+
+        # merge in order, as if run one after another
+        for konfig, ztate in results:
+            konfig.NUMBER_PART = config.get("NUMBER_PART", 0)
+            config.update(konfig)
+            state.update(ztate)
+
+    # remaining gradients
+    grads_out = su2util.ordered_bunch()
+    for func_name in func_names:
+        func_output = func_name
+        if type(func_name) == list:
+            func_output = "COMBO"
+        grads_out[func_output] = gradient(func_name, method, config, state)
+
+    return grads_out
+
+
+#: def gradients()
+
+
+def _adjoint_batch(func_names, method, config, state):
+    """returns the aerodynamic coefficients of func_names whose adjoint
+    gradients state does not have, after looking them up in the
+    evaluation cache, empty if method is not an adjoint method
+    """
+    batch = []
+    if not method in ["CONTINUOUS_ADJOINT", "DISCRETE_ADJOINT"]:
+        return batch
+
+    eval_cache = su2io.get_evalCache()
+    for func_name in func_names:
+        if type(func_name) == list or func_name in batch:
+            continue
+        if not func_name in su2io.historyOutFields:
+            continue
+        if su2io.historyOutFields[func_name]["TYPE"] != "COEFFICIENT":
+            continue
+        if eval_cache is not None and not func_name in state["GRADIENTS"]:
+            _cached_gradient(
+                eval_cache,
+                su2io.get_evalKey(config),
+                "GRADIENTS_%s" % method,
+                func_name,
+                state,
+            )
+        if not func_name in state["GRADIENTS"]:
+            batch.append(func_name)
+
+    return batch
+
+
+def _gradient_job(func_name, method, config, state):
+    """config, state = _gradient_job(func_name, method, config, state)
+    evaluates one gradient of SU2.eval.gradients() in a worker process
+    """
+    gradient(func_name, method, config, state)
+    return config, state
+
+
 # ----------------------------------------------------------------------
 #  Adjoint Gradients
 # ----------------------------------------------------------------------
@@ -210,8 +364,11 @@ def adjoint(func_name, config, state=None):
     #  Direct Solution
     # ----------------------------------------------------
 
+    # function values from the evaluation cache come without a direct solution
+    _drop_cached_functions(state)
+
     # run (includes redundancy checks)
-    function(func_name, config, state)
+    function(func_name, config, state, cache=False)
 
     # ----------------------------------------------------
     #  Adaptation (not implemented)
@@ -280,6 +437,7 @@ def adjoint(func_name, config, state=None):
         ):  # rules out steady state optimization special cases.
             konfig["RESTART_SOL"] = "NO"  # for shape optimization with restart files.
         # Restart solution gets handled just before solver starts for unsteady optimization
+    restarted = ADJ_NAME in files and konfig.get("RESTART_SOL", "NO") == "YES"
 
     # files: target equivarea adjoint weights
     if "EQUIV_AREA" in special_cases:
@@ -335,6 +493,9 @@ def adjoint(func_name, config, state=None):
             su2io.restart2solution(konfig, info)
 
             state.update(info)
+            su2io.record_warm_start(
+                state, ADJ_NAME, info.HISTORY.get(ADJ_NAME), restarted, konfig
+            )
 
             # Gradient Projection
             info = su2run.projection(konfig, state)
@@ -513,10 +674,10 @@ def multipoint(func_name, config, state=None, step=1e-2):
     for i in range(len(weight_list)):
         folder[i] = "MULTIPOINT_" + str(i)
 
-    opt_names = []
-    for key in su2io.historyOutFields:
-        if su2io.historyOutFields[key]["TYPE"] == "COEFFICIENT":
-            opt_names.append(key)
+    opt_names = list(su2io.get_historyIndex().TYPE["COEFFICIENT"])
+
+    # mpi ranks per point
+    partitions = su2run.multipoint_partitions(config, len(weight_list))
 
     # ----------------------------------------------------
     #  Initialize
@@ -573,7 +734,12 @@ def multipoint(func_name, config, state=None, step=1e-2):
         os.rename(flow_meta_list[0], "flow.meta")
         state.FILES["FLOW_META"] = "flow.meta"
 
-    grads[0] = gradient(base_name, "DISCRETE_ADJOINT", config, state)
+    number_part = config.get("NUMBER_PART", 0)
+    config.NUMBER_PART = partitions[0]
+    try:
+        grads[0] = gradient(base_name, "DISCRETE_ADJOINT", config, state)
+    finally:
+        config.NUMBER_PART = number_part
 
     src = os.getcwd()
     src = os.path.abspath(src).rstrip("/") + "/" + ADJ_NAME + "/"
@@ -616,9 +782,6 @@ def multipoint(func_name, config, state=None, step=1e-2):
     with redirect_folder(folder[0], pull, link) as push:
         with redirect_output(log_direct):
 
-            konfig = copy.deepcopy(config)
-            ztate = copy.deepcopy(state)
-
             dst = os.getcwd()
             dst = os.path.abspath(dst).rstrip("/") + "/"
 
@@ -627,6 +790,9 @@ def multipoint(func_name, config, state=None, step=1e-2):
             string_list = string.split()
             subprocess.Popen(string_list)
 
+    # the other points start from the config and state
+    # left by the first point
+    points = []
     for i in range(len(weight_list) - 1):
 
         konfig = copy.deepcopy(config)
@@ -636,6 +802,7 @@ def multipoint(func_name, config, state=None, step=1e-2):
         # Set correct config option names
         konfig.SOLUTION_FILENAME = solution_flow_list[i + 1]
         konfig.SOLUTION_ADJ_FILENAME = solution_adj_list[i + 1]
+        konfig.NUMBER_PART = partitions[i + 1]
 
         # Delete file run in previous case
         if ADJ_NAME in ztate.FILES:
@@ -669,6 +836,7 @@ def multipoint(func_name, config, state=None, step=1e-2):
 
         files = ztate.FILES
         link = []
+        pull = []
         files["DIRECT"] = state.FILES.MULTIPOINT_DIRECT[i + 1]
 
         # files: mesh
@@ -694,51 +862,42 @@ def multipoint(func_name, config, state=None, step=1e-2):
         if "FLOW_META" in files:
             pull.append(files["FLOW_META"])
 
-        # pull needed files, start folder
-        with redirect_folder(folder[i + 1], pull, link) as push:
-            with redirect_output(log_direct):
-
-                # Set the multipoint options
-                konfig.AOA = aoa_list[i + 1]
-                konfig.SIDESLIP_ANGLE = sideslip_list[i + 1]
-                konfig.MACH_NUMBER = mach_list[i + 1]
-                konfig.REYNOLDS_NUMBER = reynolds_list[i + 1]
-                konfig.FREESTREAM_TEMPERATURE = freestream_temp_list[i + 1]
-                konfig.FREESTREAM_PRESSURE = freestream_press_list[i + 1]
-                konfig.TARGET_CL = target_cl_list[i + 1]
-
-                # rename meta data to flow.meta
-                if "FLOW_META" in ztate.FILES:
-                    os.rename(ztate.FILES.MULTIPOINT_FLOW_META[i + 1], "flow.meta")
-                    ztate.FILES["FLOW_META"] = "flow.meta"
-
-                # let's start somethin somthin
-                ztate.GRADIENTS.clear()
-
-                # the gradient
-                grads[i + 1] = gradient(base_name, "DISCRETE_ADJOINT", konfig, ztate)
-
-                # rename meta data to multipoint name
-                if os.path.exists("flow.meta"):
-                    os.rename("flow.meta", flow_meta_list[i + 1])
-
-                # adjoint files to push
-                dst = os.getcwd()
-                dst = os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES[ADJ_NAME]
-                name = ztate.FILES[ADJ_NAME]
-                solution_adj_list[i + 1] = name
-                name = su2io.expand_zones(name, konfig)
-                name = su2io.expand_time(name, konfig)
-                push.extend(name)
-
-        # Link adjoint solution to MULTIPOINT_# folder
-        src = os.getcwd()
-        src = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES[ADJ_NAME]
-
-        # make unix link
-        string = "ln -s " + src + " " + dst
-        string_list = string.split()
-        subprocess.Popen(string_list)
+        # Set the multipoint options
+        konfig.AOA = aoa_list[i + 1]
+        konfig.SIDESLIP_ANGLE = sideslip_list[i + 1]
+        konfig.MACH_NUMBER = mach_list[i + 1]
+        konfig.REYNOLDS_NUMBER = reynolds_list[i + 1]
+        konfig.FREESTREAM_TEMPERATURE = freestream_temp_list[i + 1]
+        konfig.FREESTREAM_PRESSURE = freestream_press_list[i + 1]
+        konfig.TARGET_CL = target_cl_list[i + 1]
+
+        points.append(
+            (
+                i + 1,
+                folder[i + 1],
+                base_name,
+                konfig,
+                ztate,
+                pull,
+                link,
+                flow_meta_list[i + 1],
+                log_direct,
+            )
+        )
+
+    #: for each other point
+
+    # the other points run concurrently if they fit in the core budget
+    n_workers = _multipoint_workers(partitions)
+    if n_workers > 1:
+        # a failed point stops the others, and their solvers
+        with su2util.EvalPool(n_workers) as pool:
+            results = pool.map(_multipoint_adjoint, *zip(*points))
+            for i, (grads_point, adj_name) in enumerate(results):
+                grads[i + 1], solution_adj_list[i + 1] = grads_point, adj_name
+    else:
+        for i, point in enumerate(points):
+            grads[i + 1], solution_adj_list[i + 1] = _multipoint_adjoint(*point)
 
     # Update MULTPOINT_ADJOINT files in state.FILES
     state.FILES[MULTIPOINT_ADJ_NAME] = solution_adj_list
@@ -765,6 +924,62 @@ def multipoint(func_name, config, state=None, step=1e-2):
     return grads_out
 
 
+#: def multipoint()
+
+
+def _multipoint_adjoint(
+    i_point, folder, base_name, konfig, ztate, pull, link, flow_meta, log_direct
+):
+    """grads, adj_name = _multipoint_adjoint(i_point, folder, base_name, konfig, ztate, ...)
+    evaluates the adjoint gradient of one point of SU2.eval.multipoint()
+    after the first in ./MULTIPOINT_<i_point>, pushes the adjoint
+    solution and links it back to the point folder
+    """
+
+    ADJ_NAME = "ADJOINT_" + base_name
+
+    # pull needed files, start folder
+    with redirect_folder(folder, pull, link) as push:
+        with redirect_output(log_direct):
+
+            # rename meta data to flow.meta
+            if "FLOW_META" in ztate.FILES:
+                os.rename(ztate.FILES.MULTIPOINT_FLOW_META[i_point], "flow.meta")
+                ztate.FILES["FLOW_META"] = "flow.meta"
+
+            # let's start somethin somthin
+            ztate.GRADIENTS.clear()
+
+            # the gradient
+            grads = gradient(base_name, "DISCRETE_ADJOINT", konfig, ztate)
+
+            # rename meta data to multipoint name
+            if os.path.exists("flow.meta"):
+                os.rename("flow.meta", flow_meta)
+
+            # adjoint files to push
+            dst = os.getcwd()
+            dst = os.path.abspath(dst).rstrip("/") + "/" + ztate.FILES[ADJ_NAME]
+            name = ztate.FILES[ADJ_NAME]
+            adj_name = name
+            name = su2io.expand_zones(name, konfig)
+            name = su2io.expand_time(name, konfig)
+            push.extend(name)
+
+    # Link adjoint solution to MULTIPOINT_# folder
+    src = os.getcwd()
+    src = os.path.abspath(src).rstrip("/") + "/" + ztate.FILES[ADJ_NAME]
+
+    # make unix link, unless the solution was not pushed
+    if not os.path.lexists(dst):
+        su2io.make_link(src, dst)
+
+    return copy.deepcopy(grads), adj_name
+
+
+#: def _multipoint_adjoint()
+
+
 # ----------------------------------------------------------------------
 #  Finite Difference Gradients
 # ----------------------------------------------------------------------
@@ -789,6 +1004,13 @@ def findiff(config, state=None):
     Executes in:
         ./FINDIFF
 
+    Concurrency:
+        Steps run concurrently when the core budget set by the
+        environment variable SU2_CORES fits more than one run with
+        config.NUMBER_PART processes, see SU2.run.concurrent_runs().
+        Each step then runs in its own folder ./FINDIFF/DV_<i_dv>,
+        numbered with three digits, i.e. DV_000, DV_001, ...
+
     Inputs:
         config - an SU2 config
         state  - optional, an SU2 state
@@ -820,13 +1042,13 @@ def findiff(config, state=None):
         step = 0.001
 
     opt_names = []
+    coefficients = sorted(su2io.get_historyIndex().TYPE["COEFFICIENT"])
     for i in range(config["NZONES"]):
-        for key in sorted(su2io.historyOutFields):
-            if su2io.historyOutFields[key]["TYPE"] == "COEFFICIENT":
-                if config["NZONES"] == 1:
-                    opt_names.append(key)
-                else:
-                    opt_names.append(key + "[" + str(i) + "]")
+        for key in coefficients:
+            if config["NZONES"] == 1:
+                opt_names.append(key)
+            else:
+                opt_names.append(key + "[" + str(i) + "]")
 
     # ----------------------------------------------------
     #  Redundancy Check
@@ -918,34 +1140,71 @@ def findiff(config, state=None):
     if "INV_DESIGN_HEATFLUX" in special_cases and "TARGET_HEATFLUX" in files:
         pull.append(files["TARGET_HEATFLUX"])
 
+    # steps that fit in the core budget at once
+    n_runs = su2run.concurrent_runs(konfig, n_dv)
+
     # output redirection
     with redirect_folder("FINDIFF", pull, link) as push:
         with redirect_output(log_findiff):
 
-            # iterate each dv
-            for i_dv in range(n_dv):
-
-                this_step = step[i_dv]
-                temp_config_name = "config_FINDIFF_%i.cfg" % i_dv
-
+            # setup each dv step
+            def step_setup(i_dv):
                 this_dvs = copy.deepcopy(dvs_base)
                 this_konfig = copy.deepcopy(konfig)
-                this_dvs[i_dv] = this_dvs[i_dv] + this_step
+                this_dvs[i_dv] = this_dvs[i_dv] + step[i_dv]
 
                 this_state = su2io.State()
                 this_state.FILES = copy.deepcopy(state.FILES)
                 this_konfig.unpack_dvs(this_dvs, dvs_base)
 
-                this_konfig.dump(temp_config_name)
+                return this_konfig, this_state
 
-                # Direct Solution, findiff step
-                func_step = function("ALL", this_konfig, this_state)
+            # run steps one at a time in this folder
+            def serial_steps():
+                for i_dv in range(n_dv):
+
+                    temp_config_name = "config_FINDIFF_%i.cfg" % i_dv
+                    this_konfig, this_state = step_setup(i_dv)
+
+                    this_konfig.dump(temp_config_name)
+
+                    # Direct Solution, findiff step
+                    func_step = function("ALL", this_konfig, this_state)
 
-                # remove deform step files
-                meshfiles = this_state.FILES.MESH
-                meshfiles = su2io.expand_part(meshfiles, this_konfig)
-                for name in meshfiles:
-                    os.remove(name)
+                    # remove deform step files
+                    meshfiles = this_state.FILES.MESH
+                    meshfiles = su2io.expand_part(meshfiles, this_konfig)
+                    for name in meshfiles:
+                        os.remove(name)
+
+                    yield func_step
+
+                    os.remove(temp_config_name)
+
+            # run steps concurrently, each in its own folder
+            def parallel_steps():
+                sandbox_pull = [os.path.split(name)[-1] for name in pull]
+                sandbox_link = [os.path.split(name)[-1] for name in link]
+                jobs = []
+                for i_dv in range(n_dv):
+                    this_konfig, this_state = step_setup(i_dv)
+                    jobs.append(
+                        (i_dv, this_konfig, this_state, sandbox_pull, sandbox_link)
+                    )
+                # a failed step stops the running ones, and their solvers
+                with su2util.EvalPool(n_runs) as pool:
+                    for func_step in pool.map(_findiff_step, *zip(*jobs)):
+                        yield func_step
+
+            if n_runs > 1:
+                func_steps = parallel_steps()
+            else:
+                func_steps = serial_steps()
+
+            # iterate each dv
+            for i_dv, func_step in enumerate(func_steps):
+
+                this_step = step[i_dv]
 
                 for key in grads.keys():
                     if key == "VARIABLE" or key == "FINDIFF_STEP":
@@ -966,7 +1225,6 @@ def findiff(config, state=None):
                 #: for each grad name
 
                 su2util.write_plot(grad_filename, output_format, grads)
-                os.remove(temp_config_name)
 
             #: for each dv
 
@@ -985,6 +1243,31 @@ def findiff(config, state=None):
 #: def findiff()
 
 
+def _findiff_step(i_dv, config, state, pull, link):
+    """func_step = _findiff_step(i_dv, config, state, pull, link)
+    runs one finite difference step of SU2.eval.findiff() in its own
+    folder ./DV_<i_dv>, numbered with three digits, i.e. ./DV_000,
+    logging to ./log_FinDiff_<i_dv>.out
+    removes the folder when done, also if the step fails
+    """
+
+    folder = os.path.abspath("DV_%03i" % i_dv)
+    log_step = os.path.abspath("log_FinDiff_%i.out" % i_dv)
+
+    try:
+        with redirect_folder(folder, pull, link, force=True):
+            with redirect_output(log_step):
+                config.dump("config_FINDIFF_%i.cfg" % i_dv)
+                func_step = function("ALL", config, state)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return copy.deepcopy(func_step)
+
+
+#: def _findiff_step()
+
+
 # ----------------------------------------------------------------------
 #  Geometric Gradients
 # ----------------------------------------------------------------------
@@ -1144,10 +1427,7 @@ def directdiff(config, state=None):
     # ----------------------------------------------------
 
     # master redundancy check
-    opt_names = []
-    for key in sorted(su2io.historyOutFields):
-        if su2io.historyOutFields[key]["TYPE"] == "COEFFICIENT":
-            opt_names.append(key)
+    opt_names = sorted(su2io.get_historyIndex().TYPE["COEFFICIENT"])
 
     directdiff_todo = all([key in state.GRADIENTS for key in opt_names])
     if directdiff_todo:
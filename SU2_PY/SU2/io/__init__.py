@@ -3,8 +3,14 @@
 from .tools import *
 from .redirect import output as redirect_output
 from .redirect import folder as redirect_folder
+from .transfer import transfer_files, transfer_methods, transfer_report
 from .data import load_data, save_data
 from .filelock import filelock
+from .history import HistoryFollower
+from .cache import EvalCache, get_evalCache, get_evalKey
+from .store import DesignStore
+from .warmstart import seed_warm_start, record_warm_start, warm_start_converged
+from .warmstart import restart_points, mesh_points
 
 from .config import Config
 from .state import State_Factory as State
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+
+## \file cache.py
+#  \brief python package for a persistent cache of evaluated designs
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, sys, copy, time, hashlib, pickle, tempfile
+
+from .filelock import filelock
+from .tools import expand_part, replace_file
+
+# ----------------------------------------------------------------------
+#  Evaluation Cache Setup
+# ----------------------------------------------------------------------
+#
+#  The cache is enabled by pointing the environment variable
+#  SU2_EVAL_CACHE to a folder, which can be shared between projects.
+#  SU2_EVAL_CACHE_SIZE sets its maximum size in MB, default 1024.
+
+# config parameters that do not change the evaluated values,
+# or that are changed by the evaluation itself
+_cache_ignored_keys = [
+    "NUMBER_PART",
+    "AVAILABLE_PROC",
+    "CONSOLE",
+    "RESTART_SOL",
+    "HISTORY_OUTPUT",
+    "SCREEN_OUTPUT",
+    "OUTPUT_FILES",
+    "MESH_FILENAME",  # hashed by content instead
+    "DV_VALUE",
+    "GRADIENT_METHOD",
+    "OPT_COMBINE_OBJECTIVE",  # combined objectives are not cached
+    "OBJECTIVE_WEIGHT",
+    "OPT_ITERATIONS",
+    "OPT_ACCURACY",
+    "OPT_BOUND_UPPER",
+    "OPT_BOUND_LOWER",
+    "OPT_RELAX_FACTOR",
+    "OPT_GRADIENT_FACTOR",
+]
+
+_evalCaches = {}
+
+# largest size of an alias entry, bytes
+_aliasSize = 256
+
+
+def get_evalCache():
+    """cache = get_evalCache()
+    returns the EvalCache set by the environment variable
+    SU2_EVAL_CACHE, or None if the cache is not enabled
+    """
+
+    folder = os.environ.get("SU2_EVAL_CACHE", "")
+    if not folder:
+        return None
+    size = float(os.environ.get("SU2_EVAL_CACHE_SIZE", 1024))
+
+    key = (os.path.abspath(folder), size)
+    if not key in _evalCaches:
+        _evalCaches[key] = EvalCache(key[0], max_bytes=int(size * 1024 * 1024))
+
+    return _evalCaches[key]
+
+
+# ----------------------------------------------------------------------
+#  Evaluation Cache Keys
+# ----------------------------------------------------------------------
+
+_meshHashes = {}
+_meshSettleTime = 2.0
+
+
+def get_meshHash(config):
+    """returns a content hash of the mesh files of config,
+    or None if they do not exist
+    """
+
+    names = expand_part(config["MESH_FILENAME"], config)
+
+    mesh_hash = hashlib.sha1()
+    for name in names:
+        if not os.path.exists(name):
+            return None
+
+        # hashed files are remembered by path and modification time,
+        # unless they were modified within the last seconds, when a
+        # rewrite may not change the modification time
+        path = os.path.abspath(name)
+        stat = os.stat(path)
+        stamp = (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        file_hash = _meshHashes.get(stamp)
+        if file_hash is None:
+            file_hash = hashlib.sha1()
+            with open(path, "rb") as mesh_file:
+                for block in iter(lambda: mesh_file.read(1 << 20), b""):
+                    file_hash.update(block)
+            file_hash = file_hash.hexdigest()
+            if time.time() - stat.st_mtime > _meshSettleTime:
+                _meshHashes[stamp] = file_hash
+
+        mesh_hash.update(file_hash.encode())
+
+    return mesh_hash.hexdigest()
+
+
+def get_evalKey(config):
+    """key = get_evalKey(config)
+    returns a hash of the config parameters that affect the evaluated
+    values, including the design vector, and of the mesh contents.
+    returns None if the mesh cannot be found.
+    """
+
+    mesh_hash = get_meshHash(config)
+    if mesh_hash is None:
+        return None
+
+    items = [("MESH", mesh_hash)]
+    for key in config.keys():
+        if key in _cache_ignored_keys:
+            continue
+        items.append((key, _canonical(dict.__getitem__(config, key))))
+    items.sort()
+
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def _canonical(value):
+    """converts a config value into nested lists and tuples
+    with a stable repr
+    """
+    if isinstance(value, dict):
+        items = [(k, _canonical(v)) for k, v in value.items()]
+        if type(value) is dict:
+            items.sort()
+        return ("dict", items)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "tolist"):
+        return _canonical(value.tolist())
+    return value
+
+
+# ----------------------------------------------------------------------
+#  Evaluation Cache Class
+# ----------------------------------------------------------------------
+
+
+class EvalCache(object):
+    """cache = SU2.io.EvalCache(folder, max_bytes=1<<30)
+
+    Persistent cache of evaluated FUNCTIONS and GRADIENTS,
+    stored as one pickle per design key in folder.
+
+    Methods:
+        get(key)                 - returns the cached entry, or None
+        put(key, section, data)  - merges data into a section of the entry
+        alias(key, target)       - makes key refer to the entry of target
+
+    Entries are dictionaries with the sections FUNCTIONS and
+    GRADIENTS_<method>. The least recently used entries, and the
+    aliases of them, are removed when the folder grows above
+    max_bytes. The size of the folder is counted from the writes
+    of this process, and read from the folder at every
+    scan_interval-th write, to see the writes of other processes.
+    """
+
+    scan_interval = 64
+
+    def __init__(self, folder, max_bytes=1 << 30):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._bytes = None
+        self._writes = 0
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def _filename(self, key):
+        return os.path.join(self.folder, key + ".pkl")
+
+    def _read(self, key):
+        try:
+            with open(self._filename(key), "rb") as cache_file:
+                return pickle.load(cache_file)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _write(self, key, entry):
+        data = pickle.dumps(entry, -1)
+        handle, temp_filename = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as cache_file:
+                cache_file.write(data)
+            replace_file(temp_filename, self._filename(key))
+        except:
+            os.remove(temp_filename)
+            raise
+        return len(data)
+
+    def _count(self, size):
+        """counts the bytes written, an entry written over counts
+        again, until the next scan of the folder
+        """
+        self._writes += 1
+        if self._bytes is None or self._writes >= self.scan_interval:
+            self.evict()
+            return
+        self._bytes += size
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def _resolve(self, key):
+        entry = self._read(key)
+        if entry is not None and "ALIAS" in entry:
+            key = entry["ALIAS"]
+            entry = self._read(key)
+        return key, entry
+
+    def get(self, key):
+        """returns the cached entry of key, or None"""
+        if key is None:
+            return None
+        target, entry = self._resolve(key)
+        if entry is not None:
+            # mark as recently used, with the alias
+            for name in set([key, target]):
+                try:
+                    os.utime(self._filename(name))
+                except OSError:
+                    pass
+        return entry
+
+    def put(self, key, section, data):
+        """merges data into section of the entry of key"""
+        if key is None:
+            return
+        key, entry = self._resolve(key)
+        with filelock(self._filename(key)):
+            entry = self._read(key) or {}
+            entry.setdefault(section, {}).update(copy.deepcopy(dict(data)))
+            size = self._write(key, entry)
+        self._count(size)
+
+    def alias(self, key, target):
+        """makes key refer to the entry of target"""
+        if key is None or target is None or key == target:
+            return
+        target, entry = self._resolve(target)
+        if key != target:
+            self._count(self._write(key, {"ALIAS": target}))
+
+    def evict(self):
+        """removes the least recently used entries while the
+        cache is larger than max_bytes, and the aliases of them
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(".pkl"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        self._writes = 0
+        self._bytes = total
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        removed = set()
+        for mtime, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            removed.add(path)
+            total -= size
+            if total <= 0.9 * self.max_bytes:
+                break
+
+        # aliases are small entries, only these are read
+        for mtime, size, path in entries:
+            if size > _aliasSize or path in removed:
+                continue
+            entry = self._read(os.path.basename(path)[:-4])
+            if entry is None or not "ALIAS" in entry:
+                continue
+            if self._filename(entry["ALIAS"]) in removed:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+
+        self._bytes = total
+
+
+#: class EvalCache
@@ -29,10 +29,10 @@
 #  Imports
 # ----------------------------------------------------------------------
 
-import os, sys, shutil, copy
+import os, io, sys, shutil, copy, hashlib, tempfile
 from .historyMap import history_header_map as historyOutFields
 import numpy as np
-from ..util import ordered_bunch, switch
+from ..util import ordered_bunch
 from .tools import *
 from .config_options import *
 
@@ -40,6 +40,9 @@ from ..util.ordered_dict import OrderedDict
 
 inf = 1.0e20
 
+# values that copies of a Config share instead of copying
+_immutable_types = (str, bytes, int, float, complex, bool, type(None))
+
 
 # ----------------------------------------------------------------------
 #  Configuration Class
@@ -69,12 +72,25 @@ class Config(ordered_bunch):
         unpack_dvs() - unpack a design vector
         diff()       - returns the difference from another config
         dist()       - computes the distance from another config
+
+    copy.deepcopy(config) is copy-on-write. A list or dictionary
+    that the config has not handed out, e.g. one read from the config
+    file, is shared with the copy, and each config copies it when it
+    first hands it out, i.e. config.DV_PARAM, as it may be changed in
+    place. Values handed out before, or set from outside, may still
+    be referenced and changed, they are copied at once. Dumping,
+    writing or comparing a config never copies shared values.
     """
 
     _filename = "config.cfg"
 
     def __init__(self, *args, **kwarg):
 
+        # keys of values shared with copies, and keys of values that
+        # may be referenced outside, see __deepcopy__()
+        self._shared = {}
+        self._exposed = set()
+
         # look for filename in inputs
         if args and isinstance(args[0], str):
             filename = args[0]
@@ -104,15 +120,16 @@ class Config(ordered_bunch):
             histFields = self.get("HISTORY_OUTPUT")
             diff_objective = self.get("OBJECTIVE_FUNCTION")
             constrFuncFields = self.get("OPT_CONSTRAINT")
+            groups = get_historyIndex().GROUP
 
             # OPT_OBJECTIVES
             if bool(objFuncsFields):
                 for key in objFuncsFields:
-                    tavg_keyGroup = "TAVG_" + historyOutFields[key]["GROUP"]
+                    tavg_keyGroup = "TAVG_" + groups[key]
                     if not tavg_keyGroup in histFields:
                         histFields.append(tavg_keyGroup)
 
-                    dtavg_keyGroup = "D_TAVG_" + historyOutFields[key]["GROUP"]
+                    dtavg_keyGroup = "D_TAVG_" + groups[key]
                     if not dtavg_keyGroup in histFields:
                         histFields.append(dtavg_keyGroup)
 
@@ -121,17 +138,17 @@ class Config(ordered_bunch):
                 for key in constrFuncFields:
                     eqIneqConstrFunc = constrFuncFields.get(key)
                     for key_inner in eqIneqConstrFunc:
-                        tavg_keyGroup = "TAVG_" + historyOutFields[key_inner]["GROUP"]
+                        tavg_keyGroup = "TAVG_" + groups[key_inner]
                         if not tavg_keyGroup in histFields:
                             histFields.append(tavg_keyGroup)
 
             # DIRECT_DIFF Field
-            if diff_objective in historyOutFields:
-                tavg_keyGroup = "TAVG_" + historyOutFields[diff_objective]["GROUP"]
+            if diff_objective in groups:
+                tavg_keyGroup = "TAVG_" + groups[diff_objective]
                 if not tavg_keyGroup in histFields:
                     histFields.append(tavg_keyGroup)
 
-                dtavg_keyGroup = "D_TAVG_" + historyOutFields[diff_objective]["GROUP"]
+                dtavg_keyGroup = "D_TAVG_" + groups[diff_objective]
                 if not dtavg_keyGroup in histFields:
                     histFields.append(dtavg_keyGroup)
 
@@ -141,6 +158,8 @@ class Config(ordered_bunch):
         """reads from a config file"""
         konfig = read_config(filename)
         self.update(konfig)
+        # the parsed values are referenced by this config only
+        self._exposed.difference_update(konfig.keys())
 
     def write(self, filename=""):
         """updates an existing config file"""
@@ -163,9 +182,108 @@ class Config(ordered_bunch):
 
     def __getitem__(self, k):
         try:
-            return super(Config, self).__getitem__(k)
+            value = super(Config, self).__getitem__(k)
         except KeyError:
             raise KeyError("Config parameter not found: %s" % k)
+        if not isinstance(value, _immutable_types):
+            if k in self._shared:
+                value = self._own(k, value)
+            self._exposed.add(k)
+        return value
+
+    def __setitem__(self, k, v):
+        self._unshare(k)
+        super(Config, self).__setitem__(k, v)
+        if isinstance(v, _immutable_types):
+            self._exposed.discard(k)
+        else:
+            self._exposed.add(k)
+
+    def __delitem__(self, k):
+        self._unshare(k)
+        self._exposed.discard(k)
+        super(Config, self).__delitem__(k)
+
+    def __contains__(self, k):
+        return dict.__contains__(self, k) or super(Config, self).__contains__(k)
+
+    def get(self, k, default=None):
+        if dict.__contains__(self, k):
+            return self[k]
+        return default
+
+    def _own(self, k, value):
+        """copies the shared value of k, unless no other config
+        shares it anymore, and returns it
+        """
+        share = self._shared.pop(k)
+        if share[0] > 1:
+            share[0] -= 1
+            value = copy.deepcopy(value)
+            dict.__setitem__(self, k, value)
+        return value
+
+    def _unshare(self, k):
+        """drops the share of k, its value is replaced or removed"""
+        share = self._shared.pop(k, None)
+        if share is not None:
+            share[0] -= 1
+
+    def _join(self, konfig, k):
+        """lets konfig share the value of k, each share counts
+        the configs that hold the value
+        """
+        share = self._shared.get(k)
+        if share is None:
+            share = self._shared[k] = [1]
+        share[0] += 1
+        konfig._shared[k] = share
+
+    def __deepcopy__(self, memo):
+        """copy-on-write copy, see the class notes"""
+        konfig = Config()
+        konfig._filename = self._filename
+        memo[id(self)] = konfig
+
+        for key in self.keys():
+            value = dict.__getitem__(self, key)
+            if isinstance(value, _immutable_types):
+                pass
+            elif key in self._exposed:
+                value = copy.deepcopy(value, memo)
+            else:
+                self._join(konfig, key)
+            OrderedDict.__setitem__(konfig, key, value)
+
+        return konfig
+
+    def __copy__(self):
+        """shallow copy, shared values stay shared"""
+        konfig = Config()
+        konfig._filename = self._filename
+
+        for key in self.keys():
+            value = dict.__getitem__(self, key)
+            if isinstance(value, _immutable_types):
+                pass
+            elif key in self._shared:
+                self._join(konfig, key)
+            else:
+                self._exposed.add(key)
+                konfig._exposed.add(key)
+            OrderedDict.__setitem__(konfig, key, value)
+
+        return konfig
+
+    def __reduce__(self):
+        """pickles the values without copying the shared ones"""
+        items = [[k, dict.__getitem__(self, k)] for k in self]
+        inst_dict = vars(self).copy()
+        for k in vars(OrderedDict()):
+            inst_dict.pop(k, None)
+        inst_dict.pop("_shared", None)
+        inst_dict.pop("_exposed", None)
+        return (self.__class__, (items,), inst_dict)
 
     def unpack_dvs(self, dv_new, dv_old=None):
         """updates config with design variable vectors
@@ -219,16 +337,20 @@ class Config(ordered_bunch):
         self.update({"DV_VALUE_OLD": dv_old, "DV_VALUE_NEW": dv_new})
 
     def __eq__(self, konfig):
-        return super(Config, self).__eq__(konfig)
+        if isinstance(konfig, OrderedDict):
+            return list(self) == list(konfig) and all(
+                dict.__getitem__(self, k) == dict.__getitem__(konfig, k) for k in self
+            )
+        return dict.__eq__(self, konfig)
 
     def __ne__(self, konfig):
         return super(Config, self).__ne__(konfig)
 
     def local_files(self):
         """removes path prefix from all *_FILENAME params"""
-        for key, value in self.items():
+        for key in self.keys():
             if key.split("_")[-1] == "FILENAME":
-                self[key] = os.path.basename(value)
+                self[key] = os.path.basename(dict.__getitem__(self, key))
 
     def diff(self, konfig):
         """compares self to another config
@@ -252,8 +374,8 @@ class Config(ordered_bunch):
         konfig_diff = Config()
 
         for key in keys:
-            value1 = self.get(key, None)
-            value2 = konfig.get(key, None)
+            value1 = dict.get(self, key, None)
+            value2 = dict.get(konfig, key, None)
             if not value1 == value2:
                 konfig_diff[key] = [value1, value2]
 
@@ -309,8 +431,8 @@ class Config(ordered_bunch):
 
     def __str__(self):
         output = "Config: %s" % self._filename
-        for k, v in self.items():
-            output += "\n    %s= %s" % (k, v)
+        for k in self.keys():
+            output += "\n    %s= %s" % (k, dict.__getitem__(self, k))
         return output
 
 
@@ -323,19 +445,70 @@ class Config(ordered_bunch):
 
 
 def read_config(filename):
-    """reads a config file"""
+    """reads a config file
+
+    Parsed files are cached for the process, keyed by the hash of
+    their content. Repeated reads of the same content, in this or
+    another file, return a copy of the cached dictionary.
+    """
+
+    with open(filename, "rb") as input_file:
+        content = input_file.read()
+    content_hash = hashlib.sha1(content).hexdigest()
+
+    data_dict = _config_cache.pop(content_hash, None)
+    if data_dict is None:
+        data_dict = parse_config(content.decode().splitlines())
+
+    # store as the newest entry, dropping the oldest when full
+    while len(_config_cache) >= _config_cache_size:
+        del _config_cache[next(iter(_config_cache))]
+    _config_cache[content_hash] = data_dict
+
+    return _copy_parsed(data_dict)
+
+
+#: def read_config()
+
+
+def clear_config_cache():
+    """empties the process-wide cache of parsed config files"""
+    _config_cache.clear()
+
+
+def _copy_parsed(value):
+    """copies the containers of parsed config data,
+    the strings and numbers inside are immutable and shared
+    """
+    if isinstance(value, OrderedDict):
+        the_copy = OrderedDict()
+        for key, item in value.items():
+            the_copy[key] = _copy_parsed(item)
+        return the_copy
+    if isinstance(value, dict):
+        return {key: _copy_parsed(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_parsed(item) for item in value]
+    return value
+
+
+_config_cache = {}
+_config_cache_size = 64
+
+
+def parse_config(lines):
+    """parses the lines of a config file"""
 
     # initialize output dictionary
     data_dict = OrderedDict()
 
-    input_file = open(filename)
-
     # process each line
-    while 1:
+    n_lines = len(lines)
+    i_line = 0
+    while i_line < n_lines:
         # read the line
-        line = input_file.readline()
-        if not line:
-            break
+        line = lines[i_line]
+        i_line += 1
 
         # remove line returns
         line = line.strip("\r\n").strip()
@@ -352,9 +525,12 @@ def read_config(filename):
         # If there is a statement after a cont. char
         # throw an error. ---*/
 
-        while line[0].endswith("\\") or len(line.split("\\")) > 1:
-            tmp_line = input_file.readline()
-            tmp_line = tmp_line.strip()
+        while "\\" in line:
+            if i_line < n_lines:
+                tmp_line = lines[i_line].strip()
+                i_line += 1
+            else:
+                tmp_line = ""
             assert len(tmp_line.split("=")) <= 1, (
                 "Statement found after line "
                 "continuation character in config file %s" % tmp_line
@@ -371,348 +547,13 @@ def read_config(filename):
         assert this_param not in data_dict, (
             "Config file has multiple specifications of %s" % this_param
         )
-        for case in switch(this_param):
-
-            # comma delimited lists of strings with or without paren's
-            if (
-                case("MARKER_EULER")
-                or case("MARKER_FAR")
-                or case("MARKER_PLOTTING")
-                or case("MARKER_MONITORING")
-                or case("MARKER_SYM")
-                or case("DV_KIND")
-            ):
-                # remove white space
-                this_value = "".join(this_value.split())
-                # remove parens
-                this_value = this_value.strip("()")
-                # split by comma
-                data_dict[this_param] = this_value.split(",")
-                break
-
-            # semicolon delimited lists of comma delimited lists of floats
-            if case("DV_PARAM"):
-                # remove white space
-                info_General = "".join(this_value.split())
-                # split by semicolon
-                info_General = info_General.split(";")
-                # build list of dv params, convert string to float
-                dv_Parameters = []
-                dv_FFDTag = []
-                dv_Size = []
-
-                for this_dvParam in info_General:
-                    this_dvParam = this_dvParam.strip("()")
-                    this_dvParam = this_dvParam.split(",")
-                    this_dvSize = 1
-
-                    # if FFD change the first element to work with numbers and float(x)
-                    if data_dict["DV_KIND"][0] in [
-                        "FFD_SETTING",
-                        "FFD_ANGLE_OF_ATTACK",
-                        "FFD_CONTROL_POINT",
-                        "FFD_NACELLE",
-                        "FFD_GULL",
-                        "FFD_TWIST",
-                        "FFD_ROTATION",
-                        "FFD_CAMBER",
-                        "FFD_THICKNESS",
-                        "FFD_CONTROL_POINT_2D",
-                        "FFD_CAMBER_2D",
-                        "FFD_THICKNESS_2D",
-                    ]:
-                        this_dvFFDTag = this_dvParam[0]
-                        this_dvParam[0] = "0"
-                    else:
-                        this_dvFFDTag = []
-
-                    if not data_dict["DV_KIND"][0] in ["NO_DEFORMATION"]:
-                        this_dvParam = [float(x) for x in this_dvParam]
-
-                    if data_dict["DV_KIND"][0] in ["FFD_CONTROL_POINT_2D"]:
-                        if this_dvParam[3] == 0 and this_dvParam[4] == 0:
-                            this_dvSize = 2
-
-                    if data_dict["DV_KIND"][0] in ["FFD_CONTROL_POINT"]:
-                        if (
-                            this_dvParam[4] == 0
-                            and this_dvParam[5] == 0
-                            and this_dvParam[6] == 0
-                        ):
-                            this_dvSize = 3
-
-                    dv_FFDTag = dv_FFDTag + [this_dvFFDTag]
-                    dv_Parameters = dv_Parameters + [this_dvParam]
-                    dv_Size = dv_Size + [this_dvSize]
-
-                # store in a dictionary
-                dv_Definitions = {
-                    "FFDTAG": dv_FFDTag,
-                    "PARAM": dv_Parameters,
-                    "SIZE": dv_Size,
-                }
 
-                data_dict[this_param] = dv_Definitions
-                break
-
-            # comma delimited lists of floats
-            if case("DV_VALUE_OLD") or case("DV_VALUE_NEW") or case("DV_VALUE"):
-                # remove white space
-                this_value = "".join(this_value.split())
-                # split by comma, map to float, store in dictionary
-                data_dict[this_param] = list(map(float, this_value.split(",")))
-                break
-
-            # float parameters
-            if (
-                case("MACH_NUMBER")
-                or case("AOA")
-                or case("FIN_DIFF_STEP")
-                or case("CFL_NUMBER")
-                or case("HB_PERIOD")
-                or case("WRT_SOL_FREQ")
-            ):
-                data_dict[this_param] = float(this_value)
-                break
-
-            # int parameters
-            if (
-                case("NUMBER_PART")
-                or case("AVAILABLE_PROC")
-                or case("ITER")
-                or case("TIME_INSTANCES")
-                or case("UNST_ADJOINT_ITER")
-                or case("ITER_AVERAGE_OBJ")
-                or case("INNER_ITER")
-                or case("OUTER_ITER")
-                or case("TIME_ITER")
-                or case("ADAPT_CYCLES")
-            ):
-                data_dict[this_param] = int(this_value)
-                break
-
-            if case("OUTPUT_FILES"):
-                data_dict[this_param] = this_value.strip("()").split(",")
-                data_dict[this_param] = [i.strip(" ") for i in data_dict[this_param]]
-                break
-            if case("CONFIG_LIST"):
-                data_dict[this_param] = this_value.strip("()").split(",")
-                data_dict[this_param] = [i.strip(" ") for i in data_dict[this_param]]
-                break
-            if case("HISTORY_OUTPUT"):
-                data_dict[this_param] = this_value.strip("()").split(",")
-                data_dict[this_param] = [i.strip(" ") for i in data_dict[this_param]]
-                break
-
-            # unitary design variable definition
-            if case("DEFINITION_DV"):
-                # remove white space
-                this_value = "".join(this_value.split())
-                # split into unitary definitions
-                info_Unitary = this_value.split(";")
-                # process each Design Variable
-                dv_Kind = []
-                dv_Scale = []
-                dv_Markers = []
-                dv_FFDTag = []
-                dv_Parameters = []
-                dv_Size = []
-
-                for this_General in info_Unitary:
-                    if not this_General:
-                        continue
-                    # split each unitary definition into one general definition
-                    info_General = this_General.strip("()").split(
-                        "|"
-                    )  # check for needed strip()?
-                    # split information for dv Kinds
-                    info_Kind = info_General[0].split(",")
-                    # pull processed dv values
-                    this_dvKind = get_dvKind(int(info_Kind[0]))
-                    this_dvScale = float(info_Kind[1])
-                    this_dvMarkers = info_General[1].split(",")
-                    this_dvSize = 1
-
-                    if this_dvKind == "MACH_NUMBER" or this_dvKind == "AOA":
-                        this_dvParameters = []
-                    else:
-                        this_dvParameters = info_General[2].split(",")
-                        # if FFD change the first element to work with numbers and float(x), save also the tag
-                        if this_dvKind in [
-                            "FFD_SETTING",
-                            "FFD_ANGLE_OF_ATTACK",
-                            "FFD_CONTROL_POINT",
-                            "FFD_NACELLE",
-                            "FFD_GULL",
-                            "FFD_TWIST",
-                            "FFD_TWIST_ANGLE",
-                            "FFD_ROTATION",
-                            "FFD_CAMBER",
-                            "FFD_THICKNESS",
-                            "FFD_CONTROL_POINT_2D",
-                            "FFD_CAMBER_2D",
-                            "FFD_THICKNESS_2D",
-                        ]:
-                            this_dvFFDTag = this_dvParameters[0]
-                            this_dvParameters[0] = "0"
-                        else:
-                            this_dvFFDTag = []
-
-                        this_dvParameters = [float(x) for x in this_dvParameters]
-
-                        if this_dvKind in ["FFD_CONTROL_POINT_2D"]:
-                            if this_dvParameters[3] == 0 and this_dvParameters[4] == 0:
-                                this_dvSize = 2
-
-                        if this_dvKind in ["FFD_CONTROL_POINT"]:
-                            if (
-                                this_dvParameters[4] == 0
-                                and this_dvParameters[5] == 0
-                                and this_dvParameters[6] == 0
-                            ):
-                                this_dvSize = 3
-
-                    # add to lists
-                    dv_Kind = dv_Kind + [this_dvKind]
-                    dv_Scale = dv_Scale + [this_dvScale]
-                    dv_Markers = dv_Markers + [this_dvMarkers]
-                    dv_FFDTag = dv_FFDTag + [this_dvFFDTag]
-                    dv_Parameters = dv_Parameters + [this_dvParameters]
-                    dv_Size = dv_Size + [this_dvSize]
-                # store in a dictionary
-                dv_Definitions = {
-                    "KIND": dv_Kind,
-                    "SCALE": dv_Scale,
-                    "MARKER": dv_Markers,
-                    "FFDTAG": dv_FFDTag,
-                    "PARAM": dv_Parameters,
-                    "SIZE": dv_Size,
-                }
-
-                # save to output dictionary
-                data_dict[this_param] = dv_Definitions
-                break
-
-            # unitary objective definition
-            if case("OPT_OBJECTIVE"):
-                # remove white space
-                this_value = "".join(this_value.split())
-                # split by ;
-                this_def = OrderedDict()
-                this_value = this_value.split(";")
-
-                for this_obj in this_value:
-                    # split by scale
-                    this_obj = this_obj.split("*")
-                    this_name = this_obj[0]
-                    this_scale = 1.0
-                    if len(this_obj) > 1:
-                        this_scale = float(this_obj[1])
-                    # check for penalty-based constraint function
-                    for this_sgn in ["<", ">", "="]:
-                        if this_sgn in this_name:
-                            break
-                    this_obj = this_name.strip("()").split(this_sgn)
-                    if len(this_obj) > 1:
-                        this_type = this_sgn
-                        this_val = this_obj[1]
-                    else:
-                        this_type = "DEFAULT"
-                        this_val = 0.0
-                    this_name = this_obj[0]
-                    # Print an error and exit if the same key appears twice
-                    if this_name in this_def:
-                        raise SystemExit(
-                            "Multiple occurrences of the same objective in the OPT_OBJECTIVE definition are not currently supported. To evaluate one objective over multiple surfaces, list the objective once."
-                        )
-                    # Set up dict for objective, including scale, whether it is a penalty, and constraint value
-                    this_def.update(
-                        {
-                            this_name: {
-                                "SCALE": this_scale,
-                                "OBJTYPE": this_type,
-                                "VALUE": this_val,
-                            }
-                        }
-                    )
-                    # OPT_OBJECTIVE has to appear after MARKER_MONITORING in the .cfg, maybe catch that here
-                    if len(data_dict["MARKER_MONITORING"]) > 1:
-                        this_def[this_name]["MARKER"] = data_dict["MARKER_MONITORING"][
-                            len(this_def) - 1
-                        ]
-                    else:
-                        this_def[this_name]["MARKER"] = data_dict["MARKER_MONITORING"][
-                            0
-                        ]
-
-                # save to output dictionary
-                data_dict[this_param] = this_def
-                break
-
-            # unitary constraint definition
-            if case("OPT_CONSTRAINT"):
-                # remove white space
-                this_value = "".join(this_value.split())
-                # check for none case
-                if this_value == "NONE":
-                    data_dict[this_param] = {
-                        "EQUALITY": OrderedDict(),
-                        "INEQUALITY": OrderedDict(),
-                    }
-                    break
-                # split definitions
-                this_value = this_value.split(";")
-                this_def = OrderedDict()
-                for this_con in this_value:
-                    if not this_con:
-                        continue  # if no definition
-                    # defaults
-                    this_obj = "NONE"
-                    this_sgn = "="
-                    this_scl = 1.0
-                    this_val = 0.0
-                    # split scale if present
-                    this_con = this_con.split("*")
-                    if len(this_con) > 1:
-                        this_scl = float(this_con[1])
-                    this_con = this_con[0]
-                    # find sign
-                    for this_sgn in ["<", ">", "="]:
-                        if this_sgn in this_con:
-                            break
-                    # split sign, store objective and value
-                    this_con = this_con.strip("()").split(this_sgn)
-                    assert len(this_con) == 2, "incorrect constraint definition"
-                    this_obj = this_con[0]
-                    this_val = float(this_con[1])
-                    # store in dictionary
-                    this_def[this_obj] = {
-                        "SIGN": this_sgn,
-                        "VALUE": this_val,
-                        "SCALE": this_scl,
-                    }
-                #: for each constraint definition
-                # sort constraints by type
-                this_sort = {"EQUALITY": OrderedDict(), "INEQUALITY": OrderedDict()}
-                for key, value in this_def.items():
-                    if value["SIGN"] == "=":
-                        this_sort["EQUALITY"][key] = value
-                    else:
-                        this_sort["INEQUALITY"][key] = value
-                #: for each definition
-                # save to output dictionary
-                data_dict[this_param] = this_sort
-                break
-
-            # otherwise
-            # string parameters
-            if case():
-                data_dict[this_param] = this_value
-                break
-
-            #: if case DEFINITION_DV
-
-        #: for case
+        # one lookup per parameter, string parameters otherwise
+        read_value = _config_readers.get(this_param)
+        if read_value is None:
+            data_dict[this_param] = this_value
+        else:
+            data_dict[this_param] = read_value(this_value, data_dict)
 
     #: for line
 
@@ -912,298 +753,391 @@ def read_config(filename):
     return data_dict
 
 
-#: def read_config()
+#: def parse_config()
 
 
 # -------------------------------------------------------------------
-#  Set SU2 Configuration Parameters
+#  Config Parameter Readers
 # -------------------------------------------------------------------
-
-
-def write_config(filename, param_dict):
-    """updates an existing config file"""
-
-    temp_filename = filename + "_tmp"
-    shutil.copy(filename, temp_filename)
-    output_file = open(filename, "w")
-
-    # break pointers
-    param_dict = copy.deepcopy(param_dict)
-
-    for raw_line in open(temp_filename):
-        # remove line returns
-        line = raw_line.strip("\r\n")
-
-        # make sure it has useful data
-        if not "=" in line:
-            output_file.write(raw_line)
-            continue
-
-        # split across equals sign
-        line = line.split("=")
-        this_param = line[0].strip()
-        old_value = line[1].strip()
-
-        # skip if parameter unwanted
-        if this_param not in param_dict:
-            output_file.write(raw_line)
+#
+#  Each reader takes the raw value string and the parameters read so far,
+#  and returns the parsed value.
+
+_FFD_kinds = [
+    "FFD_SETTING",
+    "FFD_ANGLE_OF_ATTACK",
+    "FFD_CONTROL_POINT",
+    "FFD_NACELLE",
+    "FFD_GULL",
+    "FFD_TWIST",
+    "FFD_ROTATION",
+    "FFD_CAMBER",
+    "FFD_THICKNESS",
+    "FFD_CONTROL_POINT_2D",
+    "FFD_CAMBER_2D",
+    "FFD_THICKNESS_2D",
+]
+
+
+def _read_string_list(this_value, data_dict):
+    """comma delimited lists of strings with or without paren's"""
+    # remove white space
+    this_value = "".join(this_value.split())
+    # remove parens
+    this_value = this_value.strip("()")
+    # split by comma
+    return this_value.split(",")
+
+
+def _read_stripped_list(this_value, data_dict):
+    """comma delimited lists of strings in paren's, spaces kept inside items"""
+    return [i.strip(" ") for i in this_value.strip("()").split(",")]
+
+
+def _read_float_list(this_value, data_dict):
+    """comma delimited lists of floats"""
+    # remove white space
+    this_value = "".join(this_value.split())
+    # split by comma, map to float
+    return list(map(float, this_value.split(",")))
+
+
+def _read_float(this_value, data_dict):
+    return float(this_value)
+
+
+def _read_int(this_value, data_dict):
+    return int(this_value)
+
+
+def _read_dv_param(this_value, data_dict):
+    """semicolon delimited lists of comma delimited lists of floats"""
+    # remove white space
+    info_General = "".join(this_value.split())
+    # split by semicolon
+    info_General = info_General.split(";")
+    # build list of dv params, convert string to float
+    dv_Parameters = []
+    dv_FFDTag = []
+    dv_Size = []
+
+    dv_Kind = data_dict["DV_KIND"][0]
+
+    for this_dvParam in info_General:
+        this_dvParam = this_dvParam.strip("()")
+        this_dvParam = this_dvParam.split(",")
+        this_dvSize = 1
+
+        # if FFD change the first element to work with numbers and float(x)
+        if dv_Kind in _FFD_kinds:
+            this_dvFFDTag = this_dvParam[0]
+            this_dvParam[0] = "0"
+        else:
+            this_dvFFDTag = []
+
+        if not dv_Kind in ["NO_DEFORMATION"]:
+            this_dvParam = [float(x) for x in this_dvParam]
+
+        if dv_Kind in ["FFD_CONTROL_POINT_2D"]:
+            if this_dvParam[3] == 0 and this_dvParam[4] == 0:
+                this_dvSize = 2
+
+        if dv_Kind in ["FFD_CONTROL_POINT"]:
+            if this_dvParam[4] == 0 and this_dvParam[5] == 0 and this_dvParam[6] == 0:
+                this_dvSize = 3
+
+        dv_FFDTag.append(this_dvFFDTag)
+        dv_Parameters.append(this_dvParam)
+        dv_Size.append(this_dvSize)
+
+    # store in a dictionary
+    dv_Definitions = {
+        "FFDTAG": dv_FFDTag,
+        "PARAM": dv_Parameters,
+        "SIZE": dv_Size,
+    }
+
+    return dv_Definitions
+
+
+def _read_definition_dv(this_value, data_dict):
+    """unitary design variable definition"""
+    # remove white space
+    this_value = "".join(this_value.split())
+    # split into unitary definitions
+    info_Unitary = this_value.split(";")
+    # process each Design Variable
+    dv_Kind = []
+    dv_Scale = []
+    dv_Markers = []
+    dv_FFDTag = []
+    dv_Parameters = []
+    dv_Size = []
+
+    for this_General in info_Unitary:
+        if not this_General:
             continue
-
-        # start writing parameter
-        new_value = param_dict[this_param]
-        output_file.write(this_param + "= ")
-
-        # handle parameter types
-        for case in switch(this_param):
-
-            # comma delimited list of floats
-            if case("DV_VALUE_NEW"):
-                pass
-            if case("DV_VALUE_OLD"):
-                pass
-            if case("DV_VALUE"):
-                n_lists = len(new_value)
-                for i_value in range(n_lists):
-                    output_file.write("%s" % new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                break
-
-            # comma delimited list of strings no paren's
-            if case("DV_KIND"):
-                pass
-            if case("TASKS"):
-                pass
-            if case("GRADIENTS"):
-                if not isinstance(new_value, list):
-                    new_value = [new_value]
-                n_lists = len(new_value)
-                for i_value in range(n_lists):
-                    output_file.write(new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                break
-
-            # comma delimited list of strings inside paren's
-            if case("MARKER_EULER"):
-                pass
-            if case("MARKER_FAR"):
-                pass
-            if case("MARKER_PLOTTING"):
-                pass
-            if case("MARKER_MONITORING"):
-                pass
-            if case("MARKER_SYM"):
-                pass
-            if case("DV_MARKER"):
-                if not isinstance(new_value, list):
-                    new_value = [new_value]
-                output_file.write("( ")
-                n_lists = len(new_value)
-                for i_value in range(n_lists):
-                    output_file.write(new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                output_file.write(" )")
-                break
-            if case("OUTPUT_FILES"):
-                n_lists = len(new_value)
-                output_file.write("(")
-                for i_value in range(n_lists):
-                    output_file.write(new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                output_file.write(")")
+        # split each unitary definition into one general definition
+        info_General = this_General.strip("()").split("|")  # check for needed strip()?
+        # split information for dv Kinds
+        info_Kind = info_General[0].split(",")
+        # pull processed dv values
+        this_dvKind = get_dvKind(int(info_Kind[0]))
+        this_dvScale = float(info_Kind[1])
+        this_dvMarkers = info_General[1].split(",")
+        this_dvSize = 1
+
+        if this_dvKind == "MACH_NUMBER" or this_dvKind == "AOA":
+            this_dvParameters = []
+            this_dvFFDTag = []
+        else:
+            this_dvParameters = info_General[2].split(",")
+            # if FFD change the first element to work with numbers and float(x), save also the tag
+            if this_dvKind in _FFD_kinds or this_dvKind == "FFD_TWIST_ANGLE":
+                this_dvFFDTag = this_dvParameters[0]
+                this_dvParameters[0] = "0"
+            else:
+                this_dvFFDTag = []
+
+            this_dvParameters = [float(x) for x in this_dvParameters]
+
+            if this_dvKind in ["FFD_CONTROL_POINT_2D"]:
+                if this_dvParameters[3] == 0 and this_dvParameters[4] == 0:
+                    this_dvSize = 2
+
+            if this_dvKind in ["FFD_CONTROL_POINT"]:
+                if (
+                    this_dvParameters[4] == 0
+                    and this_dvParameters[5] == 0
+                    and this_dvParameters[6] == 0
+                ):
+                    this_dvSize = 3
+
+        # add to lists
+        dv_Kind.append(this_dvKind)
+        dv_Scale.append(this_dvScale)
+        dv_Markers.append(this_dvMarkers)
+        dv_FFDTag.append(this_dvFFDTag)
+        dv_Parameters.append(this_dvParameters)
+        dv_Size.append(this_dvSize)
+
+    # store in a dictionary
+    dv_Definitions = {
+        "KIND": dv_Kind,
+        "SCALE": dv_Scale,
+        "MARKER": dv_Markers,
+        "FFDTAG": dv_FFDTag,
+        "PARAM": dv_Parameters,
+        "SIZE": dv_Size,
+    }
+
+    return dv_Definitions
+
+
+def _read_opt_objective(this_value, data_dict):
+    """unitary objective definition"""
+    # remove white space
+    this_value = "".join(this_value.split())
+    # split by ;
+    this_def = OrderedDict()
+    this_value = this_value.split(";")
+
+    for this_obj in this_value:
+        # split by scale
+        this_obj = this_obj.split("*")
+        this_name = this_obj[0]
+        this_scale = 1.0
+        if len(this_obj) > 1:
+            this_scale = float(this_obj[1])
+        # check for penalty-based constraint function
+        for this_sgn in ["<", ">", "="]:
+            if this_sgn in this_name:
                 break
+        this_obj = this_name.strip("()").split(this_sgn)
+        if len(this_obj) > 1:
+            this_type = this_sgn
+            this_val = this_obj[1]
+        else:
+            this_type = "DEFAULT"
+            this_val = 0.0
+        this_name = this_obj[0]
+        # Print an error and exit if the same key appears twice
+        if this_name in this_def:
+            raise SystemExit(
+                "Multiple occurrences of the same objective in the OPT_OBJECTIVE definition are not currently supported. To evaluate one objective over multiple surfaces, list the objective once."
+            )
+        # Set up dict for objective, including scale, whether it is a penalty, and constraint value
+        this_def.update(
+            {
+                this_name: {
+                    "SCALE": this_scale,
+                    "OBJTYPE": this_type,
+                    "VALUE": this_val,
+                }
+            }
+        )
+        # OPT_OBJECTIVE has to appear after MARKER_MONITORING in the .cfg, maybe catch that here
+        if len(data_dict["MARKER_MONITORING"]) > 1:
+            this_def[this_name]["MARKER"] = data_dict["MARKER_MONITORING"][
+                len(this_def) - 1
+            ]
+        else:
+            this_def[this_name]["MARKER"] = data_dict["MARKER_MONITORING"][0]
 
-            if case("CONFIG_LIST"):
-                n_lists = len(new_value)
-                output_file.write("(")
-                for i_value in range(n_lists):
-                    output_file.write(new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                output_file.write(")")
-                break
+    return this_def
 
-            if case("HISTORY_OUTPUT"):
-                n_lists = len(new_value)
-                for i_value in range(n_lists):
-                    output_file.write(new_value[i_value])
-                    if i_value + 1 < n_lists:
-                        output_file.write(", ")
-                break
 
-            # semicolon delimited lists of comma delimited lists
-            if case("DV_PARAM"):
-
-                assert isinstance(
-                    new_value["PARAM"], list
-                ), "incorrect specification of DV_PARAM"
-                if not isinstance(new_value["PARAM"][0], list):
-                    new_value = [new_value]
-
-                for i_value in range(len(new_value["PARAM"])):
-
-                    output_file.write("( ")
-                    this_param_list = new_value["PARAM"][i_value]
-                    this_ffd_list = new_value["FFDTAG"][i_value]
-                    n_lists = len(this_param_list)
-
-                    if this_ffd_list != []:
-                        output_file.write("%s, " % this_ffd_list)
-                        for j_value in range(1, n_lists):
-                            output_file.write("%s" % this_param_list[j_value])
-                            if j_value + 1 < n_lists:
-                                output_file.write(", ")
-                    else:
-                        for j_value in range(n_lists):
-                            output_file.write("%s" % this_param_list[j_value])
-                            if j_value + 1 < n_lists:
-                                output_file.write(", ")
-
-                    output_file.write(") ")
-                    if i_value + 1 < len(new_value["PARAM"]):
-                        output_file.write("; ")
+def _read_opt_constraint(this_value, data_dict):
+    """unitary constraint definition"""
+    # remove white space
+    this_value = "".join(this_value.split())
+    # check for none case
+    if this_value == "NONE":
+        return {
+            "EQUALITY": OrderedDict(),
+            "INEQUALITY": OrderedDict(),
+        }
+    # split definitions
+    this_value = this_value.split(";")
+    this_def = OrderedDict()
+    for this_con in this_value:
+        if not this_con:
+            continue  # if no definition
+        # defaults
+        this_obj = "NONE"
+        this_sgn = "="
+        this_scl = 1.0
+        this_val = 0.0
+        # split scale if present
+        this_con = this_con.split("*")
+        if len(this_con) > 1:
+            this_scl = float(this_con[1])
+        this_con = this_con[0]
+        # find sign
+        for this_sgn in ["<", ">", "="]:
+            if this_sgn in this_con:
                 break
+        # split sign, store objective and value
+        this_con = this_con.strip("()").split(this_sgn)
+        assert len(this_con) == 2, "incorrect constraint definition"
+        this_obj = this_con[0]
+        this_val = float(this_con[1])
+        # store in dictionary
+        this_def[this_obj] = {
+            "SIGN": this_sgn,
+            "VALUE": this_val,
+            "SCALE": this_scl,
+        }
+    #: for each constraint definition
+    # sort constraints by type
+    this_sort = {"EQUALITY": OrderedDict(), "INEQUALITY": OrderedDict()}
+    for key, value in this_def.items():
+        if value["SIGN"] == "=":
+            this_sort["EQUALITY"][key] = value
+        else:
+            this_sort["INEQUALITY"][key] = value
+    #: for each definition
+
+    return this_sort
+
+
+# parameter name -> reader, all other parameters are kept as strings
+_config_readers = {}
+for _param, _reader in [
+    (
+        [
+            "MARKER_EULER",
+            "MARKER_FAR",
+            "MARKER_PLOTTING",
+            "MARKER_MONITORING",
+            "MARKER_SYM",
+            "DV_KIND",
+        ],
+        _read_string_list,
+    ),
+    (["DV_PARAM"], _read_dv_param),
+    (["DV_VALUE_OLD", "DV_VALUE_NEW", "DV_VALUE"], _read_float_list),
+    (
+        [
+            "MACH_NUMBER",
+            "AOA",
+            "FIN_DIFF_STEP",
+            "CFL_NUMBER",
+            "HB_PERIOD",
+            "WRT_SOL_FREQ",
+        ],
+        _read_float,
+    ),
+    (
+        [
+            "NUMBER_PART",
+            "AVAILABLE_PROC",
+            "ITER",
+            "TIME_INSTANCES",
+            "UNST_ADJOINT_ITER",
+            "ITER_AVERAGE_OBJ",
+            "INNER_ITER",
+            "OUTER_ITER",
+            "TIME_ITER",
+            "ADAPT_CYCLES",
+        ],
+        _read_int,
+    ),
+    (["OUTPUT_FILES", "CONFIG_LIST", "HISTORY_OUTPUT"], _read_stripped_list),
+    (["DEFINITION_DV"], _read_definition_dv),
+    (["OPT_OBJECTIVE"], _read_opt_objective),
+    (["OPT_CONSTRAINT"], _read_opt_constraint),
+]:
+    _config_readers.update(dict.fromkeys(_param, _reader))
+del _param, _reader
 
-            # int parameters
-            if case("NUMBER_PART"):
-                pass
-            if case("ADAPT_CYCLES"):
-                pass
-            if case("TIME_INSTANCES"):
-                pass
-            if case("AVAILABLE_PROC"):
-                pass
-            if case("UNST_ADJOINT_ITER"):
-                pass
-            if (
-                case("ITER")
-                or case("TIME_ITER")
-                or case("INNER_ITER")
-                or case("OUTER_ITER")
-            ):
-                output_file.write("%i" % new_value)
-                break
 
-            if case("DEFINITION_DV"):
-                n_dv = len(new_value["KIND"])
-                if not n_dv:
-                    output_file.write("NONE")
-                for i_dv in range(n_dv):
-                    this_kind = new_value["KIND"][i_dv]
-                    output_file.write("( ")
-                    output_file.write("%i , " % get_dvID(this_kind))
-                    output_file.write("%s " % new_value["SCALE"][i_dv])
-                    output_file.write("| ")
-                    # markers
-                    n_mark = len(new_value["MARKER"][i_dv])
-                    for i_mark in range(n_mark):
-                        output_file.write("%s " % new_value["MARKER"][i_dv][i_mark])
-                        if i_mark + 1 < n_mark:
-                            output_file.write(", ")
-                    #: for each marker
-                    if not this_kind in ["AOA", "MACH_NUMBER"]:
-                        output_file.write(" | ")
-                        # params
-                        if this_kind in [
-                            "FFD_SETTING",
-                            "FFD_ANGLE_OF_ATTACK",
-                            "FFD_CONTROL_POINT",
-                            "FFD_NACELLE",
-                            "FFD_GULL",
-                            "FFD_TWIST_ANGLE",
-                            "FFD_TWIST",
-                            "FFD_ROTATION",
-                            "FFD_CAMBER",
-                            "FFD_THICKNESS",
-                            "FFD_CONTROL_POINT_2D",
-                            "FFD_CAMBER_2D",
-                            "FFD_THICKNESS_2D",
-                        ]:
-                            n_param = len(new_value["PARAM"][i_dv])
-                            output_file.write("%s , " % new_value["FFDTAG"][i_dv])
-                            for i_param in range(1, n_param):
-                                output_file.write(
-                                    "%s " % new_value["PARAM"][i_dv][i_param]
-                                )
-                                if i_param + 1 < n_param:
-                                    output_file.write(", ")
-                        else:
-                            n_param = len(new_value["PARAM"][i_dv])
-                            for i_param in range(n_param):
-                                output_file.write(
-                                    "%s " % new_value["PARAM"][i_dv][i_param]
-                                )
-                                if i_param + 1 < n_param:
-                                    output_file.write(", ")
-
-                        #: for each param
-                    output_file.write(" )")
-                    if i_dv + 1 < n_dv:
-                        output_file.write("; ")
-                #: for each dv
-                break
+# -------------------------------------------------------------------
+#  Set SU2 Configuration Parameters
+# -------------------------------------------------------------------
 
-            if case("OPT_OBJECTIVE"):
-                n_obj = 0
-                for name, value in new_value.items():
-                    if n_obj > 0:
-                        output_file.write("; ")
-                    if value["OBJTYPE"] == "DEFAULT":
-                        output_file.write("%s * %s " % (name, value["SCALE"]))
-                    else:
-                        output_file.write(
-                            "( %s %s %s ) * %s"
-                            % (name, value["OBJTYPE"], value["VALUE"], value["SCALE"])
-                        )
-                    n_obj += 1
-                break
 
-            if case("OPT_CONSTRAINT"):
-                i_con = 0
-                for con_type in ["EQUALITY", "INEQUALITY"]:
-                    this_con = new_value[con_type]
-                    for name, value in this_con.items():
-                        if i_con > 0:
-                            output_file.write("; ")
-                        output_file.write(
-                            "( %s %s %s ) * %s"
-                            % (name, value["SIGN"], value["VALUE"], value["SCALE"])
-                        )
-                        i_con += 1
-                    #: for each constraint
-                #: for each constraint type
-                if not i_con:
-                    output_file.write("NONE")
-                break
+def write_config(filename, param_dict):
+    """updates an existing config file
 
-            # default, assume string, integer or unformatted float
-            if case():
-                output_file.write("%s" % new_value)
-                break
+    The file is kept as a template of its lines, cached per content,
+    so only the parameter lines are re-rendered. The new contents are
+    written in one call to a unique temporary file, which is then
+    renamed over the config file.
+    """
 
-        #: for case
+    tokens = _get_config_template(filename)
 
-        # remove from param dictionary
-        del param_dict[this_param]
+    lines = []
+    new_tokens = []
+    written = set()
+    for this_param, raw_line in tokens:
+        # skip if parameter unwanted
+        if this_param is None or this_param not in param_dict:
+            lines.append(raw_line)
+            new_tokens.append((this_param, raw_line))
+            continue
 
-        # next line
-        output_file.write("\n")
+        # render parameter, a read that does not copy shared values
+        new_value = dict.__getitem__(param_dict, this_param)
+        raw_line = (
+            this_param + "= " + _render_config_value(this_param, new_value) + "\n"
+        )
+        lines.append(raw_line)
+        new_tokens.append((this_param, raw_line))
+        written.add(this_param)
 
     #: for each line
 
     # check that all params were used
     for this_param in param_dict.keys():
-        if not this_param in ["JOB_NUMBER"]:
+        if not this_param in written and not this_param in ["JOB_NUMBER"]:
             print(
                 "Warning: Parameter %s not found in config file and was not written"
                 % (this_param)
             )
 
-    output_file.close()
-    os.remove(temp_filename)
+    _write_config_text(filename, "".join(lines), new_tokens)
 
 
 #: def write_config()
@@ -1218,10 +1152,306 @@ def dump_config(filename, config):
     if "DV_VALUE_NEW" in config:
         config.DV_VALUE = config.DV_VALUE_NEW
 
-    config_file = open(filename, "w")
-    # write dummy file
+    tokens = []
     for key in config.keys():
-        config_file.write("%s= 0 \n" % key)
-    config_file.close()
-    # dump data
-    write_config(filename, config)
+        new_value = dict.__getitem__(config, key)
+        raw_line = key + "= " + _render_config_value(key, new_value) + "\n"
+        tokens.append((key, raw_line))
+
+    _write_config_text(filename, "".join([x[1] for x in tokens]), tokens)
+
+
+#: def dump_config()
+
+
+# -------------------------------------------------------------------
+#  Config Templates
+# -------------------------------------------------------------------
+#
+#  A template is the list of (parameter, raw line) tokens of a config
+#  file, the parameter is None for comments and blank lines.
+
+_config_templates = {}
+_config_templates_size = 64
+
+
+def _get_config_template(filename):
+    """returns the tokens of a config file, tokenized once per
+    content, keyed by the hash of the content
+    """
+
+    with open(filename, "rb") as config_file:
+        content = config_file.read()
+    content_hash = hashlib.sha1(content).hexdigest()
+
+    tokens = _config_templates.get(content_hash)
+    if tokens is not None:
+        return tokens
+
+    tokens = []
+    # universal newlines, as a config file opened as text
+    for raw_line in io.StringIO(content.decode(), newline=None):
+        # make sure it has useful data
+        if not "=" in raw_line:
+            tokens.append((None, raw_line))
+            continue
+        # split across equals sign
+        this_param = raw_line.split("=")[0].strip()
+        tokens.append((this_param, raw_line))
+
+    _store_config_template(content_hash, tokens)
+
+    return tokens
+
+
+def _store_config_template(content_hash, tokens):
+    _config_templates.pop(content_hash, None)
+    while len(_config_templates) >= _config_templates_size:
+        del _config_templates[next(iter(_config_templates))]
+    _config_templates[content_hash] = tokens
+
+
+def _write_config_text(filename, text, tokens):
+    """writes a config file in one call and an atomic rename,
+    and keeps its tokens as the template for the next write
+    """
+
+    content = text.encode()
+    folder = os.path.dirname(os.path.abspath(filename))
+    handle, temp_filename = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as output_file:
+            output_file.write(content)
+        replace_file(temp_filename, filename)
+    except:
+        os.remove(temp_filename)
+        raise
+
+    _store_config_template(hashlib.sha1(content).hexdigest(), tokens)
+
+
+# -------------------------------------------------------------------
+#  Config Parameter Writers
+# -------------------------------------------------------------------
+#
+#  Each writer takes a parameter value and returns the text after "= ".
+#  The text of the last value of each parameter is cached, so only
+#  changed values are rendered again.
+
+_rendered_values = {}
+
+
+def _render_config_value(this_param, new_value):
+    """returns the config file text of a parameter value"""
+
+    cached = _rendered_values.get(this_param)
+    if cached is not None and _same_value(cached[0], new_value):
+        return cached[1]
+
+    write_value = _config_writers.get(this_param, _write_default)
+    text = write_value(new_value)
+
+    _rendered_values[this_param] = (_snapshot_value(new_value), text)
+
+    return text
+
+
+def _snapshot_value(value):
+    """copies a value, so later changes to it do not reach the cache"""
+    if isinstance(value, _immutable_types):
+        return value
+    if type(value) is list:
+        return [_snapshot_value(item) for item in value]
+    if type(value) is dict:
+        return {key: _snapshot_value(item) for key, item in value.items()}
+    return copy.deepcopy(value)
+
+
+def _same_value(value1, value2):
+    """strict equality, 1 and 1.0 render differently"""
+    if type(value1) is not type(value2):
+        return False
+    if type(value1) in (list, tuple):
+        return len(value1) == len(value2) and all(
+            _same_value(x, y) for x, y in zip(value1, value2)
+        )
+    if isinstance(value1, dict):
+        return list(value1.keys()) == list(value2.keys()) and all(
+            _same_value(value1[k], value2[k]) for k in value1.keys()
+        )
+    try:
+        return bool(value1 == value2)
+    except ValueError:
+        return False  # arrays
+
+
+def _write_default(new_value):
+    """default, assume string, integer or unformatted float"""
+    return "%s" % new_value
+
+
+def _write_float_list(new_value):
+    """comma delimited list of floats"""
+    return ", ".join(["%s" % x for x in new_value])
+
+
+def _write_string_list(new_value):
+    """comma delimited list of strings no paren's"""
+    if not isinstance(new_value, list):
+        new_value = [new_value]
+    return ", ".join(new_value)
+
+
+def _write_marker_list(new_value):
+    """comma delimited list of strings inside paren's"""
+    if not isinstance(new_value, list):
+        new_value = [new_value]
+    return "( " + ", ".join(new_value) + " )"
+
+
+def _write_paren_list(new_value):
+    """comma delimited list of strings inside paren's, no padding"""
+    return "(" + ", ".join(new_value) + ")"
+
+
+def _write_plain_list(new_value):
+    """comma delimited list of strings"""
+    return ", ".join(new_value)
+
+
+def _write_int(new_value):
+    return "%i" % new_value
+
+
+def _write_dv_param(new_value):
+    """semicolon delimited lists of comma delimited lists"""
+
+    assert isinstance(new_value["PARAM"], list), "incorrect specification of DV_PARAM"
+    if not isinstance(new_value["PARAM"][0], list):
+        new_value = [new_value]
+
+    output = []
+    n_values = len(new_value["PARAM"])
+    for i_value in range(n_values):
+        output.append("( ")
+        this_param_list = new_value["PARAM"][i_value]
+        this_ffd_list = new_value["FFDTAG"][i_value]
+
+        if this_ffd_list != []:
+            output.append("%s, " % this_ffd_list)
+            output.append(", ".join(["%s" % x for x in this_param_list[1:]]))
+        else:
+            output.append(", ".join(["%s" % x for x in this_param_list]))
+
+        output.append(") ")
+        if i_value + 1 < n_values:
+            output.append("; ")
+
+    return "".join(output)
+
+
+def _write_definition_dv(new_value):
+    """unitary design variable definition"""
+
+    output = []
+    n_dv = len(new_value["KIND"])
+    if not n_dv:
+        output.append("NONE")
+    for i_dv in range(n_dv):
+        this_kind = new_value["KIND"][i_dv]
+        output.append("( ")
+        output.append("%i , " % get_dvID(this_kind))
+        output.append("%s " % new_value["SCALE"][i_dv])
+        output.append("| ")
+        # markers
+        output.append(", ".join(["%s " % x for x in new_value["MARKER"][i_dv]]))
+        if not this_kind in ["AOA", "MACH_NUMBER"]:
+            output.append(" | ")
+            # params
+            if this_kind in _FFD_kinds or this_kind == "FFD_TWIST_ANGLE":
+                output.append("%s , " % new_value["FFDTAG"][i_dv])
+                this_params = new_value["PARAM"][i_dv][1:]
+            else:
+                this_params = new_value["PARAM"][i_dv]
+            output.append(", ".join(["%s " % x for x in this_params]))
+        output.append(" )")
+        if i_dv + 1 < n_dv:
+            output.append("; ")
+    #: for each dv
+
+    return "".join(output)
+
+
+def _write_opt_objective(new_value):
+    """unitary objective definition"""
+
+    output = []
+    for name, value in new_value.items():
+        if value["OBJTYPE"] == "DEFAULT":
+            output.append("%s * %s " % (name, value["SCALE"]))
+        else:
+            output.append(
+                "( %s %s %s ) * %s"
+                % (name, value["OBJTYPE"], value["VALUE"], value["SCALE"])
+            )
+
+    return "; ".join(output)
+
+
+def _write_opt_constraint(new_value):
+    """unitary constraint definition"""
+
+    output = []
+    for con_type in ["EQUALITY", "INEQUALITY"]:
+        this_con = new_value[con_type]
+        for name, value in this_con.items():
+            output.append(
+                "( %s %s %s ) * %s"
+                % (name, value["SIGN"], value["VALUE"], value["SCALE"])
+            )
+    #: for each constraint type
+    if not output:
+        return "NONE"
+
+    return "; ".join(output)
+
+
+# parameter name -> writer, all other parameters are written with "%s"
+_config_writers = {}
+for _param, _writer in [
+    (["DV_VALUE_NEW", "DV_VALUE_OLD", "DV_VALUE"], _write_float_list),
+    (["DV_KIND", "TASKS", "GRADIENTS"], _write_string_list),
+    (
+        [
+            "MARKER_EULER",
+            "MARKER_FAR",
+            "MARKER_PLOTTING",
+            "MARKER_MONITORING",
+            "MARKER_SYM",
+            "DV_MARKER",
+        ],
+        _write_marker_list,
+    ),
+    (["OUTPUT_FILES", "CONFIG_LIST"], _write_paren_list),
+    (["HISTORY_OUTPUT"], _write_plain_list),
+    (["DV_PARAM"], _write_dv_param),
+    (
+        [
+            "NUMBER_PART",
+            "ADAPT_CYCLES",
+            "TIME_INSTANCES",
+            "AVAILABLE_PROC",
+            "UNST_ADJOINT_ITER",
+            "ITER",
+            "TIME_ITER",
+            "INNER_ITER",
+            "OUTER_ITER",
+        ],
+        _write_int,
+    ),
+    (["DEFINITION_DV"], _write_definition_dv),
+    (["OPT_OBJECTIVE"], _write_opt_objective),
+    (["OPT_CONSTRAINT"], _write_opt_constraint),
+]:
+    _config_writers.update(dict.fromkeys(_param, _writer))
+del _param, _writer
@@ -29,7 +29,7 @@
 #  Imports
 # ----------------------------------------------------------------------
 
-import os, sys, shutil, copy
+import os, sys, shutil, copy, struct
 
 if sys.version_info[0] > 2:
     # Py3 pickle now manage both accelerated cPickle and pure python pickle
@@ -55,7 +55,9 @@ def load_data(file_name, var_names=None, file_format="infer", core_name="python_
 
     Inputs:
         file_name   - data file name
-        var_names   - variable names to read
+        var_names   - variable names to read, returns a dictionary of
+                      them. dotted names like 'state.FUNCTIONS' read
+                      items or attributes of variables
         file_format - 'infer', 'pickle', or 'matlab'
         core_name   - data is stored under a dictionary with this name
 
@@ -65,8 +67,18 @@ def load_data(file_name, var_names=None, file_format="infer", core_name="python_
     requires scipy.io.loadmat
     file_format = infer (default), will infer format from extention
     ('.mat','.pkl')
+
+    files are replaced whole by save_data(), so no lock is needed to read
+    pickles saved by save_data() are indexed, var_names are read from
+    the file without reading the other variables
     """
 
+    # check for one item name array
+    if isinstance(var_names, str):
+        var_names = [
+            var_names,
+        ]
+
     try:
         import scipy.io
 
@@ -85,46 +97,40 @@ def load_data(file_name, var_names=None, file_format="infer", core_name="python_
             file_format = "pickle"
     assert file_format in ["matlab", "pickle"], "unsupported file format"
 
-    # get filelock
-    with filelock(file_name):
-
-        # LOAD MATLAB
-        if file_format == "matlab" and scipy_loaded:
-            input_data = scipy.io.loadmat(
-                file_name=file_name,
-                squeeze_me=False,
-                chars_as_strings=True,
-                struct_as_record=True,
-            )
-            # pull core variable
-            assert core_name in input_data, "core data not found"
-            input_data = input_data[core_name]
-
-            # convert recarray to dictionary
-            input_data = rec2dict(input_data)
-
-        # LOAD PICKLE
-        elif file_format == "pickle":
-            input_data = load_pickle(file_name)
-            # pull core variable
-            assert core_name in input_data, "core data not found"
-            input_data = input_data[core_name]
-
-        #: if file_format
-
-    #: with filelock
+    # LOAD MATLAB
+    if file_format == "matlab" and scipy_loaded:
+        input_data = scipy.io.loadmat(
+            file_name=file_name,
+            squeeze_me=False,
+            chars_as_strings=True,
+            struct_as_record=True,
+        )
+        # pull core variable
+        assert core_name in input_data, "core data not found"
+        input_data = input_data[core_name]
+
+        # convert recarray to dictionary
+        input_data = rec2dict(input_data)
+
+    # LOAD PICKLE, only the specified varnames
+    elif file_format == "pickle" and var_names != None:
+        paths = [(core_name,) + _var_path(name) for name in var_names]
+        values = load_pickle(file_name, paths)
+        return dict(zip(var_names, [values[path] for path in paths]))
+
+    # LOAD PICKLE
+    elif file_format == "pickle":
+        input_data = load_pickle(file_name)
+        # pull core variable
+        assert core_name in input_data, "core data not found"
+        input_data = input_data[core_name]
+
+    #: if file_format
 
     # load specified varname into dictionary
     if var_names != None:
-        # check for one item name array
-        if isinstance(var_names, str):
-            var_names = [
-                var_names,
-            ]
-        for key in input_data.keys():
-            if not key in var_names:
-                del input_data[key]
-        #: for key
+        values = [_lookup(input_data, _var_path(name)) for name in var_names]
+        input_data = dict(zip(var_names, values))
     #: if var_names
 
     return input_data
@@ -162,6 +168,11 @@ def save_data(
     will save nested dictionaries into nested matlab structures
     cannot save classes and modules
     uses scipy.io.loadmat
+
+    the data is written to a temporary file that then replaces file_name,
+    so readers see either the old or the new file, never a partial one.
+    writers take the file lock, so that appending reads and replaces the
+    file without another save in between
     """
 
     try:
@@ -179,55 +190,102 @@ def save_data(
             file_format = "pickle"
     assert file_format in ["matlab", "pickle"], "unsupported file format"
 
-    # get filelock
+    # lock from reading to replacing the file
     with filelock(file_name):
-
         # if appending needed
-        # TODO: don't overwrite other core_names
         if append == True and os.path.exists(file_name):
-            # check file exists
-            if not os.path.exists(file_name):
-                raise Exception("Cannot append, file does not exist: %s" % file_name)
             # load old data
-            data_dict_old = load(
+            data_dict_old = load_data(
                 file_name=file_name,
                 var_names=None,
                 file_format=file_format,
                 core_name=core_name,
             )
             # check for keys not in new data
-            for key, value in data_dict_old.iteritems():
+            for key, value in data_dict_old.items():
                 if not (key in data_dict):
                     data_dict[key] = value
             #: for each dict item
         #: if append
+        _save_replace(file_name, data_dict, file_format, core_name)
 
-        # save to core name
-        data_dict = {core_name: data_dict}
+    return
 
+
+#: def save()
+
+
+def _save_replace(file_name, data_dict, file_format, core_name):
+    """saves data_dict to a temporary file in the folder of file_name,
+    then atomically replaces file_name with it
+    """
+
+    # save to core name
+    data_dict = {core_name: data_dict}
+
+    # temporary file, created with the permissions of a new file
+    folder, name = os.path.split(os.path.abspath(file_name))
+    suffix = os.path.splitext(name)[1]
+    temp_name = os.path.join(
+        folder, ".%s.%i.%i.tmp%s" % (name, os.getpid(), id(data_dict), suffix)
+    )
+    os.close(os.open(temp_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+
+    try:
         # SAVE MATLAB
         if file_format == "matlab":
+            import scipy.io
+
             # bunch it
             data_dict = mat_bunch(data_dict)
             # save it
             scipy.io.savemat(
-                file_name=file_name,
+                file_name=temp_name,
                 mdict=data_dict,
                 format="5",  # matlab 5 .mat format
                 oned_as="column",
             )
         elif file_format == "pickle":
             # save it
-            save_pickle(file_name, data_dict)
+            save_pickle(temp_name, data_dict)
 
         #: if file_format
 
-    #: with filelock
+        os.replace(temp_name, file_name)
 
-    return
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
 
 
-#: def save()
+#: def _save_replace()
+
+
+# -------------------------------------------------------------------
+#  Indexed Pickle Format
+# -------------------------------------------------------------------
+#
+#  Pickles are saved as indexed files, version 1:
+#    magic "SU2DATA" + b"\0", version (uint32), index offset (uint64)
+#    entries, one pickle or numpy array each
+#    index, a pickled list of (path, kind, offset, length, extra)
+#  Paths are tuples of keys from the core name down. Dictionaries and
+#  plain objects are split into one entry per item or attribute,
+#  _indexDepth levels deep, so each can be read on its own. Nodes with
+#  more than _indexWidth items, like a Config, are saved whole:
+#    ("python_data",)                   - node, the design shell
+#    ("python_data", "state", "FUNCTIONS") - pickle
+#  Values that appear under several paths, like Design.files and
+#  Design.state.FILES, are saved once and referenced from the others.
+#  Files with the older stream format, a list of names and a pickle per
+#  name, are still read.
+
+_dataMagic = b"SU2DATA\0"
+_dataVersion = 1
+_dataHeader = struct.Struct("<8sIQ")
+_indexDepth = 3
+_indexWidth = 64
 
 
 # -------------------------------------------------------------------
@@ -235,21 +293,122 @@ def save_data(
 # -------------------------------------------------------------------
 
 
-def load_pickle(file_name):
-    """data = load_pickle(file_name)
+def load_pickle(file_name, paths=None):
+    """data = load_pickle(file_name, paths=None)
     loads a pickle with core_data dictionaries
-    assumes first entry is a list of all following data names
     returns dictionary of data
+
+    with paths, a list of key tuples starting with a core name,
+    returns a dictionary of the values at these paths, reading only
+    their entries of indexed files
     """
-    pkl_file = open(file_name, "rb")
-    # names = safe_unpickle.loadf(pkl_file)
-    names = pickle.load(pkl_file)
-    data_dict = dict.fromkeys(names, [])
-    for key in names:
-        # data_dict[key] = safe_unpickle.loadf(pkl_file)
-        data_dict[key] = pickle.load(pkl_file)
-    pkl_file.close()
-    return data_dict
+    with open(file_name, "rb") as pkl_file:
+        header = pkl_file.read(_dataHeader.size)
+        if len(header) == _dataHeader.size and header[:8] == _dataMagic:
+            reader = _IndexedReader(pkl_file, header)
+            if paths is None:
+                names = [path[0] for path in reader.index if len(path) == 1]
+                return dict((name, reader.get((name,))) for name in names)
+            return dict((tuple(path), reader.get(tuple(path))) for path in paths)
+
+        # stream format, first entry is a list of all following data names
+        pkl_file.seek(0)
+        # names = safe_unpickle.loadf(pkl_file)
+        names = pickle.load(pkl_file)
+        data_dict = dict.fromkeys(names, [])
+        for key in names:
+            # data_dict[key] = safe_unpickle.loadf(pkl_file)
+            data_dict[key] = pickle.load(pkl_file)
+
+    if paths is None:
+        return data_dict
+    return dict((tuple(path), _lookup(data_dict, path)) for path in paths)
+
+
+class _IndexedReader(object):
+    """reads the entries of an indexed pickle file"""
+
+    def __init__(self, pkl_file, header):
+        magic, version, index_offset = _dataHeader.unpack(header)
+        if version > _dataVersion:
+            raise Exception(
+                "data file version %i is newer than supported version %i"
+                % (version, _dataVersion)
+            )
+        self.file = pkl_file
+        self.file.seek(index_offset)
+        self.index = {}
+        for path, kind, offset, length, extra in pickle.load(self.file):
+            self.index[tuple(path)] = (kind, offset, length, extra)
+        self.loaded = {}
+
+    def get(self, path):
+        """returns the value at path, loading each entry once"""
+        if path in self.loaded:
+            return self.loaded[path]
+
+        # values inside an entry
+        if not path in self.index:
+            for n in range(len(path) - 1, 0, -1):
+                if path[:n] in self.index:
+                    return _lookup(self.get(path[:n]), path[n:])
+            raise KeyError("data not found: %s" % ".".join(path))
+
+        kind, offset, length, extra = self.index[path]
+
+        if kind == "ref":
+            value = self.get(tuple(extra))
+
+        elif kind == "npy":
+            import numpy
+
+            self.file.seek(offset)
+            value = numpy.lib.format.read_array(self.file)
+
+        elif kind == "node":
+            self.file.seek(offset)
+            value = pickle.loads(self.file.read(length))
+            self.loaded[path] = value
+            node_type, keys = extra
+            attributes = dict(vars(value)) if hasattr(value, "__dict__") else {}
+            for key in keys:
+                item = self.get(path + (key,))
+                if node_type == "dict":
+                    value[key] = item
+                else:
+                    attributes[key] = item
+            # restore attributes that setting items may have changed,
+            # like the timestamp of a State
+            if hasattr(value, "__dict__"):
+                vars(value).update(attributes)
+
+        else:
+            self.file.seek(offset)
+            value = pickle.loads(self.file.read(length))
+
+        self.loaded[path] = value
+        return value
+
+
+#: class _IndexedReader
+
+
+def _var_path(name):
+    """returns the path of keys of a dotted variable name"""
+    return tuple(name.split("."))
+
+
+def _lookup(value, path):
+    """returns the item or attribute of value at path"""
+    for key in path:
+        if isinstance(value, dict):
+            value = value[key]
+        else:
+            try:
+                value = getattr(value, key)
+            except AttributeError:
+                raise KeyError("data not found: %s" % key)
+    return value
 
 
 # -------------------------------------------------------------------
@@ -259,15 +418,106 @@ def load_pickle(file_name):
 
 def save_pickle(file_name, data_dict):
     """save_pickle(file_name, data_dict)
-    saves a core data dictionary
-    first pickle entry is a list of all following data names
+    saves a core data dictionary as an indexed pickle
+    """
+    with open(file_name, "wb") as pkl_file:
+        pkl_file.write(_dataHeader.pack(_dataMagic, _dataVersion, 0))
+
+        index = []
+        saved = {}
+        for name in data_dict.keys():
+            _save_entry(pkl_file, (name,), data_dict[name], index, saved)
+
+        index_offset = pkl_file.tell()
+        pickle.dump(index, pkl_file, pickle.HIGHEST_PROTOCOL)
+        pkl_file.seek(0)
+        pkl_file.write(_dataHeader.pack(_dataMagic, _dataVersion, index_offset))
+
+
+def _save_entry(pkl_file, path, value, index, saved):
+    """writes value at path to pkl_file, splitting dictionaries and
+    plain objects into entries, adds the entries to index
+    saved maps ids of written values to their paths
     """
-    pkl_file = open(file_name, "wb")
-    names = list(data_dict.keys())
-    pickle.dump(names, pkl_file)
-    for key in names:
-        pickle.dump(data_dict[key], pkl_file)
-    pkl_file.close()
+
+    # values saved under another path
+    if id(value) in saved:
+        index.append((path, "ref", 0, 0, saved[id(value)]))
+        return
+    if not isinstance(value, (str, bytes, int, float, bool, type(None))):
+        saved[id(value)] = path
+
+    offset = pkl_file.tell()
+
+    # numpy blocks
+    if type(value).__module__ == "numpy" and getattr(value, "dtype", None) is not None:
+        if type(value).__name__ == "ndarray" and not value.dtype.hasobject:
+            import numpy
+
+            numpy.lib.format.write_array(pkl_file, value, allow_pickle=False)
+            length = pkl_file.tell() - offset
+            index.append((path, "npy", offset, length, None))
+            return
+
+    # split nodes
+    shell = None
+    if len(path) < _indexDepth:
+        shell, node_type, keys = _split(value)
+
+    if shell is None:
+        pickle.dump(value, pkl_file, pickle.HIGHEST_PROTOCOL)
+        length = pkl_file.tell() - offset
+        index.append((path, "pickle", offset, length, None))
+        return
+
+    pickle.dump(shell, pkl_file, pickle.HIGHEST_PROTOCOL)
+    length = pkl_file.tell() - offset
+    index.append((path, "node", offset, length, (node_type, keys)))
+    for key in keys:
+        if node_type == "dict":
+            item = dict.__getitem__(value, key)
+        else:
+            item = vars(value)[key]
+        _save_entry(pkl_file, path + (key,), item, index, saved)
+
+
+def _split(value):
+    """returns a copy of value without its items or attributes, its type
+    'dict' or 'object' and the keys of the items or attributes,
+    or None if value is not split
+    """
+
+    # dictionaries with string keys
+    if isinstance(value, dict):
+        keys = list(value.keys())
+        if not keys or len(keys) > _indexWidth:
+            return None, None, None
+        if not all(isinstance(k, str) for k in keys):
+            return None, None, None
+        shell = copy.copy(value)
+        for key in keys:
+            del shell[key]
+        return shell, "dict", keys
+
+    # plain objects, without their own pickling
+    cls = type(value)
+    plain = (
+        hasattr(value, "__dict__")
+        and not hasattr(value, "__slots__")
+        and cls.__reduce_ex__ is object.__reduce_ex__
+        and cls.__reduce__ is object.__reduce__
+        and getattr(cls, "__getstate__", None) is getattr(object, "__getstate__", None)
+        and not hasattr(cls, "__setstate__")
+        and not isinstance(value, type)
+        and cls.__module__ != "builtins"
+    )
+    if plain and 0 < len(vars(value)) <= _indexWidth:
+        keys = list(vars(value).keys())
+        shell = copy.copy(value)
+        shell.__dict__ = {}
+        return shell, "object", keys
+
+    return None, None, None
 
 
 # -------------------------------------------------------------------
@@ -28,6 +28,14 @@
 import os, time, errno
 from random import random
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# flock() errors of file systems that do not support it
+_flock_unsupported = {errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOLCK}
+
 # -------------------------------------------------------------------
 #  File Lock Class
 # -------------------------------------------------------------------
@@ -42,10 +50,18 @@ class filelock(object):
 
     Inputs:
         file_name - filename to lock
-        timeout   - default 10sec, maximum timeout to wait for lock
+        timeout   - default 10sec, maximum timeout to wait for lock,
+                    ignored by the blocking flock()
         delay     - default 0.05sec, delay between each attempt to lock
                     number incremented with a random perturbation
 
+    Where fcntl is available the lock is a blocking flock() on the
+    lockfile, which waits for the lock without timeout, and which the
+    system releases if the process dies, so a crash leaves no stale
+    lock behind. Otherwise, and on file systems without flock() support
+    (Lustre mounted without flock, some NFS), the lock is the existence
+    of the lockfile, tried every delay seconds until timeout.
+
     original source: Evan Fosmark, BSD license
     http://www.evanfosmark.com/2009/01/cross-platform-file-locking-support-in-python/
     """
@@ -59,37 +75,104 @@ class filelock(object):
         self.file_name = file_name
         self.timeout = timeout
         self.delay = delay
+        self._flock = fcntl is not None
 
     def acquire(self):
-        """Acquire the lock, if possible. If the lock is in use, it check again
-        every `wait` seconds. It does this until it either gets the lock or
-        exceeds `timeout` number of seconds, in which case it throws
-        an exception.
+        """Acquire the lock. With fcntl, waits in flock() until the lock
+        is free, regardless of `timeout`. Otherwise, if the lock is in use,
+        it check again every `delay` seconds. It does this until it either
+        gets the lock or exceeds `timeout` number of seconds, in which case
+        it throws an exception.
         """
+        # waits in flock(), again if the lockfile was replaced
+        while self._flock:
+            if self._acquire_flock():
+                self.is_locked = True
+                return
+        #: while flock
+
         start_time = time.time()
         while True:
-            try:
-                self.fd = os.open(self.lockfile, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+            if self._acquire_exclusive():
                 break
-            except OSError as e:
-                if e.errno != errno.EEXIST:
-                    raise
-                if (time.time() - start_time) >= self.timeout:
-                    raise FileLockException(
-                        "FileLock timeout occured for %s" % self.lockfile
-                    )
-                delay = self.delay * (1.0 + 0.2 * random())
-                time.sleep(delay)
+            if (time.time() - start_time) >= self.timeout:
+                raise FileLockException(
+                    "FileLock timeout occured for %s" % self.lockfile
+                )
+            delay = self.delay * (1.0 + 0.2 * random())
+            time.sleep(delay)
         self.is_locked = True
 
+    def _acquire_exclusive(self):
+        """creates the lockfile, returns False if it exists"""
+        try:
+            self.fd = os.open(self.lockfile, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+            return False
+        return True
+
+    def _acquire_flock(self):
+        """waits for the flock of the lockfile, returns False if the
+        lockfile was removed while waiting, or if the file system does
+        not support flock and the lockfile existed already
+        """
+        try:
+            fd = os.open(self.lockfile, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+            created = True
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+            try:
+                fd = os.open(self.lockfile, os.O_RDWR)
+            except FileNotFoundError:
+                return False
+            created = False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError as e:
+            if e.errno not in _flock_unsupported:
+                self._discard(fd, created)
+                raise
+            # no flock here, fall back to the lockfile, which is
+            # ours if we created it
+            self._flock = False
+            if not created:
+                os.close(fd)
+                return False
+            self.fd = fd
+            return True
+        except BaseException:
+            self._discard(fd, created)
+            raise
+        # the lockfile is removed on release, the lock only holds
+        # if this is still the file at its path
+        try:
+            same = os.path.samestat(os.fstat(fd), os.stat(self.lockfile))
+        except OSError:
+            same = False
+        if not same:
+            os.close(fd)
+            return False
+        self.fd = fd
+        return True
+
+    def _discard(self, fd, created):
+        """closes the lockfile, removes it if created without the lock"""
+        if created:
+            os.unlink(self.lockfile)
+        os.close(fd)
+
     def release(self):
         """Get rid of the lock by deleting the lockfile.
         When working in a `with` statement, this gets automatically
         called at the end.
         """
         if self.is_locked:
-            os.close(self.fd)
+            # unlink before unlocking, see _acquire_flock()
             os.unlink(self.lockfile)
+            os.close(self.fd)
             self.is_locked = False
 
     def __enter__(self):
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+## \file history.py
+#  \brief python package for following a growing history file
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os
+
+from ..util import ordered_bunch
+from .tools import _read_plot_header, _split_plot_lines, _parse_plot_rows
+from .tools import get_historyField
+
+# ----------------------------------------------------------------------
+#  History Follower
+# ----------------------------------------------------------------------
+
+
+class HistoryFollower(object):
+    """follower = SU2.io.HistoryFollower(filename, nZones=1)
+
+    Follows a history file that is still being written by a solver.
+    Keeps a byte offset into the file, and each call to read()
+    returns only the rows appended since the previous call.
+
+    Inputs:
+        filename - history file, e.g. history_direct.csv
+        nZones   - number of zones, used to map the header names
+
+    Methods:
+        read()   - returns an ordered bunch with the mapped history
+                   headers for keys and float64 arrays of the new rows
+                   for values, or None if no complete new rows exist
+        reset()  - forget the header and start over from the top
+
+    Notes:
+        A trailing line without newline is assumed to be partially
+        written and is left for the next call.
+        If the file is replaced (removed and written again) or
+        rewritten, the follower starts over from the header. This is
+        seen from the file identity, the file size and the last bytes
+        read before the offset.
+        The follower reads any file at filename, a history file of an
+        earlier run must be removed before the solver is launched.
+    """
+
+    # bytes before the offset kept to see a rewritten file
+    mark_size = 64
+
+    def __init__(self, filename, nZones=1):
+        self.filename = filename
+        self.nZones = nZones
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.Variables = None
+        self.fields = None
+        self.file_id = None
+        self.mark = b""
+
+    def read(self):
+        if not os.path.exists(self.filename):
+            return None
+
+        with open(self.filename, "rb") as plot_file:
+            # file replaced or rewritten?
+            stat = os.fstat(plot_file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            file_size = stat.st_size
+            if (
+                file_id != self.file_id
+                or file_size < self.offset
+                or self._read_mark(plot_file) != self.mark
+            ):
+                self.reset()
+            self.file_id = file_id
+
+            # header
+            if self.Variables is None:
+                plot_file.seek(0)
+                Variables = _read_plot_header(plot_file)
+                data_start = plot_file.tell()
+                plot_file.seek(max(data_start - 1, 0))
+                if data_start == 0 or plot_file.read(1) != b"\n":
+                    return None  # header not complete yet
+                self.Variables = Variables
+                self.fields = [get_historyField(x, self.nZones) for x in Variables]
+                self.offset = data_start
+                self.mark = self._read_mark(plot_file)
+
+            # new complete lines
+            plot_file.seek(self.offset)
+            chunk = plot_file.read(file_size - self.offset)
+
+            i_end = chunk.rfind(b"\n")
+            if i_end < 0:
+                return None
+            self.offset += i_end + 1
+            self.mark = self._read_mark(plot_file)
+
+        rows, zones = _split_plot_lines(chunk[:i_end].decode().splitlines())
+        if not rows:
+            return None
+
+        plot_data = _parse_plot_rows(self.Variables, rows)
+
+        # map header names
+        history_data = ordered_bunch()
+        for key, var in zip(self.Variables, self.fields):
+            history_data[var] = plot_data[key]
+
+        return history_data
+
+    def _read_mark(self, plot_file):
+        """returns the last bytes before the offset"""
+        start = max(self.offset - self.mark_size, 0)
+        plot_file.seek(start)
+        return plot_file.read(self.offset - start)
+
+    #: def read()
+
+
+#: class HistoryFollower
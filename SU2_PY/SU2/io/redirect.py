@@ -30,7 +30,8 @@
 # ----------------------------------------------------------------------
 
 import os, sys, shutil, copy, glob
-from .tools import add_suffix, make_link, expand_part
+from .tools import add_suffix, make_link, expand_part, DirectorySnapshot
+from .transfer import transfer_files
 
 # -------------------------------------------------------------------
 #  Output Redirection
@@ -136,6 +137,9 @@ class folder(object):
     Notes:
         push must be appended or extended, not overwritten
         links in Windows not supported, will simply copy
+        pull files are placed by reflink, hard link or copy, see
+        SU2.io.transfer_files(), the bytes this avoided copying are
+        in the attribute transfer
     """
 
     def __init__(self, folder, pull=None, link=None, force=True):
@@ -163,6 +167,7 @@ class folder(object):
         self.push = []
         self.link = copy.deepcopy(link)
         self.force = force
+        self.transfer = None
 
     def __enter__(self):
 
@@ -184,19 +189,15 @@ class folder(object):
         if not os.path.exists(folder):
             os.makedirs(folder)
 
-        # copy pull files
+        # existence checks, reading each folder once
+        snapshot = DirectorySnapshot()
+
+        # place pull files, by reflink, hard link or copy
+        pairs = []
         for name in pull:
-            old_name = os.path.abspath(name)
             new_name = os.path.split(name)[-1]
-            new_name = os.path.join(folder, new_name)
-            if old_name == new_name:
-                continue
-            if os.path.exists(new_name):
-                if force:
-                    os.remove(new_name)
-                else:
-                    continue
-            shutil.copy(old_name, new_name)
+            pairs.append((name, os.path.join(folder, new_name)))
+        self.transfer = transfer_files(pairs, force, snapshot)
 
         # make links
         for name in link:
@@ -205,12 +206,17 @@ class folder(object):
             new_name = os.path.join(folder, new_name)
             if old_name == new_name:
                 continue
-            if os.path.exists(new_name):
+            if snapshot.exists(new_name):
                 if force:
                     os.remove(new_name)
+                    snapshot.remove(new_name)
                 else:
                     continue
+            elif snapshot.dangling_link(new_name):
+                os.remove(new_name)
+                snapshot.remove(new_name)
             make_link(old_name, new_name)
+            snapshot.add(new_name)
 
         # change directory
         os.chdir(folder)
@@ -229,6 +235,9 @@ class folder(object):
         if folder == origin:
             return
 
+        # existence checks, reading each folder once
+        snapshot = DirectorySnapshot()
+
         # move assets
         for name in push:
 
@@ -241,23 +250,27 @@ class folder(object):
                 source = os.path.realpath(old_name)
                 if source == new_name:
                     continue
-                if os.path.exists(new_name):
+                if snapshot.exists(new_name):
                     if force:
                         os.remove(new_name)
                     else:
                         continue
+                elif snapshot.dangling_link(new_name):
+                    os.remove(new_name)
                 make_link(source, new_name)
+                snapshot.add(new_name)
 
             # moves
             else:
                 if old_name == new_name:
                     continue
-                if os.path.exists(new_name):
+                if snapshot.exists(new_name):
                     if force:
                         os.remove(new_name)
                     else:
                         continue
                 shutil.move(old_name, new_name)
+                snapshot.add(new_name)
 
         # change directory
         os.chdir(origin)
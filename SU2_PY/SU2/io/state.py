@@ -40,6 +40,7 @@ from ..io import (
     Config,
     expand_multipoint,
     optnames_multi,
+    DirectorySnapshot,
 )
 from ..util import bunch
 from ..util import ordered_bunch
@@ -62,6 +63,9 @@ def State_Factory(state=None, config=None):
         VARIABLES - ordered bunch of variables
         FILES     - ordered bunch of file types
         HISTORY   - ordered bunch of history information
+        WARM_START - ordered bunch of warm start iterations
+        CACHED    - ordered bunch of the FUNCTIONS keys filled from
+                    the evaluation cache, see SU2.io.get_evalCache()
 
     Fields can be accessed by item or attribute
     ie: state['FUNCTIONS'] or state.FUNCTIONS
@@ -104,6 +108,10 @@ def State_Factory(state=None, config=None):
         TIME_ITER
         UNST_ADJOINT_ITER
         ITER_AVERAGE_OBJ
+    WARM_START:
+        DIRECT: {SEED=DESIGNS/DSN_001, COLD_ITERATIONS=400, ITERATIONS=120, SAVED=280, CONVERGED=True}
+    CACHED:
+        LIFT: True
 
     """
 
@@ -124,6 +132,8 @@ def State_Factory(state=None, config=None):
         "FILES",
         "HISTORY",
         "WND_CAUCHY_DATA",
+        "WARM_START",
+        "CACHED",
     ]:
         NewClass[key] = ordered_bunch()
 
@@ -170,6 +180,9 @@ class State(ordered_bunch):
             return
         assert isinstance(ztate, State), "must update with another State-type"
         for key in self.keys():
+            # states saved before a section was added
+            if not key in ztate:
+                continue
             if isinstance(ztate[key], dict):
                 self[key].update(ztate[key])
             elif ztate[key]:
@@ -258,6 +271,9 @@ class State(ordered_bunch):
 
         files = self.FILES
 
+        # existence checks, reading each folder once
+        snapshot = DirectorySnapshot()
+
         mesh_name = config.MESH_FILENAME
         if config.get("READ_BINARY_RESTART", "YES") == "NO":
             if not "RESTART_ASCII" in config.get("OUTPUT_FILES", ["RESTART"]):
@@ -297,7 +313,7 @@ class State(ordered_bunch):
                     names = expand_zones(filename, config)
                     found = False
                     for name in names:
-                        if os.path.exists(name):
+                        if snapshot.exists(name):
                             found = True
                         else:
                             found = False
@@ -311,7 +327,7 @@ class State(ordered_bunch):
                     # if multipoint, list of files needs to be added
                     file_list = []
                     for name in filename:
-                        if os.path.exists(name):
+                        if snapshot.exists(name):
                             file_list.append(name)
                             print("Found: %s" % name)
                         else:
@@ -321,22 +337,22 @@ class State(ordered_bunch):
                     if any(file for file in file_list):
                         files[label] = file_list
                 else:
-                    if os.path.exists(filename):
+                    if snapshot.exists(filename):
                         files[label] = filename
                         print("Found: %s" % filename)
             else:
                 if label.split("_")[0] in ["DIRECT", "ADJOINT"]:
                     for name in expand_zones(files[label], config):
-                        assert os.path.exists(name), (
+                        assert snapshot.exists(name), (
                             "state expected file: %s" % filename
                         )
                 elif label.split("_")[0] in ["MULTIPOINT"]:
                     for name in expand_zones(files[label], config):
                         if name:
-                            if not os.path.exists(name):
+                            if not snapshot.exists(name):
                                 raise AssertionError("state expected file: %s" % name)
                 else:
-                    assert os.path.exists(files[label]), (
+                    assert snapshot.exists(files[label]), (
                         "state expected file: %s" % filename
                     )
 
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+## \file store.py
+#  \brief append-only store of project designs
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, pickle, sqlite3
+
+# ----------------------------------------------------------------------
+#  Design Store Class
+# ----------------------------------------------------------------------
+
+
+class DesignStore(object):
+    """store = SU2.io.DesignStore(filename)
+
+    Append-only store of the designs of a project, in an SQLite
+    database. Every save of a design appends one record, a pickle
+    of the design, so the cost of a save does not grow with the
+    number of designs. The last record of each design is its
+    current version.
+
+    Methods:
+        append(items)  - appends records of [(index, design), ...]
+        load()         - returns the current designs, ordered by index
+        load(index)    - returns the current version of one design
+        count()        - returns the number of designs
+        compact()      - removes the records of older versions
+
+    The filename is opened for each operation, relative filenames
+    are relative to the working directory at that time.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def _connect(self):
+        connection = sqlite3.connect(self.filename, timeout=60.0)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS designs ("
+            " record INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " design INTEGER NOT NULL,"
+            " folder TEXT,"
+            " data BLOB NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS designs_design ON designs (design, record)"
+        )
+        return connection
+
+    def append(self, items):
+        """SU2.io.DesignStore.append(items)
+        appends the designs of items [(index, design), ...] in one
+        transaction, index is the position in the project design list
+        """
+        rows = []
+        for index, design in items:
+            data = pickle.dumps(design, pickle.HIGHEST_PROTOCOL)
+            folder = getattr(design, "folder", None)
+            rows.append((int(index), folder, sqlite3.Binary(data)))
+        if not rows:
+            return
+
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO designs (design, folder, data) VALUES (?, ?, ?)", rows
+                )
+        finally:
+            connection.close()
+
+    def load(self, index=None):
+        """designs = SU2.io.DesignStore.load(index=None)
+        returns the list of current designs ordered by index,
+        or the current version of design index
+        """
+        if not os.path.exists(self.filename):
+            if index is None:
+                return []
+            raise KeyError("design %i not in %s" % (index, self.filename))
+
+        connection = self._connect()
+        try:
+            if index is None:
+                rows = connection.execute(
+                    "SELECT data FROM designs WHERE record IN"
+                    " (SELECT MAX(record) FROM designs GROUP BY design)"
+                    " ORDER BY design"
+                ).fetchall()
+                return [pickle.loads(row[0]) for row in rows]
+            row = connection.execute(
+                "SELECT data FROM designs WHERE design = ?"
+                " ORDER BY record DESC LIMIT 1",
+                (int(index),),
+            ).fetchone()
+        finally:
+            connection.close()
+
+        if row is None:
+            raise KeyError("design %i not in %s" % (index, self.filename))
+        return pickle.loads(row[0])
+
+    def count(self):
+        """returns the number of designs in the store"""
+        if not os.path.exists(self.filename):
+            return 0
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT COUNT(DISTINCT design) FROM designs"
+            ).fetchone()[0]
+        finally:
+            connection.close()
+
+    def compact(self):
+        """SU2.io.DesignStore.compact()
+        removes the records of older design versions and frees their space
+        """
+        if not os.path.exists(self.filename):
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "DELETE FROM designs WHERE record NOT IN"
+                    " (SELECT MAX(record) FROM designs GROUP BY design)"
+                )
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+
+    def __repr__(self):
+        return "<DesignStore> %s" % self.filename
+
+
+#: class DesignStore
@@ -30,7 +30,8 @@
 # -------------------------------------------------------------------
 
 import os
-import shutil, glob
+import shutil, glob, tempfile
+import numpy as np
 from SU2.util import ordered_bunch
 from .historyMap import history_header_map as historyOutFields
 
@@ -68,104 +69,353 @@ def read_gradients(Grad_filename, scale=1.0):
 # -------------------------------------------------------------------
 
 
-def read_plot(filename):
+def read_plot(filename, columns=None):
     """reads a plot file
     returns an ordered bunch with the headers for keys
-    and a list of each header's floats for values.
-    """
+    and a float64 array of each header's values.
 
-    extension = os.path.splitext(filename)[1]
+    Inputs:
+        filename - CSV or Tecplot plot file
+        columns  - optional, list of headers to read,
+                   headers not found in the file are ignored
+
+    All data rows are parsed in one pass into a contiguous
+    float64 array per column. A last row with missing values,
+    cut while the solver wrote it, is ignored.
+    """
 
     # open history file
-    plot_file = open(filename)
+    with open(filename, "rb") as plot_file:
+        Variables = _read_plot_header(plot_file)
+        lines = plot_file.read().decode().splitlines()
+
+    # split data rows and zones
+    rows, zones = _split_plot_lines(lines)
+
+    # check for number of zones
+    if len(zones) > 1:
+        raise IOError("multiple zones not supported")
+
+    return _parse_plot_rows(Variables, rows, columns)
+
+
+#: def read_plot()
+
+
+# -------------------------------------------------------------------
+#  Read Last Rows from a Plot File
+# -------------------------------------------------------------------
+
+
+def read_plot_tail(filename, n_rows=1, columns=None, block_size=65536):
+    """reads the header and the last rows of a plot file
+    returns an ordered bunch with the headers for keys
+    and a float64 array of each header's last values.
+
+    Inputs:
+        filename   - CSV or Tecplot plot file
+        n_rows     - number of data rows to read from the end of the file
+        columns    - optional, list of headers to read
+        block_size - bytes read per backwards step
+
+    Seeks backwards from the end of the file, so the cost does not
+    depend on the total number of rows.
+    """
+
+    n_rows = max(int(n_rows), 1)
+
+    with open(filename, "rb") as plot_file:
+        Variables = _read_plot_header(plot_file)
+        data_start = plot_file.tell()
+
+        plot_file.seek(0, os.SEEK_END)
+        position = plot_file.tell()
+
+        # step back until enough line ends are buffered, counted in
+        # the bytes of each new block, one more than the rows as the
+        # first line may have been cut by the seek
+        blocks = []
+        n_ends = 0
+        n_needed = n_rows + 1
+        rows = []
+        while position > data_start:
+            step = min(block_size, position - data_start)
+            position -= step
+            plot_file.seek(position)
+            block = plot_file.read(step)
+            blocks.append(block)
+            n_ends += block.count(b"\n")
+            if n_ends < n_needed and position > data_start:
+                continue
+
+            # drop the cut first line before decoding, the cut may
+            # split a multibyte character
+            tail = b"".join(reversed(blocks))
+            if position > data_start:
+                tail = tail[tail.find(b"\n") + 1 :]
+            rows, zones = _split_plot_lines(tail.decode().splitlines())
+            rows = _complete_rows(Variables, rows)
+            if len(rows) >= n_rows:
+                break
+            # blank and zone lines are no rows
+            n_needed = n_ends + n_rows - len(rows) + 1
+
+    #: with plot_file
+
+    return _parse_plot_rows(Variables, rows[-n_rows:], columns)
+
+
+#: def read_plot_tail()
+
+
+def _read_plot_header(plot_file):
+    """reads the title and variable lines of a plot file opened
+    in binary mode, returns the list of variable names
+    """
 
     # title?
-    line = plot_file.readline()
+    line = plot_file.readline().decode()
     if line.startswith("TITLE"):
         title = line.split("=")[1].strip()  # not used right now
-        line = plot_file.readline()
+        line = plot_file.readline().decode()
 
     if line.startswith("VARIABLES"):
-        line = plot_file.readline()
+        line = plot_file.readline().decode()
 
     line = line.split(",")
     Variables = [x.strip().strip('"') for x in line]
-    n_Vars = len(Variables)
 
-    # initialize plot data dictionary
-    plot_data = ordered_bunch.fromkeys(Variables)
-    # must default each value to avoid pointer problems
-    for key in plot_data.keys():
-        plot_data[key] = []
+    return Variables
 
-    # zone list
-    zones = []
 
-    # read all data rows
-    while 1:
-        # read line
-        line = plot_file.readline()
-        if not line:
-            break
+def _split_plot_lines(lines):
+    """splits plot file lines into data rows and zone names"""
 
+    rows = []
+    zones = []
+    for line in lines:
         # zone?
         if line.startswith("ZONE"):
             zone = line.split("=")[1].strip('" ')
             zones.append(zone)
             continue
+        if line.strip():
+            rows.append(line)
 
-        # split line
-        line_data = line.strip().split(",")
-        line_data = [float(x.strip()) for x in line_data]
+    return rows, zones
 
-        # store to dictionary
-        for i_Var in range(n_Vars):
-            this_variable = Variables[i_Var]
-            plot_data[this_variable] = plot_data[this_variable] + [line_data[i_Var]]
 
-    #: for each line
+def _complete_rows(Variables, rows):
+    """drops a last row with missing values, cut while it was written"""
+    if rows and rows[-1].count(",") < len(Variables) - 1:
+        return rows[:-1]
+    return rows
 
-    # check for number of zones
-    if len(zones) > 1:
-        raise IOError("multiple zones not supported")
 
-    # done
-    plot_file.close()
+def _parse_plot_rows(Variables, rows, columns=None):
+    """parses data rows into an ordered bunch with
+    a contiguous float64 array per selected column
+    """
+
+    # column selection
+    if columns is None:
+        i_columns = list(range(len(Variables)))
+    else:
+        i_columns = [i for i, var in enumerate(Variables) if var in columns]
+
+    rows = _complete_rows(Variables, rows)
+
+    # parse all rows at once, one row of data per column
+    if rows:
+        data = np.loadtxt(
+            rows, delimiter=",", usecols=i_columns, ndmin=2, dtype=np.float64
+        )
+    else:
+        data = np.empty((0, len(i_columns)), dtype=np.float64)
+    data = np.ascontiguousarray(data.T)
+
+    # store to dictionary
+    plot_data = ordered_bunch()
+    for i_data, i_Var in enumerate(i_columns):
+        plot_data[Variables[i_Var]] = data[i_data]
+
     return plot_data
 
 
+# -------------------------------------------------------------------
+#  Binary Plot Files
+# -------------------------------------------------------------------
+#
+#  Layout, all little endian:
+#    8 bytes  magic b"SU2PLOT\0"
+#    uint32   format version
+#    uint32   number of columns
+#    uint64   byte length of the header text
+#    header text, utf-8 column names separated by "\n",
+#      zero padded to a multiple of 8 bytes
+#    float64 data, row-major, one row per iteration
+#
+#  The number of rows follows from the file size, so rows may be
+#  appended to an existing file. Column names may repeat, as in the
+#  plot files, the last column of a name is read.
+
+_binaryPlotMagic = b"SU2PLOT\0"
+_binaryPlotVersion = 1
+_binaryPlotPrefix = np.dtype(
+    [("magic", "S8"), ("version", "<u4"), ("n_cols", "<u4"), ("header_len", "<u8")]
+)
+
+
+def get_binaryPlotName(filename):
+    """returns the name of the binary sidecar of a plot file,
+    i.e. history_direct.csv -> history_direct.bin
+    """
+    return os.path.splitext(filename)[0] + ".bin"
+
+
+def has_binaryPlot(filename):
+    """checks for a binary sidecar of a plot file that is at least
+    as recent as the plot file itself
+    """
+    binary_name = get_binaryPlotName(filename)
+    if binary_name == filename:
+        return False
+    try:
+        binary_time = os.stat(binary_name).st_mtime
+    except OSError:
+        return False
+    try:
+        return binary_time >= os.stat(filename).st_mtime
+    except OSError:
+        return True
+
+
+def write_plot_binary(filename, plot_data):
+    """writes an ordered bunch of equal length columns,
+    as returned by read_plot(), to a binary plot file
+    the file is replaced at once, readers never see a partial file
+    """
+
+    Variables = list(plot_data.keys())
+    data = np.column_stack([np.asarray(plot_data[x], dtype="<f8") for x in Variables])
+
+    header = "\n".join(Variables).encode()
+    header += b"\0" * (-len(header) % 8)
+
+    prefix = np.zeros(1, dtype=_binaryPlotPrefix)
+    prefix["magic"] = _binaryPlotMagic
+    prefix["version"] = _binaryPlotVersion
+    prefix["n_cols"] = len(Variables)
+    prefix["header_len"] = len(header)
+
+    folder = os.path.dirname(os.path.abspath(filename))
+    handle, tempname = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as plot_file:
+            plot_file.write(prefix.tobytes())
+            plot_file.write(header)
+            plot_file.write(np.ascontiguousarray(data).tobytes())
+        replace_file(tempname, filename)
+    except:
+        os.remove(tempname)
+        raise
+
+    return
+
+
+#: def write_plot_binary()
+
+
+def read_plot_binary(filename, columns=None):
+    """reads a binary plot file
+    returns an ordered bunch with the headers for keys
+    and a float64 array of each header's values.
+
+    The data is memory-mapped into a structured array, the
+    returned columns are read-only views into the file.
+    """
+
+    with open(filename, "rb") as plot_file:
+        prefix = np.frombuffer(
+            plot_file.read(_binaryPlotPrefix.itemsize), dtype=_binaryPlotPrefix
+        )
+        if len(prefix) != 1 or prefix.tobytes()[:8] != _binaryPlotMagic:
+            raise IOError("%s is not a binary plot file" % filename)
+        if prefix["version"][0] != _binaryPlotVersion:
+            raise IOError(
+                "%s has unsupported version %i" % (filename, prefix["version"][0])
+            )
+        header_len = int(prefix["header_len"][0])
+        Variables = plot_file.read(header_len).rstrip(b"\0").decode().split("\n")
+        plot_file.seek(0, os.SEEK_END)
+        file_size = plot_file.tell()
+
+    n_cols = int(prefix["n_cols"][0])
+    if len(Variables) != n_cols:
+        raise IOError("%s has a corrupt header" % filename)
+
+    # rows, a trailing partial row is ignored
+    # fields are named by position, column names may repeat
+    data_start = _binaryPlotPrefix.itemsize + header_len
+    fields = ["f%i" % i for i in range(n_cols)]
+    row_dtype = np.dtype({"names": fields, "formats": ["<f8"] * n_cols})
+    n_rows = (file_size - data_start) // row_dtype.itemsize
+
+    if n_rows > 0:
+        data = np.memmap(
+            filename, dtype=row_dtype, mode="r", offset=data_start, shape=(n_rows,)
+        )
+    else:
+        data = np.empty(0, dtype=row_dtype)
+
+    # store to dictionary
+    plot_data = ordered_bunch()
+    for var, field in zip(Variables, fields):
+        if columns is None or var in columns:
+            plot_data[var] = data[field]
+
+    return plot_data
+
+
+#: def read_plot_binary()
+
+
 # -------------------------------------------------------------------
 #  Read All Data from History File
 # -------------------------------------------------------------------
 
 
-def read_history(History_filename, nZones=1):
+def read_history(History_filename, nZones=1, n_rows=None):
     """reads a history file
     returns an ordered bunch with the history file headers for keys
-    and a list of each header's floats for values.
+    and an array of each header's floats for values.
     if header is an optimization objective, its name is mapped to
     the optimization name.
     Iter and Time(min) headers are mapped to ITERATION and TIME
     respectively.
+    if n_rows is given, only the last n_rows rows are read.
+    if an up to date binary sidecar exists (see get_binaryPlotName()),
+    it is memory-mapped instead of parsing the plot file.
     """
 
     # read plot file
-    plot_data = read_plot(History_filename)
+    if has_binaryPlot(History_filename):
+        plot_data = read_plot_binary(get_binaryPlotName(History_filename))
+        if n_rows is not None:
+            n_rows = max(int(n_rows), 1)
+            for key in plot_data.keys():
+                plot_data[key] = plot_data[key][-n_rows:]
+    elif n_rows is None:
+        plot_data = read_plot(History_filename)
+    else:
+        plot_data = read_plot_tail(History_filename, n_rows)
 
     # initialize history data dictionary
     history_data = ordered_bunch()
 
     # map header names
     for key in plot_data.keys():
-        var = key
-        for field in historyOutFields:
-
-            if key == historyOutFields[field]["HEADER"] and nZones == 1:
-                var = field
-
-            if key.split("[")[0] == historyOutFields[field]["HEADER"] and nZones > 1:
-                var = field + "[" + key.split("[")[1]
-
+        var = get_historyField(key, nZones)
         history_data[var] = plot_data[key]
 
     return history_data
@@ -174,6 +424,98 @@ def read_history(History_filename, nZones=1):
 #: def read_history()
 
 
+def get_historyFilename(config):
+    """history_filename = get_historyFilename(config)
+    returns the name of the history file SU2_CFD writes for config,
+    accounting for restarts and multizone (CONFIG_LIST) cases
+    """
+
+    plot_format = config.get("TABULAR_FORMAT", "CSV")
+    plot_extension = get_extension(plot_format)
+
+    # master cfg is always config_CFD. Hardcoded names are prob nt ideal.
+    if config.get("CONFIG_LIST", []) != []:
+        conv_filename = "config_CFD"
+    else:
+        conv_filename = config["CONV_FILENAME"]
+
+    # adapt the history_filename, if a restart solution is chosen
+    # check for 'RESTART_ITER' is to avoid forced restart situation in "compute_polar.py"...
+    if config.get("RESTART_SOL", "NO") == "YES" and config.get("RESTART_ITER", 1) != 1:
+        restart_iter = "_" + str(config["RESTART_ITER"]).zfill(5)
+        history_filename = conv_filename + restart_iter + plot_extension
+    else:
+        history_filename = conv_filename + plot_extension
+
+    return history_filename
+
+
+#: def get_historyFilename()
+
+
+# -------------------------------------------------------------------
+#  Reverse Index of the History Output Fields
+# -------------------------------------------------------------------
+
+_historyIndex = None
+
+
+def get_historyIndex():
+    """index = get_historyIndex()
+    returns a reverse index of the history output fields,
+    built on first use and cached for the process
+
+    Outputs:
+        index.FIELD - field name of each history file header
+        index.GROUP - output group of each field name
+        index.TYPE  - list of field names of each output type
+        index.ORDER - position of each field name in the history map
+    """
+
+    global _historyIndex
+
+    if _historyIndex is None:
+        index = ordered_bunch()
+        index.FIELD = {}
+        index.GROUP = {}
+        index.TYPE = {}
+        index.ORDER = {}
+        for i_field, field in enumerate(historyOutFields):
+            entry = historyOutFields[field]
+            index.FIELD[entry["HEADER"]] = field
+            index.GROUP[field] = entry["GROUP"]
+            index.TYPE.setdefault(entry["TYPE"], []).append(field)
+            index.ORDER[field] = i_field
+        _historyIndex = index
+
+    return _historyIndex
+
+
+#: def get_historyIndex()
+
+
+def get_historyField(header, nZones=1):
+    """var = get_historyField(header, nZones=1)
+    maps a history file header to its history output field name,
+    multizone headers keep their '[zone]' suffix.
+    headers without a field are returned unchanged.
+    """
+
+    fields = get_historyIndex().FIELD
+
+    if nZones == 1:
+        return fields.get(header, header)
+
+    header_split = header.split("[")
+    if header_split[0] in fields and len(header_split) > 1:
+        return fields[header_split[0]] + "[" + header_split[1]
+
+    return header
+
+
+#: def get_historyField()
+
+
 # -------------------------------------------------------------------
 #  Define Dictionary Map for Header Names
 # -------------------------------------------------------------------
@@ -320,9 +662,9 @@ def update_persurface(config, state):
             base2 = per_surface_map[base]
             for marker in config["MARKER_MONITORING"]:
                 if (base2 + "_" + marker) in state["HISTORY"]["DIRECT"]:
-                    state["FUNCTIONS"][base2 + "_" + marker] = state["HISTORY"][
-                        "DIRECT"
-                    ][base2 + "_" + marker][-1]
+                    state["FUNCTIONS"][base2 + "_" + marker] = float(
+                        state["HISTORY"]["DIRECT"][base2 + "_" + marker][-1]
+                    )
 
 
 # -------------------------------------------------------------------
@@ -342,59 +684,58 @@ def read_aerodynamics(
         otherwise returns final value from history file
     """
 
-    # read the history data
-    history_data = read_history(History_filename, nZones)
+    # read the history data, only the final values are needed
+    history_data = read_history(History_filename, nZones, n_rows=1)
 
-    # pull only these functions
-    Func_Values = ordered_bunch()
-    for this_objfun in historyOutFields:
+    # pull only these functions, in history map and zone order
+    index = get_historyIndex()
+    objfuns = []
+    for key in history_data.keys():
         if nZones == 1:
-            if this_objfun in history_data:
-                if (
-                    historyOutFields[this_objfun]["TYPE"] == "COEFFICIENT"
-                    or historyOutFields[this_objfun]["TYPE"] == "D_COEFFICIENT"
-                ):
-                    Func_Values[this_objfun] = history_data[this_objfun]
+            this_objfun, iZone = key, 0
         else:
-            for iZone in range(nZones):
-                if this_objfun + "[" + str(iZone) + "]" in history_data:
-                    if (
-                        historyOutFields[this_objfun]["TYPE"] == "COEFFICIENT"
-                        or historyOutFields[this_objfun]["TYPE"] == "D_COEFFICIENT"
-                    ):
-                        Func_Values[
-                            this_objfun + "[" + str(iZone) + "]"
-                        ] = history_data[this_objfun + "[" + str(iZone) + "]"]
+            key_split = key.rstrip("]").split("[")
+            if len(key_split) != 2 or not key_split[1].isdigit():
+                continue
+            this_objfun, iZone = key_split[0], int(key_split[1])
+        if not this_objfun in index.ORDER:
+            continue
+        if historyOutFields[this_objfun]["TYPE"] in ["COEFFICIENT", "D_COEFFICIENT"]:
+            objfuns.append((index.ORDER[this_objfun], iZone, key))
+
+    Func_Values = ordered_bunch()
+    for order, iZone, key in sorted(objfuns):
+        Func_Values[key] = history_data[key]
 
     if "TIME_MARCHING" in special_cases:
         # for unsteady cases, average time-accurate objective function values
         for key, value in Func_Values.items():
             if historyOutFields[key]["TYPE"] == "COEFFICIENT":
-                if not history_data.get("TAVG_" + key):
+                if not len(history_data.get("TAVG_" + key, [])):
                     raise KeyError(
                         "Key "
                         + historyOutFields["TAVG_" + key]["HEADER"]
                         + " was not found in history output."
                     )
-                Func_Values[key] = history_data["TAVG_" + key][-1]
+                Func_Values[key] = float(history_data["TAVG_" + key][-1])
             elif historyOutFields[key]["TYPE"] == "D_COEFFICIENT":
-                if not history_data.get("TAVG_" + key):
+                if not len(history_data.get("TAVG_" + key, [])):
                     raise KeyError(
                         "Key "
                         + historyOutFields["TAVG_" + key]["HEADER"]
                         + " was not found in history output."
                     )
-                Func_Values[key] = history_data["TAVG_" + key][-1]
+                Func_Values[key] = float(history_data["TAVG_" + key][-1])
     else:
         # in steady cases take only last value.
         for key, value in Func_Values.iteritems():
-            if not history_data.get(key):
+            if not len(history_data.get(key, [])):
                 raise KeyError(
                     "Key "
                     + historyOutFields[key]["HEADER"]
                     + " was not found in history output."
                 )
-            Func_Values[key] = value[-1]
+            Func_Values[key] = float(value[-1])
 
     return Func_Values
 
@@ -1124,6 +1465,103 @@ def expand_multipoint(name, config):
     return names
 
 
+class DirectorySnapshot(object):
+    """snapshot = SU2.io.DirectorySnapshot()
+    answers file existence checks from one os.scandir() per folder,
+    instead of one stat per file. links are only followed when their
+    name is queried, once
+
+    Methods:
+        exists(name)        - True if name exists, like os.path.exists()
+        dangling_link(name) - True if name is a link to a missing file
+        add(name)           - records a file made after the folder was read
+        remove(name)        - records a file removed after the folder was read
+
+    Files changed by other processes after a folder was read are not
+    seen, so a snapshot should be short lived.
+    """
+
+    def __init__(self):
+        self.folders = {}
+        self.links = {}
+        self.dangling = {}
+
+    def _names(self, folder):
+        """returns the set of existing entry names of folder"""
+        if not folder in self.folders:
+            names = set()
+            links = set()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        # links are resolved when first queried
+                        if entry.is_symlink():
+                            links.add(entry.name)
+                        else:
+                            names.add(entry.name)
+            except OSError:
+                pass
+            self.folders[folder] = names
+            self.links[folder] = links
+            self.dangling[folder] = set()
+        return self.folders[folder]
+
+    def _lookup(self, name):
+        """returns folder and base of name, resolving a link there"""
+        folder, base = os.path.split(os.path.abspath(name))
+        self._names(folder)
+        links = self.links[folder]
+        if base in links:
+            links.discard(base)
+            # links count if their target exists
+            if os.path.exists(os.path.join(folder, base)):
+                self.folders[folder].add(base)
+            else:
+                self.dangling[folder].add(base)
+        return folder, base
+
+    def exists(self, name):
+        if not name:
+            return False
+        folder, base = self._lookup(name)
+        return base in self.folders[folder]
+
+    def dangling_link(self, name):
+        if not name:
+            return False
+        folder, base = self._lookup(name)
+        return base in self.dangling[folder]
+
+    def add(self, name):
+        folder, base = os.path.split(os.path.abspath(name))
+        self._names(folder).add(base)
+        self.links[folder].discard(base)
+        self.dangling[folder].discard(base)
+
+    def remove(self, name):
+        folder, base = os.path.split(os.path.abspath(name))
+        self._names(folder).discard(base)
+        self.links[folder].discard(base)
+        self.dangling[folder].discard(base)
+
+
+#: class DirectorySnapshot
+
+
+# permissions of new files, read once at import
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+def replace_file(temp_name, file_name):
+    """replace_file(temp_name, file_name)
+    gives a file made by tempfile.mkstemp() the permissions of a
+    new file, then atomically renames it over file_name
+    """
+    os.chmod(temp_name, 0o666 & ~_umask)
+    os.replace(temp_name, file_name)
+
+
 def make_link(src, dst):
     """make_link(src,dst)
     makes a relative link
@@ -1195,14 +1633,15 @@ def restart2solution(config, state={}):
         restarts = expand_time(restarts, config)
         solutions = expand_time(solutions, config)
 
-        # move
+        # move, reading the folder once
+        snapshot = DirectorySnapshot()
         for res, sol in zip(restarts, solutions):
-            if os.path.exists(res):
+            if snapshot.exists(res):
                 shutil.move(res, sol)
         # update state
         if state:
             state.FILES.DIRECT = solution
-            if os.path.exists("flow.meta"):
+            if snapshot.exists("flow.meta"):
                 state.FILES.FLOW_META = "flow.meta"
 
     # adjoint solution
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+
+## \file transfer.py
+#  \brief file transfers for folder redirection
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, errno, shutil, threading
+from ..util import ordered_bunch
+from .tools import DirectorySnapshot
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ----------------------------------------------------------------------
+#  File Transfers
+# ----------------------------------------------------------------------
+#
+#  Files pulled into a working folder are placed with the cheapest of
+#    REFLINK  - copy-on-write clone, shares the data until it is written
+#    HARDLINK - second name of the same file
+#    COPY     - plain copy
+#  tried in this order. The environment variable SU2_TRANSFER restricts
+#  and orders the methods, e.g. SU2_TRANSFER=COPY restores plain copies.
+#
+#  A hard linked file is the pulled file itself, it must only be read
+#  or replaced (removed, moved onto) in the working folder, never
+#  rewritten in place. Pulled restart, meta and target files are inputs
+#  of the solver and are handled this way. Small files, like the config
+#  files, are always copied, linking them saves nothing.
+
+# ioctl request of linux to clone a file, from <linux/fs.h>
+_FICLONE = 0x40049409
+
+# smallest file that is hard linked instead of copied, bytes
+_linkSize = 1 << 20
+
+# methods known to fail between two devices
+_failed = {}
+
+# errors of a method that hold for every file of the file system,
+# others, like EPERM of protected hard links, only for the file
+_unsupported = set(
+    [errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL]
+    + [errno.ENOTTY]
+)
+
+# bytes placed and avoided by each method, since the start of python
+_totals = ordered_bunch()
+_totals.REFLINK = 0
+_totals.HARDLINK = 0
+_totals.COPY = 0
+_totals.BYTES_AVOIDED = 0
+_lock = threading.Lock()
+
+
+def transfer_methods():
+    """methods = SU2.io.transfer_methods()
+    returns the transfer methods to try, in order,
+    see the environment variable SU2_TRANSFER
+    """
+    methods = os.environ.get("SU2_TRANSFER", "REFLINK,HARDLINK,COPY")
+    methods = [m.strip().upper() for m in methods.split(",") if m.strip()]
+    for method in methods:
+        if not method in ["REFLINK", "HARDLINK", "COPY"]:
+            raise Exception("unknown transfer method %s in SU2_TRANSFER" % method)
+    if not "COPY" in methods:
+        methods.append("COPY")
+    return methods
+
+
+def transfer_files(pairs, force=True, snapshot=None):
+    """report = SU2.io.transfer_files(pairs, force=True, snapshot=None)
+    places the files of pairs [(source, destination), ...], by reflink,
+    hard link or copy, see SU2.io.transfer_methods()
+
+    Inputs:
+        pairs    - list of (source, destination) filenames
+        force    - True/False overwrite existing destinations
+        snapshot - SU2.io.DirectorySnapshot of the destinations,
+                   updated with the placed files
+
+    Outputs:
+        report - ordered bunch with the bytes placed by each method,
+                 REFLINK, HARDLINK and COPY, and BYTES_AVOIDED, the
+                 bytes that were not copied
+    """
+
+    methods = transfer_methods()
+
+    report = ordered_bunch()
+    report.REFLINK = 0
+    report.HARDLINK = 0
+    report.COPY = 0
+    report.BYTES_AVOIDED = 0
+
+    # list each destination folder once
+    if snapshot is None:
+        snapshot = DirectorySnapshot()
+
+    for source, destination in pairs:
+        source = os.path.abspath(source)
+        destination = os.path.abspath(destination)
+        if source == destination:
+            continue
+
+        folder = os.path.dirname(destination)
+        if snapshot.exists(destination):
+            if not force:
+                continue
+            os.remove(destination)
+        elif snapshot.dangling_link(destination):
+            # a stale link is replaced, not written through
+            os.remove(destination)
+        snapshot.add(destination)
+
+        stat = os.stat(source)
+        size = stat.st_size
+        devices = (stat.st_dev, os.stat(folder).st_dev)
+        failed = _failed.setdefault(devices, set())
+
+        for method in methods:
+            if method in failed:
+                continue
+            if method == "HARDLINK" and size < _linkSize:
+                continue
+            if _place(method, source, destination, devices, failed):
+                break
+
+        report[method] += size
+        if method != "COPY":
+            report.BYTES_AVOIDED += size
+
+    with _lock:
+        for key in report.keys():
+            _totals[key] += report[key]
+
+    return report
+
+
+#: def transfer_files()
+
+
+def transfer_report():
+    """report = SU2.io.transfer_report()
+    returns the bytes placed by each transfer method and the bytes
+    avoided, summed over all transfers of this python process
+    """
+    with _lock:
+        return ordered_bunch(_totals)
+
+
+def _place(method, source, destination, devices, failed):
+    """places source at destination with method, returns False if
+    it cannot, and adds method to failed if it cannot for any file
+    between the devices
+    """
+
+    if method == "COPY":
+        shutil.copy(source, destination)
+        return True
+
+    if method == "HARDLINK":
+        if devices[0] != devices[1] or os.name == "nt":
+            failed.add(method)
+            return False
+        try:
+            os.link(source, destination)
+        except OSError as err:
+            if err.errno in _unsupported:
+                failed.add(method)
+                return False
+            if err.errno in [errno.EPERM, errno.EMLINK]:
+                return False
+            raise
+        return True
+
+    if method == "REFLINK":
+        return _reflink(source, destination, failed)
+
+    return False
+
+
+def _reflink(source, destination, failed):
+    """clones source to destination, returns False if it cannot,
+    and adds REFLINK to failed if the file system cannot clone files
+    """
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        failed.add("REFLINK")
+        return False
+    with open(source, "rb") as src:
+        dst = open(destination, "wb")
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError as err:
+            dst.close()
+            os.remove(destination)
+            if err.errno in _unsupported:
+                failed.add("REFLINK")
+            return False
+        dst.close()
+    shutil.copymode(source, destination)
+    return True
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+
+## \file warmstart.py
+#  \brief warm starts of designs from the solutions of their closest design
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, re, struct
+from ..util import ordered_bunch
+from .tools import expand_zones
+
+# ----------------------------------------------------------------------
+#  Warm Starts
+# ----------------------------------------------------------------------
+#
+#  A new design restarts its steady direct and adjoint solutions from
+#  the solution files of the closest converged design. Shape deformations keep
+#  the mesh numbering, so these files apply to the deformed mesh as
+#  they are. Files with another number of points than the mesh are
+#  not used.
+#
+#  The iterations of every run are recorded in State.WARM_START:
+#    WARM_START:
+#        DIRECT: {SEED=DESIGNS/DSN_001, COLD_ITERATIONS=400, ITERATIONS=120, SAVED=280, CONVERGED=True}
+#  where COLD_ITERATIONS are those of the first run without warm
+#  start in the chain of seeds, and SAVED the difference. A run is
+#  CONVERGED if it stopped before its maximum number of iterations.
+
+
+def seed_warm_start(config, state, seed_state, seed_folder):
+    """SU2.io.seed_warm_start(config, state, seed_state, seed_folder)
+    prepares the warm start of a new design from the solution files of
+    its closest converged design, which are already in state.FILES,
+    solutions of runs that did not converge are not used
+
+    Inputs:
+        config      - config of the new design, RESTART_SOL is set
+                      to YES for steady problems with a direct solution
+        state       - state of the new design
+        seed_state  - state of the closest converged design,
+                      see SU2.io.warm_start_converged()
+        seed_folder - folder of the closest converged design
+    """
+
+    files = state.FILES
+    warm_start = state.setdefault("WARM_START", ordered_bunch())
+    seed_warm_start = seed_state.get("WARM_START", {})
+
+    # points of the mesh, if it can be read
+    n_mesh = None
+    if "MESH" in files and int(config.get("NZONES", 1)) == 1:
+        n_mesh = mesh_points(files.MESH)
+
+    for key in list(files.keys()):
+        if not (key == "DIRECT" or key.startswith("ADJOINT_")):
+            continue
+
+        if not warm_start_converged(seed_state, key):
+            del files[key]
+            continue
+
+        # solutions of another mesh cannot be used
+        if n_mesh is not None:
+            names = expand_zones(files[key], config)
+            n_points = [restart_points(name) for name in names]
+            if any(n is not None and n != n_mesh for n in n_points):
+                print("Warm start: %s does not match the mesh" % files[key])
+                del files[key]
+                continue
+
+        seed = seed_warm_start.get(key, {})
+        warm_start[key] = ordered_bunch()
+        warm_start[key].SEED = seed_folder
+        warm_start[key].COLD_ITERATIONS = seed.get("COLD_ITERATIONS")
+
+    if config.get("TIME_DOMAIN", "NO") != "YES" and "DIRECT" in files:
+        config["RESTART_SOL"] = "YES"
+
+
+#: def seed_warm_start()
+
+
+def record_warm_start(state, name, history, restarted, config=None):
+    """SU2.io.record_warm_start(state, name, history, restarted, config=None)
+    records the iterations of the run name, e.g. DIRECT or ADJOINT_DRAG,
+    in state.WARM_START, given its history and whether it restarted,
+    and if it converged, given the config of the run
+    """
+
+    iterations = history_iterations(history)
+    if iterations is None:
+        return
+    warm_start = state.setdefault("WARM_START", ordered_bunch())
+
+    if restarted:
+        entry = warm_start.get(name)
+        if entry is None:
+            entry = ordered_bunch(SEED=None, COLD_ITERATIONS=None)
+        entry.ITERATIONS = iterations
+        entry.SAVED = None
+        if entry.COLD_ITERATIONS is not None:
+            entry.SAVED = entry.COLD_ITERATIONS - iterations
+    else:
+        entry = ordered_bunch()
+        entry.SEED = None
+        entry.COLD_ITERATIONS = iterations
+        entry.ITERATIONS = iterations
+        entry.SAVED = 0
+
+    entry.CONVERGED = None
+    if config is not None:
+        max_iterations = config_iterations(config)
+        if max_iterations:
+            entry.CONVERGED = iterations < max_iterations
+
+    warm_start[name] = entry
+
+
+#: def record_warm_start()
+
+
+def warm_start_converged(state, name="DIRECT"):
+    """SU2.io.warm_start_converged(state, name='DIRECT')
+    True if the run name of state converged, see SU2.io.record_warm_start()
+    """
+    entry = state.get("WARM_START", {}).get(name, {})
+    return entry.get("CONVERGED") is True
+
+
+def config_iterations(config):
+    """returns the maximum number of iterations of a steady run of
+    config, OUTER_ITER for multizone problems and ITER otherwise,
+    or None if it is not set or config is time domain
+    """
+    if config.get("TIME_DOMAIN", "NO") == "YES":
+        return None
+    key = "ITER"
+    if config.get("MULTIZONE", "NO") == "YES":
+        key = "OUTER_ITER"
+    try:
+        return int(config[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def history_iterations(history):
+    """returns the number of iterations of a history read with
+    SU2.io.read_history(), or None if it has no rows
+    """
+    if not history:
+        return None
+    for key in ["Time_Iter", "Outer_Iter", "Inner_Iter"]:
+        if key in history and len(history[key]):
+            return int(history[key][-1]) + 1
+    return max(len(column) for column in history.values()) or None
+
+
+# ----------------------------------------------------------------------
+#  File Sizes
+# ----------------------------------------------------------------------
+
+# magic number of SU2 binary restart files
+_binaryRestart = 535532
+
+# lines of points in ascii restart files
+_pointLine = re.compile(rb"\s*\d+\s*[,\s]")
+
+_meshPoints = {}
+_restartPoints = {}
+
+
+def restart_points(filename):
+    """returns the number of points of an SU2 restart file,
+    binary or ascii, or None if it cannot be read
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+
+    # read restarts are remembered by path and modification time
+    stamp = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    if not stamp in _restartPoints:
+        _restartPoints[stamp] = _read_restart_points(filename)
+
+    return _restartPoints[stamp]
+
+
+def _read_restart_points(filename):
+    """reads the number of points of an SU2 restart file"""
+    try:
+        with open(filename, "rb") as restart_file:
+            header = restart_file.read(12)
+            if len(header) == 12:
+                magic, n_fields, n_points = struct.unpack("3i", header)
+                if magic == _binaryRestart:
+                    return n_points
+            # ascii, one line per point starting with its index, after
+            # a header line and before any lines of metadata
+            restart_file.seek(0)
+            n_points = sum(1 for line in restart_file if _pointLine.match(line))
+    except (IOError, OSError, struct.error):
+        return None
+    return n_points
+
+
+def mesh_points(filename):
+    """returns the number of points of a single zone SU2 native mesh,
+    or None if it cannot be read
+    """
+    if not filename.endswith(".su2"):
+        return None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+
+    # read meshes are remembered by path and modification time
+    stamp = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    if not stamp in _meshPoints:
+        n_points = None
+        with open(filename) as mesh_file:
+            for line in mesh_file:
+                if line.startswith("NZONE="):
+                    break
+                if line.startswith("NPOIN="):
+                    n_points = int(line.split("=")[1].split()[0])
+                    break
+        _meshPoints[stamp] = n_points
+
+    return _meshPoints[stamp]
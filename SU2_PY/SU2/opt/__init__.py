@@ -1,6 +1,7 @@
 # SU2/opt/__init__.py
 
 from .project import Project
+from .results import Results
 from .scipy_tools import scipy_slsqp as SLSQP
 from .scipy_tools import scipy_cg as CG
 from .scipy_tools import scipy_bfgs as BFGS
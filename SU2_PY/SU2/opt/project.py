@@ -37,8 +37,9 @@ import numpy as np
 from .. import io as su2io
 from .. import eval as su2eval
 from .. import util as su2util
+from .. import run as su2run
 from ..io import redirect_folder
-from ..io import historyOutFields
+from .results import Results
 from warnings import warn, simplefilter
 
 # simplefilter(Warning,'ignore')
@@ -68,7 +69,7 @@ class Project(object):
          files   - base files
          designs - list of designs
          folder  - project working folder
-         results - project design results
+         results - project design results, see SU2.opt.Results
 
     Methods:
         Optimizer Interface
@@ -84,6 +85,10 @@ class Project(object):
         con_cieq(dvs)  - inequality constraints          : list
         con_dcieq(dvs) - inequality constraint gradients : list[list]
 
+        eval_designs(func_name,dvs_list) - evaluates the optimizer interface
+                                           method func_name, e.g. 'obj_f',
+                                           for several dvs concurrently
+
         Functional Interface
         The following methods take an objective function name for input.
         func(func_name,config)        - function of specified name
@@ -95,6 +100,9 @@ class Project(object):
 
     _design_folder = "DESIGNS/DSN_*"
     _design_number = "%03d"
+    _design_index = None
+    _store_path = None
+    _n_stale = 0
 
     def __init__(self, config, state=None, designs=None, folder=".", warn=True):
 
@@ -124,10 +132,11 @@ class Project(object):
             config["OBJECTIVE_WEIGHT"] = ",".join(weights)
             config["OBJECTIVE_FUNCTION"] = ",".join(objectives)
 
+        groups = su2io.get_historyIndex().GROUP
         for this_obj in def_objs:
             if this_obj in su2io.optnames_multi:
                 this_obj = this_obj.split("_")[1]
-            group = historyOutFields[this_obj]["GROUP"]
+            group = groups[this_obj]
             if not group in config.HISTORY_OUTPUT:
                 config.HISTORY_OUTPUT.append(group)
 
@@ -147,11 +156,14 @@ class Project(object):
         self.files = state.FILES  # base files
         self.designs = designs  # design list
         self.folder = folder  # project folder
-        self.results = su2util.ordered_bunch()  # project design results
+        self._results = None  # project design results, compiled when read
 
         # output filenames
         self.filename = "project.pkl"
         self.results_filename = "results.pkl"
+        self.store_filename = "designs.db"
+        self._n_stored = 0
+        self._n_stale = 0
 
         # initialize folder with files
         pull, link = state.pullnlink(config)
@@ -170,8 +182,13 @@ class Project(object):
                     shutil.rmtree(f)
             #: if existing designs
 
+            # start the design store
+            if os.path.exists(self.store_filename):
+                os.remove(self.store_filename)
+            self._store_designs()
+
             # save project
-            su2io.save_data(self.filename, self)
+            self._save_project()
 
         return
 
@@ -213,14 +230,16 @@ class Project(object):
             # check for update
             if design.state.toc(timestamp):
 
-                # recompile design results
+                # store the design, update its results
+                self._store_designs([design])
+                self._update_results([design])
                 self.compile_results()
 
                 # plot results
                 self.plot_results()
 
                 # save data
-                su2io.save_data(filename, self)
+                self._save_project()
 
             #: if updated
 
@@ -267,6 +286,94 @@ class Project(object):
         konfig, dvs = self.unpack_dvs(dvs)
         return self._eval(konfig, func, dvs)
 
+    def eval_designs(self, func_name, dvs_list, num_procs=None, timeout=None):
+        """vals_list = SU2.opt.Project.eval_designs(func_name, dvs_list,
+                                                   num_procs=None, timeout=None)
+        evaluates whole designs concurrently, with one process per design
+
+        Inputs:
+            func_name - optimizer interface method, e.g. 'obj_f' or 'con_dcieq'
+            dvs_list  - list of design vectors
+            num_procs - number of concurrent designs, default the number of
+                        runs that fit in the core budget SU2_CORES,
+                        see SU2.run.concurrent_runs()
+            timeout   - timeout of each design in seconds
+
+        Outputs:
+            vals_list - list of values, one per design vector
+
+        Designs are evaluated one after another if num_procs is one.
+        """
+
+        func = getattr(su2eval, func_name)
+        if num_procs is None:
+            num_procs = su2run.concurrent_runs(self.config, len(dvs_list))
+        if num_procs < 2:
+            return [getattr(self, func_name)(dvs) for dvs in dvs_list]
+
+        config = self.config  # project config
+        state = self.state  # project state
+        folder = self.folder  # project folder
+
+        # check folder
+        assert os.path.exists(folder), "cannot find project folder %s" % folder
+
+        # list project files to pull and link
+        pull, link = state.pullnlink(config)
+
+        # project folder redirection, don't overwrite files
+        with redirect_folder(folder, pull, link, force=False) as push:
+
+            # start designs, repeated design vectors are evaluated once
+            jobs = []
+            for dvs in dvs_list:
+                konfig, dvs = self.unpack_dvs(dvs)
+                design = self.new_design(konfig)
+                if config.get("CONSOLE", "VERBOSE") == "VERBOSE":
+                    print(os.path.join(self.folder, design.folder))
+                if (
+                    konfig.get("TIME_DOMAIN", "NO") == "YES"
+                    and konfig.get("RESTART_SOL", "NO") == "YES"
+                ):
+                    design.config["RESTART_SOL"] = "YES"
+                i_dsn = [d is design for d in self.designs].index(True)
+                jobs.append((i_dsn, dvs))
+
+            # run designs
+            with su2util.EvalPool(num_procs, timeout=timeout) as pool:
+                futures = {}
+                for i_dsn, dvs in jobs:
+                    if not i_dsn in futures:
+                        futures[i_dsn] = pool.submit(
+                            _eval_design, self.designs[i_dsn], func, dvs
+                        )
+                outputs = {}
+                for i_dsn, future in futures.items():
+                    outputs[i_dsn] = future.result()
+
+            # the evaluated designs replace the project copies
+            updated = []
+            for i_dsn, (vals, design) in outputs.items():
+                if design.state.toc(self.designs[i_dsn].state.tic()):
+                    updated.append(design)
+                self.designs[i_dsn] = design
+
+            # store the updated designs, update their results
+            self._store_designs(updated)
+            self._update_results(updated)
+            self.compile_results()
+
+            # plot results
+            self.plot_results()
+
+            # save data
+            self._save_project()
+
+        #: with redirect folder
+
+        # done, return output
+        return [outputs[i_dsn][0] for i_dsn, dvs in jobs]
+
     def func(self, func_name, config):
         func = su2eval.func
         konfig = copy.deepcopy(config)
@@ -326,6 +433,14 @@ class Project(object):
         if not designs:
             return [], inf
 
+        # design vector index
+        point = _design_point(config)
+        design_index = self._get_design_index()
+        if design_index and point is not None and len(point) in design_index:
+            delta, i_min = design_index[len(point)].nearest(point)
+            return designs[i_min], delta
+
+        # designs without comparable design vectors
         diffs = []
         for this_design in designs:
             this_config = this_design.config
@@ -341,6 +456,49 @@ class Project(object):
 
         return closest, delta
 
+    def _get_design_index(self):
+        """returns a dictionary of SU2.util.KDTree, one per design
+        vector length, over the DV_VALUE_NEW of each design,
+        or None if some design has no design vector
+        brings the index up to date with the design list
+        """
+
+        n_indexed, design_index = self._design_index or (0, {})
+
+        # rebuild if designs were removed
+        if n_indexed > len(self.designs):
+            n_indexed, design_index = 0, {}
+
+        for i_dsn in range(n_indexed, len(self.designs)):
+            if design_index is None:
+                break
+            point = _design_point(self.designs[i_dsn].config)
+            if point is None:
+                # not comparable by design vector, scan all designs
+                design_index = None
+                break
+            if not len(point) in design_index:
+                design_index[len(point)] = su2util.KDTree()
+            design_index[len(point)].add(point, i_dsn)
+
+        self._design_index = (len(self.designs), design_index)
+
+        return design_index
+
+    def _converged_design(self, config, closest):
+        """returns the closest design to config whose direct run
+        converged, see SU2.io.warm_start_converged(), or None
+        closest is the closest design of all
+        """
+        if su2io.warm_start_converged(closest.state):
+            return closest
+
+        designs = [d for d in self.designs if su2io.warm_start_converged(d.state)]
+        if not designs:
+            return None
+        diffs = [config.dist(d.config, ["DV_VALUE_NEW"]) for d in designs]
+        return designs[np.argmin(diffs)]
+
     def init_design(self, config, closest=None):
         """starts a new design
         works in project folder
@@ -360,17 +518,19 @@ class Project(object):
                 # ignore mesh
                 if key == "MESH":
                     continue
-                # build file path
-                name = seed_files[key]
-                if isinstance(name, list):
-                    built_name = []
-                    for elem in name:
-                        built_name.append(os.path.join(seed_folder, elem))
-                    ztate.FILES[key] = built_name
-                else:
-                    name = os.path.join(seed_folder, name)
-                    # update pull files
-                    ztate.FILES[key] = name
+                # build file path, update pull files
+                ztate.FILES[key] = _seed_file(seed_folder, seed_files[key])
+
+            # restart from the solutions of the closest converged design
+            seed = self._converged_design(konfig, closest)
+            if seed is not None:
+                for key in list(ztate.FILES.keys()):
+                    if _is_solution(key):
+                        del ztate.FILES[key]
+                for key, name in seed.files.items():
+                    if _is_solution(key):
+                        ztate.FILES[key] = _seed_file(seed.folder, name)
+                su2io.seed_warm_start(konfig, ztate, seed.state, seed.folder)
 
         # name new folder
         folder = self._design_folder.replace("*", self._design_number)
@@ -393,12 +553,33 @@ class Project(object):
 
         # add design to project
         self.designs.append(design)
+        self._get_design_index()
 
         return design
 
+    @property
+    def results(self):
+        """project design results, a SU2.opt.Results with one row
+        per design, compiled from the designs when first read
+        """
+        if self._results is None:
+            self._results = Results()
+            for i_dsn, design in enumerate(self.designs):
+                self._results.update(i_dsn, design.state)
+        self._results.resize(len(self.designs))
+        return self._results
+
+    def _update_results(self, designs):
+        """updates the results of designs, if they are compiled"""
+        if self._results is None:
+            return
+        for design in designs:
+            i_dsn = [d is design for d in self.designs].index(True)
+            self._results.update(i_dsn, design.state)
+
     def compile_results(self, default=np.nan):
         """results = SU2.opt.Project.compile_results(default=np.nan)
-        builds a Bunch() of design results
+        builds a Bunch() of design results, and saves it to results.pkl
 
         Inputs:
             default - value for missing values
@@ -413,110 +594,128 @@ class Project(object):
             results.HISTORY.DIRECT
             results.HISTORY.ADJOINT_*
 
+        Project.results holds the same values as masked arrays.
         """
 
-        results = su2io.State()
-        results.VARIABLES = []
-        del results.FILES
-        filename = self.results_filename
-
-        n_dv = 0
-
-        # populate fields
-        for i, design in enumerate(self.designs):
-            for key in design.state.FUNCTIONS.keys():
-                results.FUNCTIONS[key] = []
-            for key in design.state.GRADIENTS.keys():
-                results.GRADIENTS[key] = []
-            for TYPE in design.state.HISTORY.keys():
-                if not TYPE in results.HISTORY:
-                    results.HISTORY[TYPE] = su2util.ordered_bunch()
-                for key in design.state.HISTORY[TYPE].keys():
-                    results.HISTORY[TYPE][key] = []
-            this_ndv = len(design.state.design_vector())
-
-            # check design vectors are of same length
-            if i == 0:
-                n_dv = this_ndv
-            else:
-                if n_dv != this_ndv:
-                    warn("different dv vector length during compile_results()")
-        #: for each design
-
-        # populate results
-        for design in self.designs:
-            this_designvector = design.state.design_vector()
-            results.VARIABLES.append(this_designvector)
-            for key in results.FUNCTIONS.keys():
-                if key in design.state.FUNCTIONS:
-                    new_func = design.state.FUNCTIONS[key]
-                else:
-                    new_func = default
-                results.FUNCTIONS[key].append(new_func)
-            for key in results.GRADIENTS.keys():
-                if key in design.state.GRADIENTS:
-                    new_grad = design.state.GRADIENTS[key]
-                else:
-                    new_grad = [default] * len(this_designvector)
-                results.GRADIENTS[key].append(new_grad)
-            for TYPE in results.HISTORY.keys():
-                for key in results.HISTORY[TYPE].keys():
-                    if key in results.FUNCTIONS.keys():
-                        new_func = results.FUNCTIONS[key][-1]
-                    elif (
-                        TYPE in design.state.HISTORY.keys()
-                        and key in design.state.HISTORY[TYPE].keys()
-                    ):
-                        new_func = design.state.HISTORY[TYPE][key][-1]
-                    else:
-                        new_func = default
-                    results.HISTORY[TYPE][key].append(new_func)
-        #: for each design
-
-        # save
-        self.results = results
-        su2io.save_data(filename, results)
+        results = self.results.export(default)
+        su2io.save_data(self.results_filename, results)
 
-        return self.results
+        return results
 
     def deep_compile(self):
         """Project.deep_compile()
-        recompiles project using design files saved in each design folder
-        useful if designs were run outside of project class
+        recompiles project using the design states saved in each design
+        folder, useful if designs were run outside of project class
         """
 
         project_folder = self.folder
         designs = self.designs
 
         with su2io.redirect_folder(project_folder):
-            for i_dsn, design in enumerate(designs):
+            for design in designs:
                 design_filename = os.path.join(design.folder, design.filename)
-                self.designs[i_dsn] = su2io.load_data(design_filename)
-
+                state = su2io.load_data(design_filename, ["state"])["state"]
+                design.state = state
+                design.files = state.FILES
+                design.funcs = state.FUNCTIONS
+                design.grads = state.GRADIENTS
+
+            self._n_stored = 0
+            self._store_designs()
+            self._compact_store()
+            self._results = None
             self.compile_results()
-            su2io.save_data(self.filename, self)
+            self._save_project()
 
         return
 
     def plot_results(self):
         """writes a tecplot file for plotting design results"""
         output_format = self.config.TABULAR_FORMAT
-        functions = self.results.FUNCTIONS
-        history = self.results.HISTORY
-
-        results_plot = su2util.ordered_bunch()
-        results_plot.EVALUATION = range(1, len(self.designs) + 1)
-        results_plot.update(functions)
-        results_plot.update(history.get("DIRECT", {}))
 
         if output_format == "CSV":
-            su2util.write_plot("history_project.csv", output_format, results_plot)
+            self.results.write_plot("history_project.csv", output_format)
         else:
-            su2util.write_plot("history_project.dat", output_format, results_plot)
+            self.results.write_plot("history_project.dat", output_format)
 
     def save(self):
         with su2io.redirect_folder(self.folder):
+            self._store_designs()
+            self._compact_store()
+            self.compile_results()
+            self._save_project()
+
+    def _store_designs(self, designs=()):
+        """appends designs, and the designs that are not stored yet,
+        to the design store, works in the project folder
+        """
+        indices = set(range(self._n_stored, len(self.designs)))
+        for design in designs:
+            indices.add([d is design for d in self.designs].index(True))
+
+        store = su2io.DesignStore(self.store_filename)
+        store.append([(i_dsn, self.designs[i_dsn]) for i_dsn in sorted(indices)])
+        self._n_stale += len([i_dsn for i_dsn in indices if i_dsn < self._n_stored])
+        self._n_stored = len(self.designs)
+
+        # older versions are removed once they outnumber the designs
+        if self._n_stale > len(self.designs):
+            self._compact_store()
+
+    def _compact_store(self):
+        """removes the older design versions from the design store"""
+        su2io.DesignStore(self.store_filename).compact()
+        self._n_stale = 0
+
+    def _save_project(self):
+        """saves the project file, works in the project folder
+        the designs are in the design store, the project file keeps
+        its absolute path
+        """
+        self._store_path = os.path.abspath(self.store_filename)
+        try:
             su2io.save_data(self.filename, self)
+        finally:
+            self._store_path = None
+
+    def __getstate__(self):
+        """the designs are pickled with the project, except in the
+        project file, and the results are compiled again when read
+        """
+        state = self.__dict__.copy()
+        state.pop("_store_path", None)
+        state["_results"] = None
+        state.pop("_design_index", None)
+        if self._store_path is not None:
+            del state["designs"]
+            state["store_path"] = self._store_path
+        return state
+
+    def __setstate__(self, state):
+        """loads the designs of a project file from the design store,
+        at the path it was saved with, or else in the project folder
+        relative to the working directory
+        """
+        state = dict(state)
+        state.pop("results", None)
+        state["_results"] = None
+        store_path = state.pop("store_path", None)
+        self.__dict__.update(state)
+        if "designs" in state:
+            if not "store_filename" in state:
+                # saved before the design store, store all designs on save
+                self.store_filename = "designs.db"
+                self._n_stored = 0
+            return
+
+        filename = os.path.join(self.folder, self.store_filename)
+        if store_path is not None and os.path.exists(store_path):
+            filename = store_path
+        self.designs = su2io.DesignStore(filename).load()
+        if len(self.designs) < self._n_stored:
+            n_missing = self._n_stored - len(self.designs)
+            warn("%i designs missing from %s" % (n_missing, filename))
+        self._n_stored = len(self.designs)
 
     def __repr__(self):
         return "<Project> with %i <Design>" % len(self.designs)
@@ -524,3 +723,37 @@ class Project(object):
     def __str__(self):
         output = self.__repr__()
         return output
+
+
+#: class Project
+
+
+def _eval_design(design, func, dvs):
+    """vals, design = _eval_design(design, func, dvs)
+    evaluates a design of SU2.opt.Project.eval_designs() in a worker
+    process, and returns the values with the evaluated design
+    """
+    vals = design._eval(func, dvs)
+    return vals, design
+
+
+def _seed_file(folder, name):
+    """returns the path of a file, or list of files, of a seed design"""
+    if isinstance(name, list):
+        return [os.path.join(folder, elem) for elem in name]
+    return os.path.join(folder, name)
+
+
+def _is_solution(key):
+    """True if the file type key is a direct or adjoint solution"""
+    return key == "DIRECT" or key.startswith("ADJOINT_")
+
+
+def _design_point(config):
+    """returns DV_VALUE_NEW of config as a tuple of floats,
+    or None if it has none
+    """
+    try:
+        return tuple(float(x) for x in config["DV_VALUE_NEW"])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+
+## \file results.py
+#  \brief compiled results of the designs of a project
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import numpy as np
+from .. import io as su2io
+from .. import util as su2util
+from warnings import warn
+
+# ----------------------------------------------------------------------
+#  Results Class
+# ----------------------------------------------------------------------
+
+
+class Results(object):
+    """results = SU2.opt.Results()
+
+    Compiled results of the designs of a project, one row per design.
+    Each result is a column of a numpy array that grows by doubling,
+    so updating the row of a design does not depend on the number of
+    designs. Values that a design does not have are masked.
+
+    Attributes, masked arrays with one row per design:
+        VARIABLES - design vectors, n_designs x n_dv
+        FUNCTIONS - bunch of function values, n_designs
+        GRADIENTS - bunch of gradients, n_designs x n_dv
+        HISTORY   - bunch per history type, e.g. DIRECT, of the last
+                    history values, n_designs, history values of
+                    the functions are their function values
+
+    Methods:
+        resize(n_designs)                 - sets the number of designs
+        update(i_dsn, state)              - sets the row of a design
+        export(default=np.nan)            - State of lists, missing
+                                            values set to default
+        write_plot(filename, plot_format) - writes the plot of the
+                                            project history
+    """
+
+    def __init__(self):
+        self.n_designs = 0
+        self._capacity = 0
+        self._variables = _Column()
+        self._functions = su2util.ordered_bunch()
+        self._gradients = su2util.ordered_bunch()
+        self._history = su2util.ordered_bunch()
+
+    def _columns(self):
+        yield self._variables
+        for column in self._functions.values():
+            yield column
+        for column in self._gradients.values():
+            yield column
+        for columns in self._history.values():
+            for column in columns.values():
+                yield column
+
+    def resize(self, n_designs):
+        """SU2.opt.Results.resize(n_designs)
+        sets the number of designs, new rows are masked
+        """
+        if n_designs > self._capacity:
+            capacity = max(n_designs, 2 * self._capacity, 16)
+            for column in self._columns():
+                column.grow(capacity)
+            self._capacity = capacity
+        self.n_designs = max(self.n_designs, n_designs)
+
+    def update(self, i_dsn, state):
+        """SU2.opt.Results.update(i_dsn, state)
+        sets the row of design i_dsn from its state
+        """
+
+        self.resize(i_dsn + 1)
+        for column in self._columns():
+            column.mask[i_dsn] = True
+
+        # design vector
+        vector = state.design_vector()
+        n_dv = self._variables.width
+        if self.n_designs > 1 and n_dv and n_dv != len(vector):
+            warn("different dv vector length during compile_results()")
+        self._variables.set(i_dsn, vector, self._capacity)
+
+        # functions
+        for key, value in state.FUNCTIONS.items():
+            column = self._column(self._functions, key)
+            column.set(i_dsn, value, self._capacity)
+
+        # gradients
+        for key, value in state.GRADIENTS.items():
+            column = self._column(self._gradients, key)
+            column.set(i_dsn, value, self._capacity)
+
+        # last history values, see _history_columns()
+        for TYPE, history in state.HISTORY.items():
+            if not TYPE in self._history:
+                self._history[TYPE] = su2util.ordered_bunch()
+            for key, values in history.items():
+                column = self._column(self._history[TYPE], key)
+                if len(values):
+                    column.set(i_dsn, values[-1], self._capacity)
+
+    def _history_columns(self, TYPE):
+        """returns the history columns of TYPE, where the columns of
+        keys that are functions of any design are the function columns
+        """
+        columns = su2util.ordered_bunch()
+        for key, column in self._history[TYPE].items():
+            columns[key] = self._functions.get(key, column)
+        return columns
+
+    def _column(self, columns, key):
+        """returns the column key of columns, added if missing"""
+        if not key in columns:
+            columns[key] = _Column(self._capacity)
+        return columns[key]
+
+    @property
+    def VARIABLES(self):
+        return self._variables.view(self.n_designs)
+
+    @property
+    def FUNCTIONS(self):
+        return self._views(self._functions)
+
+    @property
+    def GRADIENTS(self):
+        return self._views(self._gradients)
+
+    @property
+    def HISTORY(self):
+        history = su2util.ordered_bunch()
+        for TYPE in self._history.keys():
+            history[TYPE] = self._views(self._history_columns(TYPE))
+        return history
+
+    def _views(self, columns):
+        views = su2util.ordered_bunch()
+        for key, column in columns.items():
+            views[key] = column.view(self.n_designs)
+        return views
+
+    def export(self, default=np.nan):
+        """results = SU2.opt.Results.export(default=np.nan)
+        returns the results as a state with lists of values ordered
+        by design, missing values set to default, see
+        SU2.opt.Project.compile_results()
+        """
+
+        results = su2io.State()
+        del results.FILES
+        n = self.n_designs
+
+        widths = self._variables.widths(n)
+        results.VARIABLES = self._variables.rows(n, widths, default)
+        for key, column in self._functions.items():
+            results.FUNCTIONS[key] = column.values(n, default)
+        for key, column in self._gradients.items():
+            results.GRADIENTS[key] = column.rows(n, widths, default)
+        for TYPE in self._history.keys():
+            results.HISTORY[TYPE] = su2util.ordered_bunch()
+            for key, column in self._history_columns(TYPE).items():
+                results.HISTORY[TYPE][key] = column.values(n, default)
+
+        return results
+
+    def write_plot(self, filename, plot_format):
+        """SU2.opt.Results.write_plot(filename, plot_format)
+        writes the function values and last direct history values of
+        each design, missing values as nan, see SU2.util.write_plot()
+        """
+        n = self.n_designs
+
+        results_plot = su2util.ordered_bunch()
+        results_plot.EVALUATION = range(1, n + 1)
+        for key, column in self._functions.items():
+            results_plot[key] = column.values(n, np.nan)
+        if "DIRECT" in self._history:
+            for key, column in self._history_columns("DIRECT").items():
+                results_plot[key] = column.values(n, np.nan)
+
+        su2util.write_plot(filename, plot_format, results_plot)
+
+    def __repr__(self):
+        return "<Results> of %i designs" % self.n_designs
+
+
+#: class Results
+
+
+class _Column(object):
+    """a growable array of float rows, scalars or vectors, with a mask,
+    and a flag of the values that were set as integers
+    """
+
+    def __init__(self, capacity=0):
+        self.width = 0
+        self.vector = False
+        self.data = np.zeros((capacity, 1))
+        self.mask = np.ones((capacity, 1), dtype=bool)
+        self.integer = np.zeros((capacity, 1), dtype=bool)
+
+    def grow(self, capacity):
+        """adds masked rows up to capacity"""
+        n_rows, width = self.data.shape
+        data = np.zeros((capacity, width))
+        mask = np.ones((capacity, width), dtype=bool)
+        integer = np.zeros((capacity, width), dtype=bool)
+        data[:n_rows] = self.data
+        mask[:n_rows] = self.mask
+        integer[:n_rows] = self.integer
+        self.data, self.mask, self.integer = data, mask, integer
+
+    def set(self, i_row, value, capacity):
+        """sets row i_row to value, a number or a list of numbers,
+        values that are not numbers stay masked
+        """
+        if len(self.data) < capacity:
+            self.grow(capacity)
+
+        if isinstance(value, (list, tuple, np.ndarray)):
+            self.vector = True
+            value = list(value)
+        else:
+            value = [value]
+
+        if len(value) > self.data.shape[1]:
+            n_rows, width = self.data.shape
+            pad = len(value) - width
+            self.data = np.hstack([self.data, np.zeros((n_rows, pad))])
+            self.mask = np.hstack([self.mask, np.ones((n_rows, pad), dtype=bool)])
+            self.integer = np.hstack(
+                [self.integer, np.zeros((n_rows, pad), dtype=bool)]
+            )
+        self.width = max(self.width, len(value))
+
+        self.mask[i_row] = True
+        self.integer[i_row] = False
+        for j, v in enumerate(value):
+            try:
+                self.data[i_row, j] = float(v)
+            except (TypeError, ValueError):
+                continue
+            self.mask[i_row, j] = False
+            self.integer[i_row, j] = isinstance(v, (int, np.integer))
+
+    def view(self, n_rows):
+        """returns the first n_rows as a masked array, without copying"""
+        width = max(self.width, 1)
+        data = self.data[:n_rows, :width]
+        mask = self.mask[:n_rows, :width]
+        if not self.vector:
+            data, mask = data[:, 0], mask[:, 0]
+        return np.ma.MaskedArray(data, mask, copy=False)
+
+    def values(self, n_rows, default):
+        """returns the first n_rows of a scalar column as a list,
+        values set as integers are integers
+        """
+        values = self.view(n_rows).filled(default).tolist()
+        if self.vector:
+            return values
+        for i_row in np.flatnonzero(self.integer[:n_rows, 0] & ~self.mask[:n_rows, 0]):
+            values[i_row] = int(values[i_row])
+        return values
+
+    def widths(self, n_rows):
+        """returns the number of set values of each row"""
+        mask = self.mask[:n_rows]
+        if mask.shape[1] == 0:
+            return [0] * n_rows
+        # values of a row are set from its first column on
+        last = mask.shape[1] - np.argmax(~mask[:, ::-1], axis=1)
+        return np.where(mask.all(axis=1), 0, last).tolist()
+
+    def rows(self, n_rows, widths, default):
+        """returns the first n_rows of a vector column as a list of
+        lists, rows without values have length widths[i]
+        """
+        data = self.view(n_rows)
+        if not self.vector:
+            data = data.reshape((n_rows, 1))
+        data = data.filled(default)
+        rows = []
+        for i_row, width in enumerate(self.widths(n_rows)):
+            if not width:
+                width = widths[i_row]
+            row = data[i_row, :width].tolist()
+            row.extend([default] * (width - len(row)))
+            rows.append(row)
+        return rows
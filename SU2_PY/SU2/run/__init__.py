@@ -1,6 +1,11 @@
 # SU2/run/__init__.py
 
-from .interface import build_command, run_command, CFD, DEF, DOT, SOL, SOL_FSI
+from .interface import build_command, run_command, run_command_async, launch
+from .interface import core_budget, concurrent_runs, split_partitions
+from .interface import multipoint_partitions
+from .interface import CFD, DEF, DOT, SOL, SOL_FSI
+from .scheduler import get_scheduler, Scheduler, SchedulerBackend, scheduler_backends
+from .inprocess import inprocess_enabled
 
 from .direct import direct
 from .adjoint import adjoint
@@ -40,14 +40,17 @@ from .interface import CFD as SU2_CFD
 # ----------------------------------------------------------------------
 
 
-def direct(config):
-    """info = SU2.run.direct(config)
+def direct(config, monitor=None):
+    """info = SU2.run.direct(config, monitor=None)
 
     Runs an adjoint analysis with:
         SU2.run.decomp()
         SU2.run.CFD()
         SU2.run.merge()
 
+    Inputs:
+        monitor - optional callable, passed on to SU2.run.CFD()
+
     Assumptions:
         Does not rename restart filename to solution filename
         Adds 'direct' suffix to convergence filename
@@ -75,7 +78,7 @@ def direct(config):
     direct_diff = konfig.get("DIRECT_DIFF", "NO") == "YES"
 
     # Run Solution
-    SU2_CFD(konfig)
+    SU2_CFD(konfig, monitor)
 
     # multizone cases
     multizone_cases = su2io.get_multizone(konfig)
@@ -86,22 +89,9 @@ def direct(config):
         konfig["SOLUTION_FILENAME"] = konfig["RESTART_FILENAME"]
 
     # filenames
-    plot_format = konfig.get("TABULAR_FORMAT", "CSV")
-    plot_extension = su2io.get_extension(plot_format)
-
-    # adapt the history_filename, if a restart solution is chosen
-    # check for 'RESTART_ITER' is to avoid forced restart situation in "compute_polar.py"...
-    if konfig.get("RESTART_SOL", "NO") == "YES" and konfig.get("RESTART_ITER", 1) != 1:
-        if konfig.get("CONFIG_LIST", []) != []:
-            konfig[
-                "CONV_FILENAME"
-            ] = "config_CFD"  # master cfg is always config_CFD. Hardcoded names are prob nt ideal.
-        restart_iter = "_" + str(konfig["RESTART_ITER"]).zfill(5)
-        history_filename = konfig["CONV_FILENAME"] + restart_iter + plot_extension
-    else:
-        if konfig.get("CONFIG_LIST", []) != []:
-            konfig["CONV_FILENAME"] = "config_CFD"
-        history_filename = konfig["CONV_FILENAME"] + plot_extension
+    history_filename = su2io.get_historyFilename(konfig)
+    if konfig.get("CONFIG_LIST", []) != []:
+        konfig["CONV_FILENAME"] = "config_CFD"
 
     special_cases = su2io.get_specialCases(konfig)
 
@@ -104,12 +104,14 @@ def geometry(config, step=1e-3):
     if konfig.GEO_MODE == "FUNCTION":
         functions = su2io.tools.read_plot(func_filename)
         for key, value in functions.items():
-            functions[key] = value[0]
+            functions[key] = float(value[0])
         info.FUNCTIONS.update(functions)
 
     # get gradient_values
     if konfig.GEO_MODE == "GRADIENT":
         gradients = su2io.tools.read_plot(grad_filename)
+        for key, value in gradients.items():
+            gradients[key] = value.tolist()
         info.GRADIENTS.update(gradients)
 
     return info
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+## \file inprocess.py
+#  \brief runs the SU2 suite in process through the python wrapper
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, sys, importlib, traceback
+import multiprocessing as mp
+from .. import EvaluationFailure
+from .scheduler import get_scheduler
+
+# ----------------------------------------------------------------------
+#  In-Process Setup
+# ----------------------------------------------------------------------
+#
+#  SU2_CFD and SU2_DEF run through the pysu2 and pysu2ad wrappers when
+#  the environment variable SU2_PYSU2 is YES. Each run is done by a
+#  process forked from python, which imports the wrapper, runs the
+#  driver and ends, instead of starting an executable. Runs that the
+#  wrapped drivers cannot do, or that need more than one mpi rank, are
+#  launched as usual.
+#
+#  An error of the solver ends the forked process only, and raises an
+#  EvaluationFailure. The wrappers and mpi are not loaded in the python
+#  process, so forking stays safe.
+#
+#  With a core budget SU2_CORES, a run waits for a free core of the
+#  scheduler of SU2.run.get_scheduler() as a launch does, and the forked
+#  process is bound to it, see SU2.run.scheduler.
+#
+#  The drivers are created and finalized for each run. The wrapped
+#  drivers open their history file once, when they are created, and
+#  cannot update the geometry for the mesh of a new design, so a driver
+#  cannot be reused between designs.
+
+# drivers found in the wrappers, by (module, driver)
+_drivers = {}
+
+
+def inprocess_enabled(config, processes=0):
+    """SU2.run.inprocess_enabled(config, processes=0)
+    True if runs of config with processes mpi ranks are done in process,
+    see the environment variable SU2_PYSU2
+    """
+    if not os.environ.get("SU2_PYSU2", "NO").upper() in ["YES", "TRUE", "1"]:
+        return False
+    if not config.get("DIRECT_DIFF", "NONE") in ["NONE", ""]:
+        return False
+    if not hasattr(os, "fork") or int(processes or 0) > 1:
+        return False
+    # a python process started by mpirun runs its own ranks
+    mpi = sys.modules.get("mpi4py.MPI")
+    return mpi is None or mpi.COMM_WORLD.Get_size() == 1
+
+
+# ----------------------------------------------------------------------
+#  In-Process Runs
+# ----------------------------------------------------------------------
+
+
+def CFD(filename, config):
+    """ran = SU2.run.inprocess.CFD(filename, config)
+    runs SU2_CFD on the config file filename in a forked process
+    returns False if the wrapped drivers cannot run config
+    raises EvaluationFailure if the solver fails
+    """
+
+    auto_diff = config.MATH_PROBLEM == "DISCRETE_ADJOINT"
+    multizone = config.get("MULTIZONE", "NO") == "YES"
+    harmonic_balance = config.get("TIME_MARCHING", "NO") == "HARMONIC_BALANCE"
+    if harmonic_balance or int(config.get("NZONES", 1)) != 1:
+        return False
+
+    if auto_diff:
+        module = "pysu2ad"
+        driver_name = "CDiscAdjSinglezoneDriver"
+        if multizone:
+            driver_name = "CDiscAdjMultizoneDriver"
+    else:
+        module = "pysu2"
+        driver_name = "CSinglezoneDriver"
+        if multizone:
+            driver_name = "CMultizoneDriver"
+
+    def run(pysu2, comm):
+        driver = getattr(pysu2, driver_name)(filename, 1, comm)
+        try:
+            driver.StartSolver()
+        finally:
+            driver.Finalize()
+
+    return _run_forked("SU2_CFD", module, driver_name, run)
+
+
+#: def CFD()
+
+
+def DEF(filename, config):
+    """ran = SU2.run.inprocess.DEF(filename, config)
+    runs SU2_DEF on the config file filename in a forked process
+    returns False if the wrapped drivers cannot run config
+    raises EvaluationFailure if the deformation fails
+    """
+
+    def run(pysu2, comm):
+        driver = pysu2.CDeformationDriver(filename, comm)
+        try:
+            driver.Run()
+        finally:
+            driver.Finalize()
+
+    return _run_forked("SU2_DEF", "pysu2", "CDeformationDriver", run)
+
+
+#: def DEF()
+
+
+def _run_forked(name, module, driver_name, run):
+    """calls run(pysu2, comm) in a forked process, with the output of
+    the solver going to sys.stdout, on a core reserved from the
+    scheduler if the core budget SU2_CORES is set
+    returns False if module has no driver_name, without running
+    raises EvaluationFailure if run fails or the process dies
+    """
+
+    if _drivers.get((module, driver_name)) is False:
+        return False
+
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return _fork(name, module, driver_name, run)
+
+    with scheduler.reserve(1) as reservation:
+        return _fork(name, module, driver_name, run, reservation.cpus)
+
+
+#: def _run_forked()
+
+
+def _fork(name, module, driver_name, run, cpus=None):
+    """runs _run_child() in a forked process, bound to cpus if given"""
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except Exception:
+        fd = None
+
+    context = mp.get_context("fork")
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_child, args=(writer, module, driver_name, run, fd, cpus)
+    )
+    process.start()
+    writer.close()
+    try:
+        output = reader.recv()
+    except (EOFError, OSError):
+        output = None
+    reader.close()
+    process.join()
+
+    if output is None:
+        raise EvaluationFailure(
+            "%s ended its process, exit code %s" % (name, process.exitcode)
+        )
+    ran, message = output
+    _drivers[(module, driver_name)] = ran
+    if message is not None:
+        raise EvaluationFailure("%s failed\n%s" % (name, message))
+
+    return ran
+
+
+def _run_child(conn, module, driver_name, run, fd, cpus=None):
+    """runs in the forked process, sends (ran, message) back,
+    message is the traceback if run failed
+    """
+
+    # bound to the reserved cores, as taskset binds a launch
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    # the solver writes to the standard output of this process
+    if fd is not None and fd != 1:
+        os.dup2(fd, 1)
+
+    try:
+        pysu2 = importlib.import_module(module)
+    except ImportError:
+        pysu2 = None
+    if pysu2 is None or not hasattr(pysu2, driver_name):
+        output = (False, None)
+    else:
+        try:
+            run(pysu2, _comm())
+            output = (True, None)
+        except Exception:
+            output = (True, traceback.format_exc())
+
+    _flush_c_stdout()
+    sys.stdout.flush()
+    conn.send(output)
+    conn.close()
+
+
+def _comm():
+    """returns the mpi communicator of this process"""
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        return 0
+    return MPI.COMM_WORLD
+
+
+def _flush_c_stdout():
+    """flushes the C standard output the solver writes to"""
+    try:
+        import ctypes
+
+        ctypes.CDLL(None).fflush(None)
+    except (ImportError, OSError, AttributeError, TypeError):
+        pass
@@ -29,10 +29,13 @@
 #  Imports
 # ----------------------------------------------------------------------
 
-import os, sys, shutil, copy
-import subprocess
-from ..io import Config
+import os, sys, shutil, copy, time
+import subprocess, threading, asyncio, signal
+from ..io import Config, HistoryFollower, get_historyFilename
 from ..util import which
+from .scheduler import get_scheduler
+from . import inprocess
+from .inprocess import inprocess_enabled
 
 # ------------------------------------------------------------
 #  Setup
@@ -75,9 +78,13 @@ return_code_map = {
 # ------------------------------------------------------------
 
 
-def CFD(config):
+def CFD(config, monitor=None):
     """run SU2_CFD
     partitions set by config.NUMBER_PART
+    runs with the pysu2 wrappers if the environment variable SU2_PYSU2
+    is YES, see SU2.run.inprocess
+    if monitor is given, it is called with each batch of new
+    history rows while SU2_CFD is running, see run_command()
     """
     konfig = copy.deepcopy(config)
 
@@ -110,8 +117,18 @@ def CFD(config):
 
         the_Command = "SU2_CFD%s %s" % (quote, tempname)
 
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    if monitor is None:
+        # in process if possible, see SU2.run.inprocess
+        if inprocess_enabled(konfig, processes) and inprocess.CFD(tempname, konfig):
+            return
+        launch(the_Command, processes)
+    else:
+        # a history file of an earlier run in this folder is not followed
+        history_filename = get_historyFilename(konfig)
+        if os.path.exists(history_filename):
+            os.remove(history_filename)
+        history = HistoryFollower(history_filename, konfig.get("NZONES", 1))
+        launch(the_Command, processes, history, monitor)
 
     # os.remove(tempname)
 
@@ -121,6 +138,8 @@ def CFD(config):
 def DEF(config):
     """run SU2_DEF
     partitions set by config.NUMBER_PART
+    runs with the pysu2 wrappers if the environment variable SU2_PYSU2
+    is YES, see SU2.run.inprocess
     forced to run in serial, expects merged mesh input
     """
     konfig = copy.deepcopy(config)
@@ -131,9 +150,12 @@ def DEF(config):
     # must run with rank 1
     processes = konfig["NUMBER_PART"]
 
+    # in process if possible, see SU2.run.inprocess
+    if inprocess_enabled(konfig, processes) and inprocess.DEF(tempname, konfig):
+        return
+
     the_Command = "SU2_DEF%s %s" % (quote, tempname)
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    launch(the_Command, processes)
 
     # os.remove(tempname)
 
@@ -168,8 +190,7 @@ def DOT(config):
 
         the_Command = "SU2_DOT%s %s" % (quote, tempname)
 
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    launch(the_Command, processes)
 
     # os.remove(tempname)
 
@@ -190,8 +211,7 @@ def GEO(config):
     processes = konfig["NUMBER_PART"]
 
     the_Command = "SU2_GEO%s %s" % (quote, tempname)
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    launch(the_Command, processes)
 
     # os.remove(tempname)
 
@@ -212,8 +232,7 @@ def SOL(config):
     processes = konfig["NUMBER_PART"]
 
     the_Command = "SU2_SOL%s %s" % (quote, tempname)
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    launch(the_Command, processes)
 
     # os.remove(tempname)
 
@@ -234,8 +253,7 @@ def SOL_FSI(config):
     processes = konfig["NUMBER_PART"]
 
     the_Command = "SU2_SOL%s %s 2" % (quote, tempname)
-    the_Command = build_command(the_Command, processes)
-    run_command(the_Command)
+    launch(the_Command, processes)
 
     # os.remove(tempname)
 
@@ -257,9 +275,95 @@ def build_command(the_Command, processes=0):
     return the_Command
 
 
-def run_command(Command):
+def launch(the_Command, processes=0, history=None, monitor=None):
+    """runs an SU2 suite executable with given number of processes
+    if the core budget SU2_CORES is set, waits for free cores of the
+    scheduler of SU2.run.get_scheduler() and runs on them, see run_command()
+    """
+    scheduler = get_scheduler(mpi_Command)
+    if scheduler is None:
+        the_Command = build_command(the_Command, processes)
+        return run_command(the_Command, history, monitor)
+
+    with scheduler.reserve(processes) as reservation:
+        the_Command = quote + (base_Command % the_Command)
+        the_Command = scheduler.command(the_Command, processes, reservation)
+        return run_command(the_Command, history, monitor)
+
+
+def core_budget():
+    """n_cores = SU2.run.core_budget()
+    number of cores available to concurrent SU2 runs, set by the
+    environment variable SU2_CORES, zero if not set
+    """
+    return int(os.environ.get("SU2_CORES", 0) or 0)
+
+
+def concurrent_runs(config, n_jobs=None):
+    """n_runs = SU2.run.concurrent_runs(config, n_jobs=None)
+    number of SU2 runs with config.NUMBER_PART processes each that fit
+    in the core budget set by the environment variable SU2_CORES,
+    at least one, and at most n_jobs if given
+
+    without SU2_CORES, runs are not concurrent
+    """
+    processes = max(int(config.get("NUMBER_PART", 0) or 0), 1)
+    n_runs = max(core_budget() // processes, 1)
+    if n_jobs is not None:
+        n_runs = max(min(n_runs, n_jobs), 1)
+    return n_runs
+
+
+def split_partitions(config, n_jobs):
+    """n_runs, number_part = SU2.run.split_partitions(config, n_jobs)
+    splits the core budget set by the environment variable SU2_CORES
+    between n_jobs independent runs of config, giving each run at
+    most config.NUMBER_PART processes
+
+    Outputs:
+        n_runs      - number of concurrent runs, one without SU2_CORES
+        number_part - processes for each run
+    """
+    number_part = int(config.get("NUMBER_PART", 0) or 0)
+    n_cores = core_budget()
+    if n_cores <= 0 or n_jobs < 2:
+        return 1, number_part
+
+    part = min(max(number_part, 1), max(n_cores // n_jobs, 1))
+    n_runs = min(n_jobs, max(n_cores // part, 1))
+    if number_part > 0:
+        number_part = part
+    return n_runs, number_part
+
+
+def multipoint_partitions(config, n_points):
+    """partitions = SU2.run.multipoint_partitions(config, n_points)
+    mpi ranks of each multipoint point, from the comma separated list
+    in the environment variable SU2_MULTIPOINT_PART, or
+    config.NUMBER_PART for every point if not set
+    """
+    number_part = int(config.get("NUMBER_PART", 0) or 0)
+    partitions = os.environ.get("SU2_MULTIPOINT_PART", "")
+    if not partitions.strip():
+        return [number_part] * n_points
+
+    partitions = [int(x) for x in partitions.split(",")]
+    if len(partitions) != n_points:
+        raise ValueError(
+            "SU2_MULTIPOINT_PART has %i entries for %i multipoint points"
+            % (len(partitions), n_points)
+        )
+    return partitions
+
+
+def run_command(Command, history=None, monitor=None, poll_interval=1.0):
     """runs os command with subprocess
     checks for errors from command
+
+    if a HistoryFollower and a monitor are given, the history is polled
+    every poll_interval seconds while the command runs, and monitor is
+    called with each batch of new rows. if monitor raises, the command
+    is terminated and the exception is re-raised.
     """
 
     sys.stdout.flush()
@@ -267,9 +371,114 @@ def run_command(Command):
     proc = subprocess.Popen(
         Command, shell=True, stdout=sys.stdout, stderr=subprocess.PIPE
     )
-    return_code = proc.wait()
-    message = proc.stderr.read().decode()
 
+    if history is None or monitor is None:
+        # read stderr while waiting, a full pipe would block the process
+        message = proc.communicate()[1].decode()
+        return_code = proc.returncode
+    else:
+        # drain stderr in the background so the process never blocks on it
+        stderr_lines = []
+        reader = threading.Thread(
+            target=lambda: stderr_lines.extend(proc.stderr.readlines())
+        )
+        reader.daemon = True
+        reader.start()
+
+        try:
+            while True:
+                return_code = proc.poll()
+                batch = history.read()
+                if batch is not None:
+                    monitor(batch)
+                if return_code is not None:
+                    break
+                time.sleep(poll_interval)
+        except:
+            proc.terminate()
+            proc.wait()
+            raise
+        reader.join()
+        message = b"".join(stderr_lines).decode()
+
+    check_return_code(Command, return_code, message)
+
+    return return_code
+
+
+async def run_command_async(Command, stdout=None, stderr=None):
+    """return_code = await SU2.run.run_command_async(Command, stdout=None, stderr=None)
+    runs os command with asyncio, without blocking the event loop
+    checks for errors from command, as run_command()
+
+    Inputs:
+        Command - os command
+        stdout  - called with each line of standard output as it
+                  is written, default writes it to sys.stdout
+        stderr  - called with each line of standard error,
+                  which is also reported as in run_command()
+
+    Several commands can run at once from one event loop, e.g.
+        asyncio.run(asyncio.gather(run_command_async(cmd1),
+                                   run_command_async(cmd2)))
+    if the awaiting task is cancelled, the command is terminated.
+    """
+
+    if stdout is None:
+
+        def stdout(line):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    sys.stdout.flush()
+
+    # own process group, so that the shell and its children can be stopped
+    posix = os.name == "posix"
+    proc = await asyncio.create_subprocess_shell(
+        Command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=1 << 24,
+        start_new_session=posix,
+    )
+
+    stderr_lines = []
+
+    async def stream(pipe, callback, lines=None):
+        while True:
+            line = await pipe.readline()
+            if not line:
+                break
+            line = line.decode(errors="replace")
+            if lines is not None:
+                lines.append(line)
+            if callback is not None:
+                callback(line)
+
+    try:
+        await asyncio.gather(
+            stream(proc.stdout, stdout), stream(proc.stderr, stderr, stderr_lines)
+        )
+        return_code = await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            if posix:
+                os.killpg(proc.pid, signal.SIGTERM)
+            else:
+                proc.terminate()
+            await asyncio.shield(proc.wait())
+        raise
+
+    check_return_code(Command, return_code, "".join(stderr_lines))
+
+    return return_code
+
+
+def check_return_code(Command, return_code, message):
+    """raises the exception of return_code of Command, see return_code_map,
+    with message as error output, or writes message to sys.stdout
+    if the command succeeded
+    """
     if return_code < 0:
         message = "SU2 process was terminated by signal '%s'\n%s" % (
             -return_code,
@@ -290,5 +499,3 @@ def run_command(Command):
         raise exception(message)
     else:
         sys.stdout.write(message)
-
-    return return_code
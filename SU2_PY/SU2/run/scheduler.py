@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+
+## \file scheduler.py
+#  \brief core-aware scheduler for launches of the SU2 suite
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, abc, glob, time, tempfile
+from random import random
+from ..util import which
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ----------------------------------------------------------------------
+#  Scheduler Setup
+# ----------------------------------------------------------------------
+#
+#  Launches are scheduled when the environment variable SU2_CORES sets
+#  a core budget, see SU2.run.core_budget(). Every launch of an SU2
+#  executable then waits until enough cores of the budget are free,
+#  also when launched from other processes of the same user.
+#
+#  SU2_SCHEDULER       - backend, one of scheduler_backends, default
+#                        SRUN in a slurm job, HOSTFILE if SU2_HOSTFILE
+#                        is set, and LOCAL otherwise
+#  SU2_HOSTFILE        - hostfile of the HOSTFILE backend, with lines
+#                        "host slots=n", "host:n" or "host"
+#  SU2_SCHEDULER_DIR   - folder of the core lock files, shared by the
+#                        processes that share the cores
+
+
+def get_scheduler(mpi_command=""):
+    """scheduler = SU2.run.get_scheduler(mpi_command='')
+    returns the Scheduler set by the environment, or None
+    if launches are not scheduled
+
+    Inputs:
+        mpi_command - mpi command template of the LOCAL backend,
+                      with %i processes and %s command
+    """
+
+    n_cores = int(os.environ.get("SU2_CORES", 0) or 0)
+    if n_cores <= 0 or fcntl is None:
+        return None
+
+    name = os.environ.get("SU2_SCHEDULER", "")
+    if not name:
+        if "SLURM_JOBID" in os.environ and not "SU2_MPI_COMMAND" in os.environ:
+            name = "SRUN"
+        elif os.environ.get("SU2_HOSTFILE", ""):
+            name = "HOSTFILE"
+        else:
+            name = "LOCAL"
+    name = name.upper()
+    if not name in scheduler_backends:
+        raise ValueError(
+            "SU2_SCHEDULER %s is not one of %s"
+            % (name, ", ".join(scheduler_backends.keys()))
+        )
+
+    lock_dir = os.environ.get("SU2_SCHEDULER_DIR", "")
+    if not lock_dir:
+        lock_dir = os.path.join(tempfile.gettempdir(), "su2_scheduler_%i" % os.getuid())
+
+    key = (name, n_cores, os.path.abspath(lock_dir), mpi_command)
+    if not key in _schedulers:
+        backend = scheduler_backends[name](mpi_command)
+        _schedulers[key] = Scheduler(backend, n_cores, lock_dir)
+
+    return _schedulers[key]
+
+
+_schedulers = {}
+
+# ----------------------------------------------------------------------
+#  Scheduler Class
+# ----------------------------------------------------------------------
+
+
+class Scheduler(object):
+    """scheduler = SU2.run.Scheduler(backend, n_cores, lock_dir)
+
+    Queues launches until enough cores are free. Each core of the
+    budget has a lock file in lock_dir, locked while a launch uses it,
+    so that processes sharing lock_dir share the cores. Locks are
+    released by the operating system if a process dies.
+
+    Inputs:
+        backend  - SchedulerBackend, gives the cores, their domains
+                   and the launch commands
+        n_cores  - core budget, at most the cores of the backend
+        lock_dir - folder for the lock files
+
+    Use:
+        with scheduler.reserve(processes) as reservation:
+            command = scheduler.command(the_Command, processes, reservation)
+            ...
+
+    Cores of one domain, e.g. a NUMA node or a host, are preferred
+    for a launch. Launches of more processes than the budget take
+    all cores and oversubscribe them.
+    """
+
+    def __init__(self, backend, n_cores, lock_dir, poll_interval=0.5):
+
+        self.backend = backend
+        self.slots = backend.slots()[: max(int(n_cores), 1)]
+        self.domains = [
+            [s for s in domain if s in self.slots] for domain in backend.domains()
+        ]
+        self.domains = [domain for domain in self.domains if domain]
+        in_domains = set(s for domain in self.domains for s in domain)
+        others = [s for s in self.slots if not s in in_domains]
+        if others:
+            self.domains.append(others)
+        self.lock_dir = lock_dir
+        self.poll_interval = poll_interval
+
+        if not os.path.exists(lock_dir):
+            os.makedirs(lock_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def reserve(self, processes):
+        """reservation = scheduler.reserve(processes)
+        waits until cores for processes are free and reserves them
+        release with reservation.release(), or use in a with statement
+        """
+        n_slots = min(max(int(processes), 1), len(self.slots))
+        while True:
+            reservation = self._try_reserve(n_slots)
+            if reservation is not None:
+                return reservation
+            time.sleep(self.poll_interval * (1.0 + 0.2 * random()))
+
+    def command(self, the_Command, processes, reservation):
+        """returns the launch command of the_Command on the reserved cores"""
+        return self.backend.command(the_Command, processes, reservation)
+
+    def _try_reserve(self, n_slots):
+        """reserves n_slots free cores, or returns None"""
+
+        # one process looks for free cores at a time
+        with _FileLock(os.path.join(self.lock_dir, "scheduler.lock")):
+
+            held = []
+            for slot in self.slots:
+                lock = _FileLock(self._lockname(slot), blocking=False)
+                if lock.acquire():
+                    held.append((slot, lock))
+
+            chosen = self._choose([slot for slot, lock in held], n_slots)
+            locks = []
+            for slot, lock in held:
+                if chosen is not None and slot in chosen:
+                    locks.append(lock)
+                else:
+                    lock.release()
+
+        if chosen is None:
+            return None
+        return Reservation(chosen, locks)
+
+    def _choose(self, free, n_slots):
+        """chooses n_slots of the free cores, preferring one domain"""
+
+        if len(free) < n_slots:
+            return None
+        free = set(free)
+
+        # the domain with the fewest free cores that fits
+        fits = []
+        for domain in self.domains:
+            free_domain = [s for s in domain if s in free]
+            if len(free_domain) >= n_slots:
+                fits.append((len(free_domain), free_domain))
+        if fits:
+            fits.sort(key=lambda f: f[0])
+            return fits[0][1][:n_slots]
+
+        # spread over the domains with the most free cores
+        spread = [[s for s in domain if s in free] for domain in self.domains]
+        spread.sort(key=len, reverse=True)
+        chosen = []
+        for free_domain in spread:
+            chosen += free_domain[: n_slots - len(chosen)]
+        return chosen
+
+    def _lockname(self, slot):
+        host, index = slot
+        return os.path.join(self.lock_dir, "core_%s_%i.lock" % (host or "local", index))
+
+
+#: class Scheduler
+
+
+class Reservation(object):
+    """reserved cores of a Scheduler launch
+
+    Attributes:
+        slots - list of (host, index) of the reserved cores,
+                host is empty for cores of this machine
+        cpus  - cpu numbers for binding on this machine, or None
+        hosts - ordered dictionary of host and number of cores
+    """
+
+    def __init__(self, slots, locks):
+        self.slots = slots
+        self._locks = locks
+
+        self.cpus = None
+        if all(not host for host, index in slots):
+            self.cpus = [index for host, index in slots]
+
+        self.hosts = {}
+        for host, index in slots:
+            self.hosts[host] = self.hosts.get(host, 0) + 1
+
+    def release(self):
+        for lock in self._locks:
+            lock.release()
+        self._locks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+
+#: class Reservation
+
+
+class _FileLock(object):
+    """fcntl.flock() of a lock file, released when closed
+    or when the process dies
+    """
+
+    def __init__(self, filename, blocking=True):
+        self.filename = filename
+        self.blocking = blocking
+        self.fd = None
+
+    def acquire(self):
+        fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o666)
+        flags = fcntl.LOCK_EX
+        if not self.blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except (BlockingIOError, PermissionError):
+            os.close(fd)
+            return False
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+# ----------------------------------------------------------------------
+#  Scheduler Backends
+# ----------------------------------------------------------------------
+
+
+class SchedulerBackend(abc.ABC):
+    """backend = SchedulerBackend(mpi_command)
+
+    Base class of the Scheduler backends, which list the cores as
+    (host, index) slots, group them into domains, and build the
+    launch commands. New backends are added to scheduler_backends.
+    """
+
+    def __init__(self, mpi_command=""):
+        self.mpi_command = mpi_command
+
+    @abc.abstractmethod
+    def slots(self):
+        """returns the list of (host, index) cores"""
+
+    def domains(self):
+        """returns lists of slots that are close to each other"""
+        return [self.slots()]
+
+    @abc.abstractmethod
+    def command(self, the_Command, processes, reservation):
+        """returns the launch command of the_Command on the reservation"""
+
+
+class LocalBackend(SchedulerBackend):
+    """cores of this machine, grouped by NUMA node, launches with the
+    mpi command under taskset, which binds the launch and the processes
+    it starts to the reserved cpus
+    """
+
+    taskset_command = "taskset -c %s %s"
+
+    def __init__(self, mpi_command=""):
+        SchedulerBackend.__init__(self, mpi_command)
+        self.taskset = which("taskset")
+
+    def slots(self):
+        if hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+        return [("", cpu) for cpu in cpus]
+
+    def domains(self):
+        slots = self.slots()
+        domains = []
+        for node in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+            try:
+                with open(node) as node_file:
+                    cpus = _parse_cpulist(node_file.read())
+            except (IOError, OSError, ValueError):
+                continue
+            domains.append([s for s in slots if s[1] in cpus])
+        if not domains:
+            domains = [slots]
+        return domains
+
+    def command(self, the_Command, processes, reservation):
+        if processes > 1:
+            if not self.mpi_command:
+                raise RuntimeError("could not find an mpi interface")
+            the_Command = self.mpi_command % (processes, the_Command)
+        # without taskset the launch is not bound
+        if self.taskset and reservation.cpus:
+            cpus = ",".join("%i" % cpu for cpu in reservation.cpus)
+            the_Command = self.taskset_command % (cpus, the_Command)
+        return the_Command
+
+
+class SrunBackend(SchedulerBackend):
+    """cores of the budget in a slurm allocation, launched as job steps
+    of srun with exclusive cores, placed and bound by slurm
+    """
+
+    srun_command = "srun --exclusive --cpu-bind=cores -n %i %s"
+
+    def slots(self):
+        n_cores = int(os.environ.get("SU2_CORES", 0) or 0)
+        return [("", i) for i in range(n_cores)]
+
+    def command(self, the_Command, processes, reservation):
+        if processes > 1:
+            the_Command = self.srun_command % (processes, the_Command)
+        return the_Command
+
+
+class HostfileBackend(SchedulerBackend):
+    """cores of the hosts of the hostfile SU2_HOSTFILE, grouped by host,
+    launched with mpirun on the reserved hosts and bound to cores
+    """
+
+    mpirun_command = "mpirun -n %i --host %s --bind-to core %s"
+
+    def slots(self):
+        hostfile = os.environ.get("SU2_HOSTFILE", "")
+        if not hostfile:
+            raise RuntimeError("SU2_HOSTFILE is not set for the HOSTFILE scheduler")
+        slots = []
+        with open(hostfile) as host_file:
+            for line in host_file:
+                line = line.split("#")[0].strip()
+                if not line:
+                    continue
+                fields = line.split()
+                host, n_slots = fields[0], 1
+                if ":" in host:
+                    host, n_slots = host.split(":")
+                for field in fields[1:]:
+                    if field.startswith("slots="):
+                        n_slots = field.split("=")[1]
+                slots += [(host, i) for i in range(int(n_slots))]
+        return slots
+
+    def domains(self):
+        domains = {}
+        for slot in self.slots():
+            domains.setdefault(slot[0], []).append(slot)
+        return list(domains.values())
+
+    def command(self, the_Command, processes, reservation):
+        hosts = ",".join("%s:%i" % item for item in reservation.hosts.items())
+        return self.mpirun_command % (max(processes, 1), hosts, the_Command)
+
+
+scheduler_backends = {
+    "LOCAL": LocalBackend,
+    "SRUN": SrunBackend,
+    "HOSTFILE": HostfileBackend,
+}
+
+
+def _parse_cpulist(cpulist):
+    """returns the set of cpus of a linux cpulist, e.g. 0-3,8-11"""
+    cpus = set()
+    for part in cpulist.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
@@ -4,5 +4,7 @@ from .ordered_dict import OrderedDict as ordered_dict
 from .ordered_bunch import OrderedBunch as ordered_bunch
 from .plot import write_plot, tecplot, paraview
 from .lhc_unif import lhc_unif
-from .mp_eval import mp_eval
+from .mp_eval import mp_eval, EvalPool
 from .which import which
+from .windowing import windowed_average, windowed_average_weights, windowed_history
+from .kd_tree import KDTree
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+## \file kd_tree.py
+#  \brief incremental kd-tree for nearest neighbour queries
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import math
+
+# ----------------------------------------------------------------------
+#  KD-Tree Class
+# ----------------------------------------------------------------------
+
+
+class KDTree(object):
+    """tree = SU2.util.KDTree()
+
+    Incremental kd-tree of equal length points, each with a value.
+    Points can be added one at a time, and the tree is rebuilt
+    balanced when insertions make it too deep.
+
+    Methods:
+        add(point, value)  - adds a point
+        exact(point)       - returns the value of the first point added
+                             at exactly this location, or None
+        nearest(point)     - returns (distance, value) of the closest point,
+                             ties go to the first point added
+
+    Notes:
+        Distances are euclidean.
+        Queries take logarithmic time on average.
+    """
+
+    def __init__(self, points=None, values=None):
+        self.points = []
+        self.values = []
+        self.exact_points = {}
+        self.ndim = None
+        self._reset()
+        if points is not None:
+            if values is None:
+                values = range(len(points))
+            for point, value in zip(points, values):
+                self.add(point, value)
+
+    def _reset(self):
+        self.root = None
+        self.left = []
+        self.right = []
+        self.depth = 0
+        self.build_depth = 0
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, point, value=None):
+        """adds a point with a value, default the point number"""
+        point = tuple(float(x) for x in point)
+        if self.ndim is None:
+            self.ndim = len(point)
+        if len(point) != self.ndim:
+            raise ValueError(
+                "point of dimension %i added to KDTree of dimension %i"
+                % (len(point), self.ndim)
+            )
+        if value is None:
+            value = len(self.points)
+
+        i_new = len(self.points)
+        self.points.append(point)
+        self.values.append(value)
+        self.left.append(None)
+        self.right.append(None)
+        if not point in self.exact_points:
+            self.exact_points[point] = i_new
+
+        # walk down to a leaf
+        if self.root is None:
+            self.root = i_new
+            self.depth = 1
+            return
+        node = self.root
+        depth = 0
+        while True:
+            axis = depth % self.ndim
+            depth += 1
+            if point[axis] < self.points[node][axis]:
+                if self.left[node] is None:
+                    self.left[node] = i_new
+                    break
+                node = self.left[node]
+            else:
+                if self.right[node] is None:
+                    self.right[node] = i_new
+                    break
+                node = self.right[node]
+        self.depth = max(self.depth, depth + 1)
+
+        # rebalance, unless repeated coordinates keep the tree deep
+        n_points = len(self.points)
+        if self.depth > max(2 * math.log(n_points, 2) + 8, 2 * self.build_depth):
+            self._build()
+            self.build_depth = self.depth
+
+    #: def add()
+
+    def _build(self):
+        """rebuilds the tree balanced around median points"""
+        n_points = len(self.points)
+        self._reset()
+        self.left = [None] * n_points
+        self.right = [None] * n_points
+        if not n_points:
+            return
+
+        # (indices, depth, parent node, child list of the parent),
+        # without recursion, repeated coordinates make deep trees
+        stack = [(list(range(n_points)), 0, None, None)]
+        while stack:
+            indices, depth, parent, children = stack.pop()
+            self.depth = max(self.depth, depth + 1)
+            axis = depth % self.ndim
+            indices.sort(key=lambda i: self.points[i][axis])
+            i_mid = len(indices) // 2
+            # equal coordinates go right, as in add()
+            while i_mid > 0 and (
+                self.points[indices[i_mid - 1]][axis]
+                == self.points[indices[i_mid]][axis]
+            ):
+                i_mid -= 1
+            node = indices[i_mid]
+            if parent is None:
+                self.root = node
+            else:
+                children[parent] = node
+            if i_mid > 0:
+                stack.append((indices[:i_mid], depth + 1, node, self.left))
+            if i_mid + 1 < len(indices):
+                stack.append((indices[i_mid + 1 :], depth + 1, node, self.right))
+
+    #: def _build()
+
+    def exact(self, point):
+        """returns the value of the first point at exactly point, or None"""
+        point = tuple(float(x) for x in point)
+        i_point = self.exact_points.get(point)
+        if i_point is None:
+            return None
+        return self.values[i_point]
+
+    def nearest(self, point):
+        """returns (distance, value) of the closest point,
+        or (None, None) if the tree is empty
+        """
+        point = tuple(float(x) for x in point)
+        if self.root is None:
+            return None, None
+        if len(point) != self.ndim:
+            raise ValueError(
+                "point of dimension %i queried from KDTree of dimension %i"
+                % (len(point), self.ndim)
+            )
+
+        i_exact = self.exact_points.get(point)
+        if i_exact is not None:
+            return 0.0, self.values[i_exact]
+
+        points = self.points
+        left = self.left
+        right = self.right
+        ndim = self.ndim
+
+        # best squared distance and point number
+        best_dist2 = math.inf
+        best = None
+
+        # depth first, without recursion, repeated coordinates make
+        # deep trees, each entry is (node, depth, squared distance to
+        # the splitting plane above it)
+        stack = [(self.root, 0, 0.0)]
+        while stack:
+            node, depth, plane_dist2 = stack.pop()
+            # far side only if the splitting plane is close enough
+            if plane_dist2 > best_dist2:
+                continue
+
+            this_point = points[node]
+            dist2 = 0.0
+            for a, b in zip(point, this_point):
+                dist2 += (a - b) ** 2
+            if dist2 < best_dist2 or (dist2 == best_dist2 and node < best):
+                best_dist2 = dist2
+                best = node
+
+            axis = depth % ndim
+            delta = point[axis] - this_point[axis]
+            if delta < 0.0:
+                near, far = left[node], right[node]
+            else:
+                near, far = right[node], left[node]
+            if far is not None:
+                stack.append((far, depth + 1, delta * delta))
+            if near is not None:
+                stack.append((near, depth + 1, 0.0))
+
+        return math.sqrt(best_dist2), self.values[best]
+
+    #: def nearest()
+
+
+#: class KDTree
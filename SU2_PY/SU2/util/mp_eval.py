@@ -1,128 +1,478 @@
-import os
+#!/usr/bin/env python
+
+## \file mp_eval.py
+#  \brief process pool for concurrent evaluations
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import os, time, signal, atexit, threading, traceback, weakref
 import multiprocessing as mp
+from multiprocessing.connection import wait
+from collections import deque
+from concurrent.futures import Executor, Future, CancelledError, TimeoutError
+from concurrent.futures import as_completed
 import numpy as np
-import sys
 
-if sys.version_info[0] > 2:
-    # In Py3, range corresponds to Py2 xrange
-    xrange = range
+# ----------------------------------------------------------------------
+#  Evaluation Pool Class
+# ----------------------------------------------------------------------
 
 
-class mp_eval(object):
-    def __init__(self, function, num_procs=None):
-
-        self.__name__ = function.__name__
+class EvalPool(Executor):
+    """pool = SU2.util.EvalPool(num_procs=None, max_pending=None, timeout=None)
 
-        tasks = mp.JoinableQueue()
-        results = mp.Queue()
-        function = TaskMaster(function)
+    Futures based process pool. Each task runs in a new process,
+    in its own process group, so that a task and any solver it
+    started can be stopped on timeout or cancellation.
 
-        if num_procs is None:
-            num_procs = mp.cpu_count()
-
-        procs = [QueueMaster(tasks, results, function) for i in xrange(num_procs)]
-
-        self.tasks = tasks
-        self.results = results
-        self.function = function
-        self.procs = procs
+    Inputs:
+        num_procs   - number of concurrent tasks, default os.cpu_count()
+        max_pending - number of submitted but unfinished tasks,
+                      submit() blocks while the pool is full,
+                      default 2*num_procs
+        timeout     - default task timeout in seconds, None for no limit
 
-        return
+    Methods:
+        submit(fn, *args, **kwargs)          - returns a Future for fn(*args, **kwargs)
+        schedule(fn, args, kwargs, timeout)  - same, with a timeout for this task
+        map(fn, *iterables, timeout)         - iterator over the results of fn
+        cancel(future)                       - cancels a waiting or running task
+        shutdown(wait, cancel_futures)       - stops the pool
 
-    def __call__(self, inputs):
+    Notes:
+        Exceptions of a task are raised by Future.result(), with the
+        task traceback as cause. Tasks that time out raise TimeoutError,
+        tasks that are stopped while running raise CancelledError.
+        Use the pool as a context manager to stop all tasks if the
+        calling code fails.
+        Tasks must not submit to the pool from Future callbacks.
+    """
 
-        tasks = self.tasks
-        results = self.results
+    def __init__(self, num_procs=None, max_pending=None, timeout=None, mp_context=None):
 
-        if isinstance(inputs, np.ndarray):
-            n_inputs = inputs.shape[0]
-        elif isinstance(inputs, list):
-            n_inputs = len(inputs)
+        if num_procs is None:
+            num_procs = os.cpu_count() or 1
+        if num_procs < 1:
+            raise ValueError("num_procs must be at least 1")
+        if max_pending is None:
+            max_pending = 2 * num_procs
+        max_pending = max(max_pending, num_procs)
+
+        self.num_procs = num_procs
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._context = mp_context or mp.get_context()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self._running = {}
+        self._shutdown = False
+        self._terminate = False
+        self._woken = False
+        self._wake_r, self._wake_w = self._context.Pipe(duplex=False)
+        self._thread = None
+
+        _pools.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # stop all tasks if the calling code failed
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        """future = pool.submit(fn, *args, **kwargs)
+        schedules fn(*args, **kwargs) with the pool timeout
+        """
+        return self.schedule(fn, args, kwargs, self.timeout)
+
+    def schedule(self, fn, args=(), kwargs=None, timeout=None):
+        """future = pool.schedule(fn, args=(), kwargs=None, timeout=None)
+        schedules fn(*args, **kwargs), stopped after timeout seconds
+        of running, blocks while max_pending tasks are unfinished
+        """
+
+        if kwargs is None:
+            kwargs = {}
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+
+        # bounded in-flight work
+        self._slots.acquire()
+
+        future = Future()
+        future.add_done_callback(lambda f: self._slots.release())
+
+        with self._lock:
+            if self._shutdown:
+                future.cancel()
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._queue.append((future, fn, args, kwargs, timeout))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._dispatch, name="EvalPool", daemon=True
+                )
+                self._thread.start()
+
+        self._wake()
+
+        return future
+
+    #: def schedule()
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """results = pool.map(fn, *iterables, timeout=None)
+        schedules fn for each set of arguments of iterables, returns
+        an iterator over the results in order. The first task to fail
+        stops the other tasks and its exception is raised at once,
+        before the results of earlier tasks. Arguments that were not
+        scheduled yet, as the pool was full, are not run anymore.
+        timeout is the time in seconds to wait for all results.
+        """
+
+        failed = []
+
+        def check(future):
+            if not future.cancelled() and future.exception() is not None:
+                failed.append(future)
+
+        futures = []
+        for args in zip(*iterables):
+            if failed:
+                break
+            future = self.submit(fn, *args)
+            future.add_done_callback(check)
+            futures.append(future)
+
+        return self._ordered(futures, timeout)
+
+    def _ordered(self, futures, timeout):
+        """yields the results of futures in order, as they finish"""
+        try:
+            index = dict((future, i) for i, future in enumerate(futures))
+            results = {}
+            i_next = 0
+            for future in as_completed(futures, timeout):
+                results[index[future]] = future.result()
+                while i_next in results:
+                    yield results.pop(i_next)
+                    i_next += 1
+        finally:
+            for future in futures:
+                self.cancel(future)
+
+    def cancel(self, future):
+        """cancelled = pool.cancel(future)
+        cancels a waiting task, or stops a running one
+        returns False if the task had already finished
+        """
+        if future.cancel():
+            return True
+        with self._lock:
+            if not future in self._running or future.done():
+                return False
+            self._running[future].cancelled = True
+        self._wake()
+        return True
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """pool.shutdown(wait=True, cancel_futures=False)
+        stops accepting tasks, and waits for the remaining ones
+        if cancel_futures, cancels waiting tasks and stops running ones
+        """
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                self._terminate = True
+                while self._queue:
+                    self._queue.popleft()[0].cancel()
+            thread = self._thread
+        self._wake()
+        if wait and thread is not None:
+            thread.join()
+
+    def _wake(self):
+        """wakes the dispatcher thread"""
+        with self._lock:
+            if self._woken:
+                return
+            self._woken = True
+        try:
+            self._wake_w.send_bytes(b"")
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    #  Dispatcher
+    # ------------------------------------------------------------------
+
+    def _dispatch(self):
+        """starts tasks, collects their results and enforces timeouts"""
+
+        try:
+            while True:
+
+                with self._lock:
+                    # start waiting tasks
+                    while self._queue and len(self._running) < self.num_procs:
+                        future, fn, args, kwargs, timeout = self._queue.popleft()
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        self._running[future] = _Task(
+                            self._context, fn, args, kwargs, timeout
+                        )
+                    running = list(self._running.items())
+                    terminate = self._terminate
+                    if self._shutdown and not self._queue and not running:
+                        break
+
+                # stopped tasks
+                now = time.monotonic()
+                for future, task in running:
+                    if terminate or task.cancelled:
+                        self._finish(
+                            future, task.kill(), CancelledError("task cancelled")
+                        )
+                    elif task.deadline is not None and now >= task.deadline:
+                        self._finish(
+                            future,
+                            task.kill(),
+                            TimeoutError("task timed out after %g s" % task.timeout),
+                        )
+                if any(f.done() for f, t in running):
+                    # start waiting tasks, or stop, before waiting again
+                    continue
+
+                # wait for results, timeouts or new tasks
+                deadlines = [t.deadline for f, t in running if t.deadline is not None]
+                wait_time = None
+                if deadlines:
+                    wait_time = max(min(deadlines) - time.monotonic(), 0.0)
+                objects = [self._wake_r]
+                for future, task in running:
+                    objects += [task.reader, task.process.sentinel]
+                ready = wait(objects, wait_time)
+
+                if self._wake_r in ready:
+                    self._wake_r.recv_bytes()
+                    with self._lock:
+                        self._woken = False
+
+                # finished tasks
+                for future, task in running:
+                    if task.reader in ready or task.process.sentinel in ready:
+                        self._finish(future, task.collect())
+
+        except BaseException as exc:
+            # fail all tasks rather than leaving them unfinished
+            with self._lock:
+                self._shutdown = True
+                running = list(self._running.items())
+                queued = list(self._queue)
+                self._queue.clear()
+            for future, task in running:
+                self._finish(future, task.kill(), exc)
+            for item in queued:
+                if item[0].set_running_or_notify_cancel():
+                    item[0].set_exception(exc)
+
+    #: def _dispatch()
+
+    def _finish(self, future, output, exception=None):
+        """sets the result or exception of a finished task"""
+        with self._lock:
+            self._running.pop(future, None)
+        if future.done():
+            return
+        if exception is None and output is None:
+            exception = RuntimeError("task process died without a result")
+        if exception is not None:
+            future.set_exception(exception)
+        elif output[0]:
+            future.set_result(output[1])
         else:
-            raise Exception("unsupported input")
-
-        for i_input, this_input in enumerate(inputs):
-            this_job = {"index": i_input, "input": this_input, "result": None}
-            tasks.put(this_job)
-        # end
-
-        # wait for tasks
-        tasks.join()
-
-        # pull results
-        result_list = [[]] * n_inputs
-        for i in xrange(n_inputs):
-            result = results.get()
-            i_result = result["index"]
-            result_list[i_result] = result["result"]
-
-        return result_list
+            exc, remote_tb = output[1], output[2]
+            exc.__cause__ = _RemoteTraceback(remote_tb)
+            future.set_exception(exc)
+
+
+#: class EvalPool
+
+
+# pools with tasks to stop at exit
+_pools = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_pools():
+    for pool in list(_pools):
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------
+#  Task Process
+# ----------------------------------------------------------------------
+
+
+class _Task(object):
+    """one running task of an EvalPool"""
+
+    def __init__(self, context, fn, args, kwargs, timeout):
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(target=_run_task, args=(writer, fn, args, kwargs))
+        process.start()
+        writer.close()
+        # own process group, also set by the task itself
+        try:
+            os.setpgid(process.pid, process.pid)
+        except (AttributeError, OSError):
+            pass
+
+        self.reader = reader
+        self.process = process
+        self.timeout = timeout
+        self.deadline = None
+        if timeout is not None:
+            self.deadline = time.monotonic() + timeout
+        self.cancelled = False
+
+    def collect(self):
+        """returns the output sent by the task, or None if it died"""
+        try:
+            output = self.reader.recv()
+        except (EOFError, OSError):
+            output = None
+        self.reader.close()
+        self.process.join()
+        return output
+
+    def kill(self, grace=5.0):
+        """stops the task process group"""
+        for sig in (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+            try:
+                os.killpg(self.process.pid, sig)
+            except (AttributeError, OSError):
+                self.process.terminate()
+            self.process.join(grace)
+            if not self.process.is_alive():
+                break
+        self.reader.close()
+        return None
+
+
+def _run_task(conn, fn, args, kwargs):
+    """runs a task in its process, sends (True, result) or
+    (False, exception, traceback) back to the pool
+    """
+    try:
+        os.setpgid(0, 0)
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        output = (True, fn(*args, **kwargs))
+    except BaseException as exc:
+        output = (False, exc, traceback.format_exc())
+
+    try:
+        conn.send(output)
+    except Exception as exc:
+        # result or exception that cannot be pickled
+        conn.send(
+            (
+                False,
+                RuntimeError("task output could not be returned: %r" % exc),
+                output[2] if not output[0] else traceback.format_exc(),
+            )
+        )
+    conn.close()
+
+
+class _RemoteTraceback(Exception):
+    def __init__(self, tb):
+        self.tb = tb
 
-    def __del__(self):
-
-        for proc in self.procs:
-            self.tasks.put(None)
-        self.tasks.join()
-
-        return
-
-
-class QueueMaster(mp.Process):
-    def __init__(self, task_queue, result_queue, task_class=None):
-        mp.Process.__init__(self)
-        self.task_queue = task_queue
-        self.result_queue = result_queue
-        self.task_class = task_class
-        self.daemon = True
-        self.start()
-
-    def run(self):
-        proc_name = self.name
-        parentPID = os.getppid()
+    def __str__(self):
+        return '\n"""\n%s"""' % self.tb
 
-        while True:
 
-            if os.getppid() != parentPID:
-                break  # parent died
+# ----------------------------------------------------------------------
+#  Mapped Evaluation
+# ----------------------------------------------------------------------
 
-            this_job = self.task_queue.get()
 
-            if this_job is None:
-                self.task_queue.task_done()
-                break  # kill signal
+class mp_eval(object):
+    """func = SU2.util.mp_eval(function, num_procs=None, timeout=None)
 
-            this_input = this_job["input"]
-            this_task = self.task_class
+    Evaluates function over a list of inputs with an EvalPool.
 
-            this_data = this_task(*this_input)
-            this_job["result"] = this_data
-            self.result_queue.put(this_job)
+    Inputs:
+        function  - function to evaluate
+        num_procs - number of concurrent evaluations, default os.cpu_count()
+        timeout   - timeout of each evaluation in seconds
 
-            self.task_queue.task_done()
+    Use:
+        results = func(inputs)
+        where inputs is a list of argument tuples, or an array with
+        one row of arguments per evaluation. Results are returned in
+        the order of inputs. If an evaluation fails, the others are
+        stopped and its exception is raised.
+    """
 
-        #: while alive
+    def __init__(self, function, num_procs=None, timeout=None):
 
-        return
+        self.__name__ = function.__name__
+        self.function = function
+        self.pool = EvalPool(num_procs, timeout=timeout)
 
+    def __call__(self, inputs):
 
-class TaskMaster(object):
-    def __init__(self, func):
-        self.func = func
+        if not isinstance(inputs, (np.ndarray, list)):
+            raise Exception("unsupported input")
 
-    def __call__(self, *arg, **kwarg):
-        # makes object callable
-        result = self.func(*arg, **kwarg)
-        return result
+        futures = []
+        try:
+            for this_input in inputs:
+                futures.append(self.pool.submit(self.function, *this_input))
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                self.pool.cancel(future)
+            raise
 
-    def __str__(self):
-        return "%s" % self.func
+    def __del__(self):
+        pool = getattr(self, "pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
 
-    # pickling
-    # def __getstate__(self):
-    # dict = self.__dict__.copy()
-    # data_dict = cloudpickle.dumps(dict)
-    # return data_dict
 
-    # def __setstate__(self,data_dict):
-    # self.__dict__ = pickle.loads(data_dict)
-    # return
+#: class mp_eval
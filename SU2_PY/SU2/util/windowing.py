@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+
+## \file windowing.py
+#  \brief windowed time-averages of unsteady history data
+#  \author T. Lukaczyk, F. Palacios
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import numpy as np
+from .ordered_bunch import OrderedBunch as ordered_bunch
+
+# ----------------------------------------------------------------------
+#  Window Functions
+# ----------------------------------------------------------------------
+#
+#  Same definitions as CWindowingTools in SU2_CFD: sample i of a window
+#  of n samples has tau = i/(n-1), and the windowed average is
+#    sum_i w(tau_i) * value_i / n
+
+# integral of exp(-1/(tau-tau^2)) from 0 to 1
+_bumpNorm = 0.00702986
+
+window_functions = ["SQUARE", "HANN", "HANN_SQUARE", "BUMP"]
+
+
+def window_weights(wnd_fct, n_samples):
+    """weights = window_weights(wnd_fct, n_samples)
+    returns the window function values for a window of n_samples
+
+    Inputs:
+        wnd_fct   - one of SQUARE, HANN, HANN_SQUARE, BUMP
+        n_samples - window length
+    """
+
+    n_samples = int(n_samples)
+    if not wnd_fct in window_functions:
+        raise ValueError(
+            "WINDOW_FUNCTION %s is not one of %s"
+            % (wnd_fct, ", ".join(window_functions))
+        )
+
+    if wnd_fct == "SQUARE":
+        return np.ones(n_samples)
+    if n_samples < 2:
+        return np.zeros(n_samples)
+
+    tau = np.arange(n_samples) / float(n_samples - 1)
+
+    if wnd_fct == "HANN":
+        weights = 1.0 - np.cos(2.0 * np.pi * tau)
+    elif wnd_fct == "HANN_SQUARE":
+        weights = 2.0 / 3.0 * (1.0 - np.cos(2.0 * np.pi * tau)) ** 2
+    elif wnd_fct == "BUMP":
+        weights = np.zeros(n_samples)
+        inner = tau[1:-1]
+        weights[1:-1] = np.exp(-1.0 / (inner - inner * inner)) / _bumpNorm
+
+    return weights
+
+
+#: def window_weights()
+
+
+def windowed_average_weights(wnd_fct, n_samples):
+    """dweights = windowed_average_weights(wnd_fct, n_samples)
+    returns the derivatives of the windowed average with respect to
+    each of the n_samples values, i.e. the weights of the unsteady
+    adjoint sources
+    """
+    return window_weights(wnd_fct, n_samples) / max(int(n_samples), 1)
+
+
+#: def windowed_average_weights()
+
+
+# ----------------------------------------------------------------------
+#  Windowed Averages
+# ----------------------------------------------------------------------
+
+
+def windowed_average(values, wnd_fct="SQUARE", n_avg=0):
+    """average = windowed_average(values, wnd_fct='SQUARE', n_avg=0)
+    windowed average of the last n_avg samples of values
+
+    Inputs:
+        values  - array of samples, averaged along the last axis,
+                  e.g. one history column or a stack of them
+        wnd_fct - one of SQUARE, HANN, HANN_SQUARE, BUMP
+        n_avg   - number of final samples to average,
+                  all samples if zero or larger than the history
+
+    Outputs:
+        average - float, or array for stacked values
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    n_samples = values.shape[-1]
+    if n_avg > 0:
+        n_samples = min(int(n_avg), n_samples)
+
+    dweights = windowed_average_weights(wnd_fct, n_samples)
+    average = np.dot(values[..., values.shape[-1] - n_samples :], dweights)
+
+    if average.ndim == 0:
+        average = float(average)
+    return average
+
+
+#: def windowed_average()
+
+
+def windowed_history(history_data, keys=None, wnd_fct="SQUARE", n_avg=0):
+    """averages = windowed_history(history_data, keys=None, wnd_fct='SQUARE', n_avg=0)
+    windowed averages of several history columns in one pass
+
+    Inputs:
+        history_data - dictionary of equal length history columns,
+                       as returned by SU2.io.read_history()
+        keys         - columns to average, default all
+        wnd_fct      - one of SQUARE, HANN, HANN_SQUARE, BUMP
+        n_avg        - number of final samples to average,
+                       all samples if zero
+
+    Outputs:
+        averages - ordered bunch with a float per key
+    """
+
+    if keys is None:
+        keys = list(history_data.keys())
+
+    averages = ordered_bunch()
+    if not keys:
+        return averages
+
+    stack = np.vstack([np.asarray(history_data[key], dtype=np.float64) for key in keys])
+    values = windowed_average(stack, wnd_fct, n_avg)
+
+    for key, value in zip(keys, values):
+        averages[key] = float(value)
+
+    return averages
+
+
+#: def windowed_history()
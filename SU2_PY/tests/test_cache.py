@@ -0,0 +1,199 @@
+## \file test_cache.py
+#  \brief tests of the evaluation cache, SU2.io.EvalCache
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pytest
+
+import SU2
+from SU2.io import EvalCache, get_evalCache, get_evalKey
+from SU2.eval.functions import _fill_cached_functions, _drop_cached_functions
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("mesh.su2", "w") as mesh_file:
+        mesh_file.write("NDIME= 2\n")
+    config = SU2.io.Config()
+    config.MESH_FILENAME = "mesh.su2"
+    config.NUMBER_PART = 0
+    config.MACH_NUMBER = 0.8
+    config.DV_VALUE_NEW = [0.0, 0.1]
+    return config
+
+
+def test_put_get_alias(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache"))
+    assert cache.get("a") is None
+    cache.put("a", "FUNCTIONS", {"LIFT": 0.3})
+    cache.put("a", "FUNCTIONS", {"DRAG": 0.01})
+    cache.put("a", "GRADIENTS_DISCRETE_ADJOINT", {"DRAG": [1.0, 2.0]})
+    assert cache.get("a") == {
+        "FUNCTIONS": {"LIFT": 0.3, "DRAG": 0.01},
+        "GRADIENTS_DISCRETE_ADJOINT": {"DRAG": [1.0, 2.0]},
+    }
+
+    cache.alias("b", "a")
+    assert cache.get("b") == cache.get("a")
+    cache.put("b", "FUNCTIONS", {"MOMENT_Z": 0.1})
+    assert cache.get("a")["FUNCTIONS"]["MOMENT_Z"] == 0.1
+    assert cache.get(None) is None
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache"), max_bytes=1)
+    cache.put("a", "FUNCTIONS", {"LIFT": 0.3})
+    assert os.listdir(cache.folder) == []
+
+    cache.max_bytes = 1 << 20
+    for key in "abc":
+        cache.put(key, "FUNCTIONS", {"LIFT": 0.3})
+    assert sorted(os.listdir(cache.folder)) == ["a.pkl", "b.pkl", "c.pkl"]
+
+
+def test_put_scans_folder_at_intervals(tmp_path, monkeypatch):
+    cache = EvalCache(str(tmp_path / "cache"))
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        SU2.io.cache.os, "scandir", lambda path: scans.append(path) or scandir(path)
+    )
+    for i in range(cache.scan_interval):
+        cache.put("k%i" % i, "FUNCTIONS", {"LIFT": 0.3})
+    assert len(scans) == 1
+    cache.put("k", "FUNCTIONS", {"LIFT": 0.3})
+    assert len(scans) == 2
+    assert cache._bytes == sum(
+        os.path.getsize(os.path.join(cache.folder, name))
+        for name in os.listdir(cache.folder)
+    )
+
+
+def test_evict_when_counted_size_passes_max(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache"), max_bytes=1 << 20)
+    cache.put("a", "FUNCTIONS", {"LIFT": 0.3})
+    size = os.path.getsize(os.path.join(cache.folder, "a.pkl"))
+    cache.max_bytes = 3 * size + size // 2
+    os.utime(os.path.join(cache.folder, "a.pkl"), (1, 1))
+    cache.put("b", "FUNCTIONS", {"LIFT": 0.3})
+    cache.put("c", "FUNCTIONS", {"LIFT": 0.3})
+    assert sorted(os.listdir(cache.folder)) == ["a.pkl", "b.pkl", "c.pkl"]
+    cache.put("d", "FUNCTIONS", {"LIFT": 0.3})
+    assert sorted(os.listdir(cache.folder)) == ["b.pkl", "c.pkl", "d.pkl"]
+
+
+def test_evict_removes_aliases(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache"))
+    cache.put("a", "FUNCTIONS", {"LIFT": 0.3, "DRAG": [0.0] * 100})
+    cache.put("b", "FUNCTIONS", {"LIFT": 0.3, "DRAG": [0.0] * 100})
+    cache.alias("x", "a")
+    cache.alias("y", "b")
+    os.utime(os.path.join(cache.folder, "a.pkl"), (1, 1))
+
+    # reading through an alias marks both as recently used
+    os.utime(os.path.join(cache.folder, "y.pkl"), (1, 1))
+    os.utime(os.path.join(cache.folder, "b.pkl"), (1, 1))
+    assert cache.get("y")["FUNCTIONS"]["LIFT"] == 0.3
+
+    cache.max_bytes = cache._bytes - 1
+    cache.evict()
+    assert sorted(os.listdir(cache.folder)) == ["b.pkl", "y.pkl"]
+    assert cache.get("x") is None
+    assert cache._bytes == sum(
+        os.path.getsize(os.path.join(cache.folder, name))
+        for name in os.listdir(cache.folder)
+    )
+
+
+def test_get_evalCache(tmp_path, monkeypatch):
+    monkeypatch.delenv("SU2_EVAL_CACHE", raising=False)
+    assert get_evalCache() is None
+    monkeypatch.setenv("SU2_EVAL_CACHE", str(tmp_path / "cache"))
+    cache = get_evalCache()
+    assert isinstance(cache, EvalCache)
+    assert get_evalCache() is cache
+
+
+def test_evalKey(config):
+    key = get_evalKey(config)
+    assert key is not None
+
+    # parameters that do not change the values
+    konfig = SU2.io.Config(config)
+    konfig.NUMBER_PART = 8
+    konfig.CONSOLE = "QUIET"
+    assert get_evalKey(konfig) == key
+
+    # design vector and flow conditions
+    konfig.DV_VALUE_NEW = [0.0, 0.2]
+    assert get_evalKey(konfig) != key
+    konfig = SU2.io.Config(config)
+    konfig.MACH_NUMBER = 0.7
+    assert get_evalKey(konfig) != key
+
+
+def test_evalKey_mesh_content(config):
+    key = get_evalKey(config)
+
+    # same size and modification time, different content
+    info = os.stat("mesh.su2")
+    with open("mesh.su2", "w") as mesh_file:
+        mesh_file.write("NDIME= 3\n")
+    os.utime("mesh.su2", ns=(info.st_atime_ns, info.st_mtime_ns))
+    assert get_evalKey(config) != key
+
+    os.remove("mesh.su2")
+    assert get_evalKey(config) is None
+
+
+def test_cached_functions_dropped_without_direct_solution():
+    state = SU2.io.State()
+    state.FUNCTIONS.VOLUME = 1.5
+    _fill_cached_functions(state, {"LIFT": 0.3, "DRAG": 0.01, "VOLUME": 2.0})
+    assert state.FUNCTIONS == {"VOLUME": 1.5, "LIFT": 0.3, "DRAG": 0.01}
+    assert list(state.CACHED.keys()) == ["LIFT", "DRAG"]
+
+    # with a direct solution the values are kept
+    state.FILES.DIRECT = "solution_flow.dat"
+    _drop_cached_functions(state)
+    assert "LIFT" in state.FUNCTIONS
+
+    # without, only the cached values are dropped
+    del state.FILES.DIRECT
+    _drop_cached_functions(state)
+    assert state.FUNCTIONS == {"VOLUME": 1.5}
+    assert not state.CACHED
+
+
+def test_function_from_cache(config, tmp_path, monkeypatch):
+    monkeypatch.setenv("SU2_EVAL_CACHE", str(tmp_path / "cache"))
+    config.OPT_OBJECTIVE = {
+        "DRAG": {"SCALE": 1.0, "OBJTYPE": "DEFAULT", "MARKER": "airfoil"}
+    }
+    get_evalCache().put(get_evalKey(config), "FUNCTIONS", {"DRAG": 0.01, "LIFT": 0.3})
+
+    state = SU2.io.State()
+    assert SU2.eval.func("DRAG", config, state) == 0.01
+    assert state.FUNCTIONS.LIFT == 0.3
+    assert list(state.CACHED.keys()) == ["DRAG", "LIFT"]
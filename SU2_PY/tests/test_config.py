@@ -0,0 +1,236 @@
+## \file test_config.py
+#  \brief tests of SU2.io.Config and the config file reader
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import copy, os, pickle, stat, threading
+from SU2.io import Config
+from SU2.io.config import read_config
+
+
+def write_file(filename, text):
+    with open(filename, "w") as config_file:
+        config_file.write(text)
+
+
+def test_read_config_rewritten_same_size(tmp_path):
+    filename = str(tmp_path / "config_DEF.cfg")
+    write_file(filename, "MESH_FILENAME= mesh.su2\nDV_VALUE= 0.001\n")
+    assert read_config(filename)["DV_VALUE"] == [0.001]
+
+    # same size and modification time, different content
+    stat = os.stat(filename)
+    write_file(filename, "MESH_FILENAME= mesh.su2\nDV_VALUE= 0.002\n")
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(filename).st_size == stat.st_size
+    assert read_config(filename)["DV_VALUE"] == [0.002]
+
+
+def test_read_config_returns_copies(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, "MESH_FILENAME= mesh.su2\nDV_VALUE= 0.1, 0.2\n")
+    first = read_config(filename)
+    first["DV_VALUE"].append(0.3)
+    assert read_config(filename)["DV_VALUE"] == [0.1, 0.2]
+
+
+def test_deepcopy_is_independent():
+    config = Config()
+    config.A = [1, 2]
+    config.B = {"X": [0.1]}
+    config.MESH_FILENAME = "mesh.su2"
+
+    value = config["A"]
+    konfig = copy.deepcopy(config)
+    value.append(3)
+    config.B["X"].append(0.2)
+    assert konfig["A"] == [1, 2]
+    assert konfig.B == {"X": [0.1]}
+
+    konfig.A.append(4)
+    assert config.A == [1, 2, 3]
+    assert konfig.MESH_FILENAME == "mesh.su2"
+    assert konfig._filename == config._filename
+
+
+def test_deepcopy_keeps_shared_values_shared():
+    config = Config()
+    config.A = [1, 2]
+    config.B = config.A
+    konfig = copy.deepcopy(config)
+    assert konfig.A is konfig.B
+    assert konfig.A is not config.A
+
+
+DV_CONFIG = """\
+MESH_FILENAME= mesh.su2
+DV_KIND= HICKS_HENNE, HICKS_HENNE
+DV_MARKER= ( airfoil )
+DV_PARAM= ( 0, 0.05 ); ( 0, 0.10 )
+DV_VALUE= 0.001, 0.001
+DEFINITION_DV= ( 30, 1.0 | airfoil | 0, 0.05 ); ( 30, 1.0 | airfoil | 0, 0.10 )
+MARKER_MONITORING= ( airfoil )
+"""
+
+
+def raw(config, key):
+    return dict.__getitem__(config, key)
+
+
+def test_deepcopy_shares_unchanged_values(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, DV_CONFIG)
+    config = Config(filename)
+    konfig = copy.deepcopy(config)
+
+    # nothing is copied by the copy, a dump or a comparison
+    for key in ["DV_PARAM", "DEFINITION_DV", "MARKER_MONITORING"]:
+        assert raw(konfig, key) is raw(config, key)
+    assert konfig == config
+    assert not konfig.diff(config)
+    konfig.dump(str(tmp_path / "config_CFD.cfg"))
+    assert raw(konfig, "DEFINITION_DV") is raw(config, "DEFINITION_DV")
+
+    # only the keys a copy hands out are copied
+    konfig.unpack_dvs([0.1, 0.2])
+    assert raw(konfig, "DV_PARAM") is not raw(config, "DV_PARAM")
+    assert raw(konfig, "DEFINITION_DV") is not raw(config, "DEFINITION_DV")
+    assert raw(konfig, "MARKER_MONITORING") is raw(config, "MARKER_MONITORING")
+    assert konfig.DV_PARAM["PARAM"] == [[0.0, 0.05], [0.0, 0.1]]
+
+    konfig.DV_PARAM["PARAM"][0][1] = 0.5
+    konfig.MARKER_MONITORING.append("flap")
+    assert config.DV_PARAM["PARAM"] == [[0.0, 0.05], [0.0, 0.1]]
+    assert config.MARKER_MONITORING == ["airfoil"]
+    assert konfig.DV_VALUE_NEW == [0.1, 0.2]
+    assert config.DV_VALUE_NEW != konfig.DV_VALUE_NEW
+
+
+def test_deepcopy_last_holder_keeps_value():
+    config = Config()
+    config.update({"A": [1, 2]})
+    config._exposed.clear()
+    value = raw(config, "A")
+
+    konfig = copy.deepcopy(config)
+    kkonfig = copy.deepcopy(konfig)
+    assert raw(kkonfig, "A") is value
+
+    # a replaced value is not copied, the last holder takes it over
+    konfig.A = [3]
+    kkonfig.A.append(4)
+    assert kkonfig.A == [1, 2, 4]
+    assert raw(kkonfig, "A") is not value
+    assert config.A is value
+    assert config.A == [1, 2]
+
+
+def test_deepcopy_of_copies_is_independent():
+    config = Config()
+    config.update({"A": [1, 2], "B": {"X": [0.1]}})
+    config._exposed.clear()
+    copies = [copy.deepcopy(config) for i in range(3)]
+    copies.append(copy.deepcopy(copies[0]))
+    for i, konfig in enumerate(copies):
+        konfig.A.append(i)
+        konfig.B["X"].append(i)
+    config.A.append(-1)
+    for i, konfig in enumerate(copies):
+        assert konfig.A == [1, 2, i]
+        assert konfig.B == {"X": [0.1, i]}
+    assert config.A == [1, 2, -1]
+    assert config.B == {"X": [0.1]}
+
+
+def test_shared_config_pickle_and_copy(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, DV_CONFIG)
+    config = Config(filename)
+    konfig = copy.deepcopy(config)
+
+    loaded = pickle.loads(pickle.dumps(konfig))
+    assert loaded == konfig
+    assert loaded._filename == filename
+    assert raw(konfig, "DV_PARAM") is raw(config, "DV_PARAM")
+    loaded.DV_PARAM["PARAM"].append([1.0, 0.5])
+    assert len(config.DV_PARAM["PARAM"]) == 2
+
+    shallow = copy.copy(konfig)
+    assert shallow == konfig
+    shallow.DV_PARAM["PARAM"].append([1.0, 0.5])
+    assert len(konfig.DV_PARAM["PARAM"]) == 2
+
+    # handed out values are shallow copied as they are
+    value = konfig.MARKER_MONITORING
+    assert copy.copy(konfig).MARKER_MONITORING is value
+
+
+def test_write_config_template_rewritten_same_size(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, "% first\nMESH_FILENAME= mesh.su2\nAOA= 1.0\n")
+    config = Config(filename)
+    config.write(filename)
+
+    # same size and modification time, different comment
+    info = os.stat(filename)
+    write_file(filename, "% other\nMESH_FILENAME= mesh.su2\nAOA= 1.0\n")
+    os.utime(filename, ns=(info.st_atime_ns, info.st_mtime_ns))
+    config.AOA = 2.0
+    config.write(filename)
+    with open(filename) as config_file:
+        assert config_file.read() == "% other\nMESH_FILENAME= mesh.su2\nAOA= 2.0\n"
+
+
+def test_write_config_concurrent_writers(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, "MESH_FILENAME= mesh.su2\nAOA= 0.0\n")
+    errors = []
+
+    def writer(aoa):
+        config = Config()
+        config.MESH_FILENAME = "mesh.su2"
+        config.AOA = aoa
+        try:
+            for i in range(50):
+                config.write(filename)
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=writer, args=(x,)) for x in [1.0, 2.0, 3.0]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert read_config(filename)["AOA"] in [1.0, 2.0, 3.0]
+    assert os.listdir(str(tmp_path)) == ["config.cfg"]
+
+
+def test_dump_config_permissions(tmp_path):
+    filename = str(tmp_path / "config.cfg")
+    write_file(filename, "")
+    expected = stat.S_IMODE(os.stat(filename).st_mode)
+    config = Config()
+    config.MESH_FILENAME = "mesh.su2"
+    config.dump(filename)
+    assert stat.S_IMODE(os.stat(filename).st_mode) == expected
@@ -0,0 +1,272 @@
+## \file test_data.py
+#  \brief tests of SU2.io.save_data, SU2.io.load_data and SU2.io.filelock
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import errno, os, pickle, threading, time
+import numpy as np
+import pytest
+
+import SU2
+from SU2.io import filelock, save_data, load_data
+from SU2.io import data as su2data
+from SU2.io.filelock import FileLockException
+from SU2.opt.project import Project
+
+
+def test_save_waits_for_the_lock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_data("data.pkl", {"A": 1})
+
+    saved = threading.Event()
+
+    def save():
+        save_data("data.pkl", {"B": 2})
+        saved.set()
+
+    with filelock("data.pkl"):
+        thread = threading.Thread(target=save)
+        thread.start()
+        assert not saved.wait(0.5)
+        assert load_data("data.pkl") == {"A": 1}
+    thread.join(10.0)
+    assert saved.is_set()
+    assert load_data("data.pkl") == {"B": 2}
+    assert not os.path.exists("data.pkl.lock")
+
+
+def test_lock_waits_past_timeout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    acquired = threading.Event()
+
+    def lock():
+        with filelock("data.pkl", timeout=0.1):
+            acquired.set()
+
+    with filelock("data.pkl"):
+        thread = threading.Thread(target=lock)
+        thread.start()
+        assert not acquired.wait(0.5)
+    thread.join(10.0)
+    assert acquired.is_set()
+
+
+@pytest.mark.parametrize("code", [errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOLCK])
+def test_lock_without_flock_support(tmp_path, monkeypatch, code):
+    monkeypatch.chdir(tmp_path)
+
+    def flock(fd, operation):
+        raise OSError(code, os.strerror(code))
+
+    monkeypatch.setattr("fcntl.flock", flock)
+
+    with filelock("data.pkl"):
+        assert os.path.exists("data.pkl.lock")
+        with pytest.raises(FileLockException):
+            filelock("data.pkl", timeout=0.2).acquire()
+    assert not os.path.exists("data.pkl.lock")
+
+    save_data("data.pkl", {"A": 1})
+    save_data("data.pkl", {"B": 2}, append=True)
+    assert load_data("data.pkl") == {"A": 1, "B": 2}
+    assert not os.path.exists("data.pkl.lock")
+
+
+def test_lock_raises_other_flock_errors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def flock(fd, operation):
+        raise OSError(errno.EBADF, os.strerror(errno.EBADF))
+
+    monkeypatch.setattr("fcntl.flock", flock)
+
+    with pytest.raises(OSError):
+        filelock("data.pkl").acquire()
+    assert not os.path.exists("data.pkl.lock")
+
+
+def test_concurrent_appends_keep_every_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_data("data.pkl", {"START": 0})
+
+    def append(i):
+        save_data("data.pkl", {"KEY_%i" % i: i}, append=True)
+
+    threads = [threading.Thread(target=append, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data = load_data("data.pkl")
+    assert sorted(data.keys()) == sorted(["START"] + ["KEY_%i" % i for i in range(16)])
+
+
+# ----------------------------------------------------------------------
+#  Indexed pickle format
+# ----------------------------------------------------------------------
+
+
+class Shell(object):
+    """plain object, split into one entry per attribute"""
+
+    def __init__(self, **attributes):
+        vars(self).update(attributes)
+
+
+def not_loaded():
+    raise AssertionError("entry was loaded")
+
+
+class Unloadable(object):
+    """fails if it is unpickled"""
+
+    def __reduce__(self):
+        return (not_loaded, ())
+
+
+def sample_design():
+    state = SU2.io.State()
+    state.FUNCTIONS.DRAG = 0.0123
+    state.FUNCTIONS.LIFT = 0.456
+    state.GRADIENTS.DRAG = [1.0, -2.0, 3.5]
+    state.HISTORY.DIRECT = SU2.util.ordered_bunch(
+        Inner_Iter=np.arange(100), CD=np.linspace(0.1, 0.0123, 100)
+    )
+    state.FILES.DIRECT = "restart_flow.dat"
+    config = SU2.io.Config()
+    for i in range(100):
+        config["OPTION_%i" % i] = i
+    return Shell(config=config, state=state, files=state.FILES, folder="DSN_001")
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / "design.pkl")
+    design = sample_design()
+    save_data(filename, design)
+
+    with open(filename, "rb") as pkl_file:
+        assert pkl_file.read(8) == su2data._dataMagic
+
+    loaded = load_data(filename)
+    assert isinstance(loaded, Shell)
+    assert isinstance(loaded.state, SU2.io.state.State)
+    assert loaded.state.FUNCTIONS == design.state.FUNCTIONS
+    assert loaded.state.GRADIENTS.DRAG == [1.0, -2.0, 3.5]
+    history = loaded.state.HISTORY.DIRECT
+    assert list(history.keys()) == ["Inner_Iter", "CD"]
+    assert np.array_equal(history.Inner_Iter, np.arange(100))
+    assert history.CD.dtype == np.float64
+    assert loaded.config == design.config
+    assert loaded.folder == "DSN_001"
+    # values shared by several paths are shared again
+    assert loaded.files is loaded.state.FILES
+
+
+def test_round_trip_dict(tmp_path):
+    filename = str(tmp_path / "data.pkl")
+    data = {
+        "A": [1, 2, {"x": None}],
+        "B": {"C": {"D": {"E": (1, "two")}}},
+        "F": np.ones((3, 2), dtype=np.int32),
+        "G": np.array([1, "a"], dtype=object),
+        3: "not a string key",
+    }
+    save_data(filename, data)
+    loaded = load_data(filename)
+    assert sorted(loaded.keys(), key=str) == sorted(data.keys(), key=str)
+    assert loaded["A"] == data["A"]
+    assert loaded["B"] == data["B"]
+    assert np.array_equal(loaded["F"], data["F"])
+    assert loaded["F"].dtype == np.int32
+    assert list(loaded["G"]) == [1, "a"]
+    assert loaded[3] == "not a string key"
+
+
+def test_partial_load_reads_only_its_entries(tmp_path):
+    filename = str(tmp_path / "design.pkl")
+    design = sample_design()
+    design.config = Unloadable()
+    save_data(filename, design)
+
+    values = load_data(filename, ["state", "state.FUNCTIONS.DRAG", "folder"])
+    assert values["state"].FUNCTIONS.LIFT == 0.456
+    assert values["state.FUNCTIONS.DRAG"] == 0.0123
+    assert values["folder"] == "DSN_001"
+    with pytest.raises(KeyError):
+        load_data(filename, ["state.MISSING"])
+    with pytest.raises(AssertionError, match="entry was loaded"):
+        load_data(filename)
+
+
+def test_stream_format_is_read(tmp_path):
+    filename = str(tmp_path / "old.pkl")
+    with open(filename, "wb") as pkl_file:
+        pickle.dump(["python_data"], pkl_file)
+        pickle.dump({"A": 1, "B": {"C": 2}}, pkl_file)
+    assert load_data(filename) == {"A": 1, "B": {"C": 2}}
+    assert load_data(filename, ["B.C"]) == {"B.C": 2}
+
+
+def test_newer_version_is_refused(tmp_path):
+    filename = str(tmp_path / "new.pkl")
+    save_data(filename, {"A": 1})
+    with open(filename, "r+b") as pkl_file:
+        header = su2data._dataHeader.unpack(pkl_file.read(su2data._dataHeader.size))
+        pkl_file.seek(0)
+        pkl_file.write(su2data._dataHeader.pack(header[0], header[1] + 1, header[2]))
+    with pytest.raises(Exception, match="newer"):
+        load_data(filename)
+
+
+def test_deep_compile_loads_only_states(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    designs = []
+    for i in range(3):
+        design = sample_design()
+        design.folder = "DESIGNS/DSN_%03i" % (i + 1)
+        design.filename = "design.pkl"
+        os.makedirs(design.folder)
+        # run outside of the project
+        saved = sample_design()
+        saved.state.FUNCTIONS.DRAG = float(i)
+        saved.config = Unloadable()
+        save_data(os.path.join(design.folder, design.filename), saved)
+        designs.append(design)
+
+    project = Project.__new__(Project)
+    project.config = SU2.io.Config()
+    project.state = SU2.io.State()
+    project.designs = designs
+    project.folder = "./"
+    project._results = None
+    project.filename = "project.pkl"
+    project.results_filename = "results.pkl"
+    project.store_filename = "designs.db"
+    project._n_stored = 0
+
+    project.deep_compile()
+
+    assert project.results.FUNCTIONS.DRAG.tolist() == [0.0, 1.0, 2.0]
+    assert load_data("results.pkl").FUNCTIONS.DRAG == [0.0, 1.0, 2.0]
+    assert designs[2].funcs is designs[2].state.FUNCTIONS
+    assert SU2.io.DesignStore("designs.db").load(1).state.FUNCTIONS.DRAG == 1.0
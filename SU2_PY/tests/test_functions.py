@@ -0,0 +1,148 @@
+## \file test_functions.py
+#  \brief tests of the concurrent function evaluations of SU2.eval
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, copy
+import multiprocessing as mp
+import pytest
+
+import SU2
+from SU2.eval import functions
+
+pytestmark = pytest.mark.skipif(
+    not "fork" in mp.get_all_start_methods(), reason="points patched by fork"
+)
+
+MULTIPOINT_CONFIG = """\
+MESH_FILENAME= mesh.su2
+SOLUTION_FILENAME= solution_flow.dat
+RESTART_SOL= YES
+NUMBER_PART= 1
+CONSOLE= QUIET
+MARKER_MONITORING= ( airfoil )
+OPT_OBJECTIVE= MULTIPOINT_DRAG * 1.0
+MULTIPOINT_WEIGHT= (0.5, 0.3, 0.2)
+MULTIPOINT_MACH_NUMBER= (0.7, 0.75, 0.8)
+MULTIPOINT_AOA= (1.0, 2.0, 3.0)
+MARKER_OUTLET= ( outlet, 101325.0 )
+"""
+
+
+def fake_update_mesh(config, state=None):
+    pass
+
+
+def fake_aerodynamics(config, state=None):
+    """writes the solution of a point, with the solution it restarted
+    from and the history it started with, updates config and state
+    as aerodynamics() does"""
+    history = state.HISTORY.get("DIRECT")
+    restart = state.FILES.get("DIRECT")
+    if restart is None:
+        config["RESTART_SOL"] = "NO"
+    else:
+        with open(restart) as solution_file:
+            restart = solution_file.read().strip()
+    name = config.SOLUTION_FILENAME
+    with open(name, "w") as solution_file:
+        solution_file.write(
+            "mach %s restart %s from %s history %s\n"
+            % (config.MACH_NUMBER, config.RESTART_SOL, restart, history)
+        )
+    state.FILES.DIRECT = name
+    state.HISTORY.DIRECT = "of " + name
+    for name in ("LIFT", "SIDEFORCE", "MOMENT_X", "MOMENT_Y", "MOMENT_Z"):
+        state.FUNCTIONS[name] = 0.1 * float(config.AOA)
+    state.FUNCTIONS.DRAG = 0.1 * float(config.MACH_NUMBER)
+    state.FUNCTIONS.CUSTOM_OBJFUNC = 0.0
+    return copy.deepcopy(state.FUNCTIONS)
+
+
+def evaluate(folder, monkeypatch):
+    """a multipoint evaluation of a design in folder"""
+    os.mkdir(folder)
+    monkeypatch.chdir(folder)
+    with open("config.cfg", "w") as config_file:
+        config_file.write(MULTIPOINT_CONFIG)
+    with open("mesh.su2", "w") as mesh_file:
+        mesh_file.write("NDIME= 2\n")
+    config = SU2.io.Config("config.cfg")
+    config.NZONES = 1
+    state = SU2.io.State()
+    state.FILES.MESH = "mesh.su2"
+
+    funcs = functions.multipoint(config, state)
+    solutions = []
+    for name in state.FILES.MULTIPOINT_DIRECT:
+        with open(name) as solution_file:
+            solutions.append(solution_file.read())
+    return funcs, state, solutions
+
+
+@pytest.fixture
+def patched(monkeypatch):
+    monkeypatch.setattr(functions, "aerodynamics", fake_aerodynamics)
+    monkeypatch.setattr(functions, "update_mesh", fake_update_mesh)
+    monkeypatch.delenv("SU2_MULTIPOINT_PART", raising=False)
+
+
+def test_multipoint_concurrent_matches_serial(patched, tmp_path, monkeypatch):
+    monkeypatch.delenv("SU2_CORES", raising=False)
+    serial = evaluate(tmp_path / "serial", monkeypatch)
+
+    monkeypatch.setenv("SU2_CORES", "4")
+    assert functions._multipoint_workers([1, 1, 1]) == 2
+    concurrent = evaluate(tmp_path / "concurrent", monkeypatch)
+
+    funcs, state, solutions = serial
+    assert concurrent[0] == funcs
+    assert concurrent[1].FILES == state.FILES
+    assert concurrent[1].FUNCTIONS == state.FUNCTIONS
+    assert concurrent[2] == solutions
+
+    assert funcs.MULTIPOINT_DRAG == pytest.approx(0.1 * (0.35 + 0.225 + 0.16))
+    assert state.FUNCTIONS.MULTIPOINT_DRAG == funcs.MULTIPOINT_DRAG
+    assert state.FILES.MULTIPOINT_DIRECT == [
+        "solution_flow_point0.dat",
+        "solution_flow_point1.dat",
+        "solution_flow_point2.dat",
+    ]
+
+    # the other points start from the config and state left by the first
+    assert solutions == [
+        "mach 0.7 restart NO from None history None\n",
+        "mach  0.75 restart NO from None history of solution_flow_point0.dat\n",
+        "mach  0.8 restart NO from None history of solution_flow_point0.dat\n",
+    ]
+
+
+def test_multipoint_failed_point(patched, tmp_path, monkeypatch):
+    def failing_aerodynamics(config, state=None):
+        if float(config.MACH_NUMBER) == 0.8:
+            raise RuntimeError("point 2 failed")
+        return fake_aerodynamics(config, state)
+
+    monkeypatch.setattr(functions, "aerodynamics", failing_aerodynamics)
+    monkeypatch.setenv("SU2_CORES", "4")
+    with pytest.raises(RuntimeError, match="point 2 failed"):
+        evaluate(tmp_path / "failed", monkeypatch)
@@ -0,0 +1,223 @@
+## \file test_gradients.py
+#  \brief tests of the concurrent gradient evaluations of SU2.eval
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, time, glob, copy
+import multiprocessing as mp
+import pytest
+
+import SU2
+from SU2.eval import gradients
+
+pytestmark = pytest.mark.skipif(
+    not "fork" in mp.get_all_start_methods(), reason="tasks patched by fork"
+)
+
+DV_CONFIG = """\
+MESH_FILENAME= mesh.su2
+DV_KIND= HICKS_HENNE, HICKS_HENNE, HICKS_HENNE, HICKS_HENNE
+DV_MARKER= ( airfoil )
+DV_PARAM= ( 0, 0.1 ); ( 0, 0.2 ); ( 0, 0.3 ); ( 0, 0.4 )
+DEFINITION_DV= ( 30, 1.0 | airfoil | 0, 0.1 ); ( 30, 1.0 | airfoil | 0, 0.2 ); \
+( 30, 1.0 | airfoil | 0, 0.3 ); ( 30, 1.0 | airfoil | 0, 0.4 )
+NUMBER_PART= 1
+CONSOLE= QUIET
+TABULAR_FORMAT= CSV
+FIN_DIFF_STEP= 0.01
+"""
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("mesh.su2", "w") as mesh_file:
+        mesh_file.write("NDIME= 2\n")
+    with open("config.cfg", "w") as config_file:
+        config_file.write(DV_CONFIG)
+    config = SU2.io.Config("config.cfg")
+    config.DV_VALUE_NEW = [0.0] * 4
+    config.NZONES = 1
+    return config
+
+
+def new_state():
+    state = SU2.io.State()
+    state.FILES.MESH = "mesh.su2"
+    return state
+
+
+def step_functions(config, state):
+    # the deformation writes the step mesh, removed after the step
+    mesh_name = config.get("MESH_OUT_FILENAME", "mesh_out.su2")
+    with open(mesh_name, "w") as mesh_file:
+        mesh_file.write("NDIME= 2\n")
+    state.FILES.MESH = mesh_name
+    dvs = config.DV_VALUE_NEW
+    funcs = SU2.util.ordered_bunch()
+    funcs.DRAG = sum((i + 1) * dv for i, dv in enumerate(dvs))
+    funcs.LIFT = sum(dv * dv for dv in dvs)
+    return funcs
+
+
+def fake_function(func_name, config, state=None):
+    return step_functions(config, state)
+
+
+def failing_function(func_name, config, state=None):
+    dvs = config.DV_VALUE_NEW
+    if dvs[1]:
+        raise ValueError("step 1 failed")
+    if any(dvs):
+        with open(os.environ["STEP_MARKS"] + "/%i.pid" % os.getpid(), "w") as f:
+            f.write("running")
+        time.sleep(60)
+    return step_functions(config, state)
+
+
+def test_findiff_concurrent_matches_serial(config, monkeypatch):
+    monkeypatch.setattr(gradients, "function", fake_function)
+    monkeypatch.delenv("SU2_CORES", raising=False)
+    serial = SU2.eval.findiff(config, new_state())
+
+    monkeypatch.setenv("SU2_CORES", "3")
+    assert SU2.run.concurrent_runs(config, 4) == 3
+    concurrent = SU2.eval.findiff(config, new_state())
+    assert list(concurrent.keys()) == list(serial.keys()) == ["DRAG", "LIFT"]
+    for key in serial.keys():
+        assert concurrent[key] == pytest.approx(serial[key])
+    assert concurrent["DRAG"] == pytest.approx([1.0, 2.0, 3.0, 4.0])
+    assert not glob.glob("FINDIFF/DV_*")
+
+
+def test_findiff_failed_step_stops_the_others(config, tmp_path, monkeypatch):
+    marks = tmp_path / "marks"
+    marks.mkdir()
+    monkeypatch.setenv("STEP_MARKS", str(marks))
+    monkeypatch.setattr(gradients, "function", failing_function)
+    monkeypatch.setenv("SU2_CORES", "2")
+
+    start = time.monotonic()
+    with pytest.raises(ValueError, match="step 1 failed"):
+        SU2.eval.findiff(config, new_state())
+    assert time.monotonic() - start < 30.0
+
+    # the sleeping steps were stopped
+    pids = [int(os.path.basename(name)[:-4]) for name in glob.glob(str(marks / "*"))]
+    assert pids
+    for pid in pids:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+
+# ----------------------------------------------------------------------
+#  Batched adjoint gradients
+# ----------------------------------------------------------------------
+
+
+def fake_direct(func_name, config, state=None, cache=True):
+    state.FILES.DIRECT = "solution_flow.dat"
+    state.HISTORY.DIRECT = "history_direct"
+    for name in ("DRAG", "LIFT", "MOMENT_Z"):
+        state.FUNCTIONS[name] = len(name) * 0.1
+    return state.FUNCTIONS[func_name]
+
+
+def fake_adjoint(func_name, config, state=None):
+    """runs the direct solution if state has none, as adjoint() does"""
+    if not "DIRECT" in state.FILES:
+        gradients.function(func_name, config, state)
+    if os.environ.get("STEP_MARKS"):
+        failing_adjoint(func_name)
+    adj_name = "ADJOINT_" + func_name
+    state.FILES[adj_name] = "solution_adj_%s.dat" % func_name.lower()
+    state.HISTORY[adj_name] = "history_" + func_name.lower()
+    config.OBJECTIVE_FUNCTION = func_name
+    grads = SU2.util.ordered_bunch()
+    grads[func_name] = [
+        len(func_name) + i * state.FUNCTIONS[func_name] for i in range(4)
+    ]
+    return grads
+
+
+def failing_adjoint(func_name):
+    if func_name == "LIFT":
+        time.sleep(0.2)
+        raise ValueError("LIFT adjoint failed")
+    with open(os.environ["STEP_MARKS"] + "/%i.pid" % os.getpid(), "w") as f:
+        f.write("running")
+    time.sleep(60)
+
+
+@pytest.fixture
+def batch(config, monkeypatch):
+    monkeypatch.setattr(gradients, "function", fake_direct)
+    monkeypatch.setattr(gradients, "adjoint", fake_adjoint)
+    return ["DRAG", "LIFT", "MOMENT_Z"]
+
+
+def test_gradients_batch_matches_serial(config, batch, monkeypatch):
+    monkeypatch.delenv("SU2_CORES", raising=False)
+    serial_config = copy.deepcopy(config)
+    serial_state = new_state()
+    serial = SU2.util.ordered_bunch()
+    for func_name in batch:
+        serial[func_name] = SU2.eval.grad(
+            func_name, "DISCRETE_ADJOINT", serial_config, serial_state
+        )
+
+    monkeypatch.setenv("SU2_CORES", "3")
+    assert SU2.run.split_partitions(config, len(batch)) == (3, 1)
+    batch_state = new_state()
+    batched = SU2.eval.grads(batch, "DISCRETE_ADJOINT", config, batch_state)
+
+    assert batched == serial
+    assert list(batched.keys()) == batch
+
+    # merged in order, as if run one after another
+    assert batch_state.GRADIENTS == serial_state.GRADIENTS
+    assert list(batch_state.GRADIENTS.keys()) == batch
+    assert batch_state.FUNCTIONS == serial_state.FUNCTIONS
+    assert batch_state.FILES == serial_state.FILES
+    assert list(batch_state.FILES.keys()) == list(serial_state.FILES.keys())
+    assert batch_state.HISTORY == serial_state.HISTORY
+    assert config.OBJECTIVE_FUNCTION == serial_config.OBJECTIVE_FUNCTION == "MOMENT_Z"
+    assert config.NUMBER_PART == serial_config.NUMBER_PART == 1
+
+
+def test_gradients_batch_failed_adjoint(config, batch, tmp_path, monkeypatch):
+    marks = tmp_path / "marks"
+    marks.mkdir()
+    monkeypatch.setenv("STEP_MARKS", str(marks))
+    monkeypatch.setenv("SU2_CORES", "3")
+
+    start = time.monotonic()
+    with pytest.raises(ValueError, match="LIFT adjoint failed"):
+        SU2.eval.grads(batch, "DISCRETE_ADJOINT", config, new_state())
+    assert time.monotonic() - start < 30.0
+
+    # the other adjoint solutions were stopped
+    pids = [int(os.path.basename(name)[:-4]) for name in glob.glob(str(marks / "*"))]
+    assert len(pids) == 2
+    for pid in pids:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
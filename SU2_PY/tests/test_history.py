@@ -0,0 +1,374 @@
+## \file test_history.py
+#  \brief tests of the history readers of SU2.io
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import numpy as np
+import pytest
+
+from SU2 import io as su2io
+
+CSV_HISTORY = """\
+"Inner_Iter",     "rms[Rho]",     "CL",     "CD"
+           0,  -1.000000e+00,  1.00e-01,  1.00e-02
+           1,  -2.000000e+00,  2.00e-01,  2.00e-02
+           2,  -3.000000e+00,  3.00e-01,  3.00e-02
+"""
+
+TECPLOT_HISTORY = """\
+TITLE = "SU2 Simulation"
+VARIABLES =
+"Inner_Iter","rms[Rho]","CL","CD"
+ZONE T= "Convergence history"
+0, -1.0, 0.1, 0.01
+1, -2.0, 0.2, 0.02
+2, -3.0, 0.3, 0.03
+"""
+
+MULTIZONE_HISTORY = """\
+"Outer_Iter","CL[0]","CD[0]","CL[1]","CD[1]","rms[Rho][0]"
+0, 0.1, 0.01, 1.1, 1.01, -1.0
+1, 0.2, 0.02, 1.2, 1.02, -2.0
+"""
+
+
+def write(name, text):
+    with open(name, "w") as f:
+        f.write(text)
+
+
+def test_read_plot_csv(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY)
+    plot_data = su2io.read_plot(filename)
+    assert list(plot_data.keys()) == ["Inner_Iter", "rms[Rho]", "CL", "CD"]
+    for values in plot_data.values():
+        assert values.dtype == np.float64
+        assert values.flags.c_contiguous
+    assert plot_data["Inner_Iter"].tolist() == [0.0, 1.0, 2.0]
+    assert plot_data["CL"].tolist() == [0.1, 0.2, 0.3]
+
+
+def test_read_plot_tecplot(tmp_path):
+    filename = str(tmp_path / "history.dat")
+    write(filename, TECPLOT_HISTORY)
+    plot_data = su2io.read_plot(filename)
+    assert list(plot_data.keys()) == ["Inner_Iter", "rms[Rho]", "CL", "CD"]
+    assert plot_data["CD"].tolist() == [0.01, 0.02, 0.03]
+
+
+def test_read_plot_columns(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY)
+    plot_data = su2io.read_plot(filename, columns=["CD", "CL", "MISSING"])
+    assert list(plot_data.keys()) == ["CL", "CD"]
+    assert plot_data["CD"].tolist() == [0.01, 0.02, 0.03]
+
+
+def test_read_plot_multiple_zones(tmp_path):
+    filename = str(tmp_path / "history.dat")
+    write(filename, TECPLOT_HISTORY + 'ZONE T= "second"\n3, -4.0, 0.4, 0.04\n')
+    with pytest.raises(IOError):
+        su2io.read_plot(filename)
+
+
+def test_read_plot_truncated_line(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY + "           3,  -4.000000e+00,  4.0")
+    plot_data = su2io.read_plot(filename)
+    assert plot_data["Inner_Iter"].tolist() == [0.0, 1.0, 2.0]
+    # a complete last row without line end is read
+    write(filename, CSV_HISTORY + "3, -4.0, 0.4, 0.04")
+    plot_data = su2io.read_plot(filename)
+    assert plot_data["CD"].tolist() == [0.01, 0.02, 0.03, 0.04]
+
+
+def test_read_plot_empty(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY.splitlines(True)[0])
+    plot_data = su2io.read_plot(filename)
+    assert list(plot_data.keys()) == ["Inner_Iter", "rms[Rho]", "CL", "CD"]
+    assert all(len(values) == 0 for values in plot_data.values())
+
+
+def test_read_history_multizone(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, MULTIZONE_HISTORY)
+    history = su2io.read_history(filename, nZones=2)
+    assert list(history.keys()) == [
+        "Outer_Iter",
+        "LIFT[0]",
+        "DRAG[0]",
+        "LIFT[1]",
+        "DRAG[1]",
+        "rms[Rho][0]",
+    ]
+    assert history["LIFT[1]"].tolist() == [1.1, 1.2]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 65536])
+@pytest.mark.parametrize("n_rows", [1, 2, 5, 40])
+def test_read_plot_tail(tmp_path, block_size, n_rows):
+    filename = str(tmp_path / "history.csv")
+    lines = [CSV_HISTORY.splitlines(True)[0]]
+    for i in range(30):
+        lines.append("%i, %.6e, %.6e, %.6e\n" % (i, -i, 0.01 * i, 0.001 * i))
+        if i % 10 == 9:
+            lines.append("\n")
+    write(filename, "".join(lines))
+    plot_data = su2io.read_plot(filename)
+    tail = su2io.read_plot_tail(filename, n_rows, block_size=block_size)
+    assert list(tail.keys()) == list(plot_data.keys())
+    for key, values in plot_data.items():
+        assert tail[key].tolist() == values[-n_rows:].tolist()
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5])
+def test_read_plot_tail_multibyte(tmp_path, block_size):
+    filename = str(tmp_path / "history.dat")
+    text = TECPLOT_HISTORY.replace("Convergence history", "Konvergenzverlauf ä€")
+    text = text.replace("1, -2.0", 'ZONE T= "äöü€"\n1, -2.0')
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    tail = su2io.read_plot_tail(filename, 2, block_size=block_size)
+    assert tail["Inner_Iter"].tolist() == [1.0, 2.0]
+    tail = su2io.read_plot_tail(filename, 3, block_size=block_size)
+    assert tail["Inner_Iter"].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_read_plot_tail_truncated_line(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY + "3, -4.0, 0.")
+    tail = su2io.read_plot_tail(filename, 2, block_size=8)
+    assert tail["Inner_Iter"].tolist() == [1.0, 2.0]
+
+
+def baseline_field(key, nZones):
+    """the header mapping of read_history before the reverse index"""
+    var = key
+    for field in su2io.historyOutFields:
+        if key == su2io.historyOutFields[field]["HEADER"] and nZones == 1:
+            var = field
+        if key.split("[")[0] == su2io.historyOutFields[field]["HEADER"] and nZones > 1:
+            var = field + "[" + key.split("[")[1]
+    return var
+
+
+def test_history_field_matches_scan():
+    headers = [entry["HEADER"] for entry in su2io.historyOutFields.values()]
+    headers += ["Inner_Iter", "Time(min)", "NOT_A_HEADER", ""]
+    for header in headers:
+        assert su2io.get_historyField(header) == baseline_field(header, 1)
+        for zone_header in [header + "[0]", header + "[12]"]:
+            assert su2io.get_historyField(zone_header, 2) == baseline_field(
+                zone_header, 2
+            )
+    assert su2io.get_historyField("CL") == "LIFT"
+    assert su2io.get_historyField("CL[1]", 2) == "LIFT[1]"
+    assert su2io.get_historyField("CL[1]") == "CL[1]"
+
+
+def test_history_index():
+    index = su2io.get_historyIndex()
+    assert index is su2io.get_historyIndex()
+    fields = list(su2io.historyOutFields.keys())
+    for field, entry in su2io.historyOutFields.items():
+        assert index.GROUP[field] == entry["GROUP"]
+        assert field in index.TYPE[entry["TYPE"]]
+        assert fields[index.ORDER[field]] == field
+    for TYPE, type_fields in index.TYPE.items():
+        assert type_fields == [
+            field for field in fields if su2io.historyOutFields[field]["TYPE"] == TYPE
+        ]
+
+
+def test_read_aerodynamics(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY)
+    values = su2io.read_aerodynamics(filename)
+    # coefficients only, in the order of the history map
+    assert list(values.items()) == [("DRAG", 0.03), ("LIFT", 0.3)]
+    write(filename, MULTIZONE_HISTORY)
+    values = su2io.read_aerodynamics(filename, nZones=2)
+    assert list(values.keys()) == ["DRAG[0]", "DRAG[1]", "LIFT[0]", "LIFT[1]"]
+    assert values["LIFT[1]"] == 1.2
+
+
+def append(name, text):
+    with open(name, "a") as f:
+        f.write(text)
+
+
+def test_follower_reads_new_rows(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    follower = su2io.HistoryFollower(filename)
+    assert follower.read() is None
+
+    header, row0, row1, row2 = CSV_HISTORY.splitlines(True)
+    write(filename, header[:10])
+    assert follower.read() is None
+    append(filename, header[10:])
+    assert follower.read() is None
+
+    append(filename, row0 + row1[:12])
+    history = follower.read()
+    assert list(history.keys()) == ["Inner_Iter", "RMS_DENSITY", "LIFT", "DRAG"]
+    assert history["LIFT"].tolist() == [0.1]
+    assert follower.read() is None
+
+    append(filename, row1[12:] + row2)
+    history = follower.read()
+    assert history["LIFT"].tolist() == [0.2, 0.3]
+    assert follower.read() is None
+
+
+def test_follower_multizone(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, MULTIZONE_HISTORY)
+    history = su2io.HistoryFollower(filename, nZones=2).read()
+    assert history["DRAG[1]"].tolist() == [1.01, 1.02]
+
+
+def test_follower_removed_and_recreated(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    follower = su2io.HistoryFollower(filename)
+    write(filename, CSV_HISTORY)
+    assert follower.read()["Inner_Iter"].tolist() == [0.0, 1.0, 2.0]
+
+    # a longer file of a new run, read from its first row
+    os.remove(filename)
+    assert follower.read() is None
+    rows = "".join("%i, -1.0, 0.%i, 0.0%i\n" % (i, i, i) for i in range(10, 20))
+    write(filename, CSV_HISTORY.splitlines(True)[0] + rows)
+    history = follower.read()
+    assert history["Inner_Iter"].tolist() == list(range(10, 20))
+
+
+def test_follower_replaced(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    follower = su2io.HistoryFollower(filename)
+    write(filename, CSV_HISTORY)
+    follower.read()
+
+    # moved over the followed file, no read in between
+    other = str(tmp_path / "other.csv")
+    rows = "".join("%i, -1.0, 0.5, 0.05\n" % i for i in range(20, 30))
+    write(other, CSV_HISTORY.splitlines(True)[0] + rows)
+    os.replace(other, filename)
+    assert follower.read()["Inner_Iter"].tolist() == list(range(20, 30))
+
+
+def test_follower_rewritten_in_place(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    follower = su2io.HistoryFollower(filename)
+    write(filename, CSV_HISTORY)
+    follower.read()
+
+    # same file, truncated and written longer
+    rows = "".join("%i, -1.0, 0.5, 0.05\n" % i for i in range(30, 40))
+    write(filename, CSV_HISTORY.splitlines(True)[0] + rows)
+    assert follower.read()["Inner_Iter"].tolist() == list(range(30, 40))
+
+
+def test_plot_binary_round_trip(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY)
+    plot_data = su2io.read_plot(filename)
+    binary_name = su2io.get_binaryPlotName(filename)
+    assert binary_name == str(tmp_path / "history.bin")
+    su2io.write_plot_binary(binary_name, plot_data)
+
+    binary_data = su2io.read_plot_binary(binary_name)
+    assert list(binary_data.keys()) == list(plot_data.keys())
+    for key, values in plot_data.items():
+        assert binary_data[key].tolist() == values.tolist()
+        assert binary_data[key].dtype == np.float64
+        assert not binary_data[key].flags.writeable
+
+    binary_data = su2io.read_plot_binary(binary_name, columns=["CD"])
+    assert list(binary_data.keys()) == ["CD"]
+
+
+def test_plot_binary_layout(tmp_path):
+    binary_name = str(tmp_path / "history.bin")
+    plot_data = su2io.ordered_bunch()
+    plot_data["A"] = [1.0, 2.0]
+    plot_data["B"] = [3.0, 4.0]
+    su2io.write_plot_binary(binary_name, plot_data)
+    with open(binary_name, "rb") as f:
+        raw = f.read()
+    assert raw[:8] == b"SU2PLOT\0"
+    data = np.frombuffer(raw[-32:], dtype="<f8")
+    assert data.tolist() == [1.0, 3.0, 2.0, 4.0]
+
+    # appended rows are read, a partial row is not
+    with open(binary_name, "ab") as f:
+        f.write(np.array([5.0, 6.0, 7.0], dtype="<f8").tobytes())
+    binary_data = su2io.read_plot_binary(binary_name)
+    assert binary_data["A"].tolist() == [1.0, 2.0, 5.0]
+    assert binary_data["B"].tolist() == [3.0, 4.0, 6.0]
+
+
+def test_plot_binary_repeated_and_empty(tmp_path):
+    binary_name = str(tmp_path / "history.bin")
+    filename = str(tmp_path / "history.csv")
+    write(filename, '"A","B","A"\n1, 2, 3\n')
+    su2io.write_plot_binary(binary_name, su2io.read_plot(filename))
+    # as in read_plot, the last column of a name is read
+    assert su2io.read_plot_binary(binary_name)["A"].tolist() == [3.0]
+
+    write(filename, '"A","B"\n')
+    su2io.write_plot_binary(binary_name, su2io.read_plot(filename))
+    binary_data = su2io.read_plot_binary(binary_name)
+    assert list(binary_data.keys()) == ["A", "B"]
+    assert len(binary_data["A"]) == 0
+
+
+def test_plot_binary_not_binary(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    write(filename, CSV_HISTORY)
+    with pytest.raises(IOError):
+        su2io.read_plot_binary(filename)
+
+
+def test_read_history_picks_up_sidecar(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    binary_name = su2io.get_binaryPlotName(filename)
+    write(filename, CSV_HISTORY)
+    assert not su2io.has_binaryPlot(filename)
+
+    # a sidecar with other values shows which file was read
+    plot_data = su2io.read_plot(filename)
+    plot_data["CL"] = plot_data["CL"] * 10.0
+    su2io.write_plot_binary(binary_name, plot_data)
+    assert su2io.has_binaryPlot(filename)
+    history = su2io.read_history(filename)
+    assert history["LIFT"].tolist() == [1.0, 2.0, 3.0]
+    assert su2io.read_history(filename, n_rows=2)["LIFT"].tolist() == [2.0, 3.0]
+    assert su2io.read_aerodynamics(filename)["LIFT"] == 3.0
+
+    # a sidecar older than the plot file is out of date
+    stat = os.stat(filename)
+    os.utime(binary_name, (stat.st_atime - 10, stat.st_mtime - 10))
+    assert not su2io.has_binaryPlot(filename)
+    assert su2io.read_history(filename)["LIFT"].tolist() == [0.1, 0.2, 0.3]
@@ -0,0 +1,139 @@
+## \file test_inprocess.py
+#  \brief tests of the forked in-process runs of SU2.run.inprocess
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, sys, time, threading
+import pytest
+
+import SU2
+from SU2.run import inprocess
+
+# stand-in of the pysu2 wrapper, the driver behaves as the config file says
+PYSU2 = """
+import os
+
+class CSinglezoneDriver(object):
+    def __init__(self, filename, n_zones, comm):
+        with open(filename) as config_file:
+            self.mode = config_file.read().strip()
+
+    def StartSolver(self):
+        os.write(1, b"solver output\\n")
+        if self.mode == "raise":
+            raise RuntimeError("solver error")
+        if self.mode == "exit":
+            os._exit(1)
+        with open("history.csv", "w") as history_file:
+            history_file.write("ran in %i\\n" % os.getpid())
+        if hasattr(os, "sched_getaffinity"):
+            with open("cpus.txt", "w") as cpus_file:
+                cpus_file.write(repr(sorted(os.sched_getaffinity(0))))
+
+    def Finalize(self):
+        pass
+"""
+
+
+@pytest.fixture
+def pysu2(tmp_path, monkeypatch):
+    (tmp_path / "pysu2.py").write_text(PYSU2)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SU2_PYSU2", "YES")
+    inprocess._drivers.clear()
+    yield tmp_path
+    inprocess._drivers.clear()
+
+
+def run_cfd(mode, log):
+    with open("config_CFD.cfg", "w") as config_file:
+        config_file.write(mode)
+    config = SU2.io.Config()
+    config.MATH_PROBLEM = "DIRECT"
+    stdout = sys.stdout
+    with open(log, "w") as sys.stdout:
+        try:
+            return inprocess.CFD("config_CFD.cfg", config)
+        finally:
+            sys.stdout = stdout
+
+
+def test_run_in_forked_process(pysu2):
+    assert run_cfd("solve", "log.txt")
+    assert (pysu2 / "history.csv").read_text() != "ran in %i\n" % os.getpid()
+    assert not "pysu2" in sys.modules
+    # solver output follows sys.stdout of the python process
+    assert (pysu2 / "log.txt").read_text() == "solver output\n"
+
+
+def test_solver_error_raises(pysu2):
+    with pytest.raises(SU2.EvaluationFailure, match="solver error"):
+        run_cfd("raise", "log.txt")
+    with pytest.raises(SU2.EvaluationFailure, match="exit code 1"):
+        run_cfd("exit", "log.txt")
+    # the python process goes on
+    assert run_cfd("solve", "log.txt")
+
+
+def test_missing_driver(pysu2):
+    config = SU2.io.Config()
+    config.MATH_PROBLEM = "DISCRETE_ADJOINT"
+    assert not inprocess.CFD("config_CFD_AD.cfg", config)
+    assert inprocess._drivers[("pysu2ad", "CDiscAdjSinglezoneDriver")] is False
+
+
+def test_inprocess_enabled(pysu2, monkeypatch):
+    config = SU2.io.Config()
+    assert inprocess.inprocess_enabled(config, 1)
+    assert not inprocess.inprocess_enabled(config, 4)
+    config.DIRECT_DIFF = "D_MACH"
+    assert not inprocess.inprocess_enabled(config, 1)
+    monkeypatch.setenv("SU2_PYSU2", "NO")
+    assert not inprocess.inprocess_enabled(SU2.io.Config(), 1)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity"), reason="binding with sched_setaffinity"
+)
+def test_run_on_reserved_core(pysu2, monkeypatch):
+    monkeypatch.setenv("SU2_CORES", "1")
+    monkeypatch.setenv("SU2_SCHEDULER", "LOCAL")
+    monkeypatch.setenv("SU2_SCHEDULER_DIR", str(pysu2 / "locks"))
+    scheduler = SU2.run.get_scheduler()
+    cpu = scheduler.slots[0][1]
+
+    assert run_cfd("solve", "log.txt")
+    assert (pysu2 / "cpus.txt").read_text() == repr([cpu])
+
+    # waits while the core is used by a launch
+    os.remove("cpus.txt")
+    reservation = scheduler.reserve(1)
+    thread = threading.Thread(target=run_cfd, args=("solve", "log.txt"))
+    thread.start()
+    time.sleep(1.0)
+    assert thread.is_alive()
+    assert not (pysu2 / "cpus.txt").exists()
+    reservation.release()
+    thread.join(10.0)
+    assert not thread.is_alive()
+    assert (pysu2 / "cpus.txt").read_text() == repr([cpu])
@@ -0,0 +1,124 @@
+## \file test_interface.py
+#  \brief tests of the command runners of SU2.run.interface
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, time, asyncio
+import pytest
+
+import SU2
+from SU2.run import run_command_async
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists("/proc/self/stat"), reason="sh commands, /proc"
+)
+
+
+def run(command, **kwargs):
+    return asyncio.run(run_command_async(command, **kwargs))
+
+
+def alive(pid):
+    """False once pid has exited, also if nobody reaped it"""
+    try:
+        with open("/proc/%i/stat" % pid) as stat_file:
+            return stat_file.read().rsplit(")", 1)[1].split()[0] not in "ZX"
+    except FileNotFoundError:
+        return False
+
+
+def test_streams_lines_as_written():
+    lines = []
+
+    def stdout(line):
+        lines.append((line, time.monotonic()))
+
+    assert run("sh -c 'echo first; sleep 0.5; echo second'", stdout=stdout) == 0
+    assert [line for line, _ in lines] == ["first\n", "second\n"]
+    # the first line arrived while the command was still running
+    assert lines[1][1] - lines[0][1] > 0.3
+
+
+def test_stderr_lines(capsys):
+    lines = []
+    command = "sh -c 'echo out; echo warning 1>&2; echo again 1>&2'"
+    assert run(command, stdout=lambda line: None, stderr=lines.append) == 0
+    assert lines == ["warning\n", "again\n"]
+    # reported as run_command() does for a successful command
+    assert capsys.readouterr().out.endswith("warning\nagain\n")
+
+
+@pytest.mark.parametrize(
+    "code, exception",
+    [(1, SU2.EvaluationFailure), (2, SU2.DivergenceFailure), (3, RuntimeError)],
+)
+def test_return_codes(code, exception):
+    command = "sh -c 'echo diverged 1>&2; exit %i'" % code
+    with pytest.raises(exception) as info:
+        run(command, stdout=lambda line: None)
+    message = str(info.value)
+    assert "returned error '%i'" % code in message
+    assert message.endswith("diverged\n")
+
+
+def test_signal_raises_system_exit():
+    with pytest.raises(SystemExit, match="terminated by signal '9'"):
+        run("kill -9 $$", stdout=lambda line: None)
+
+
+def test_concurrent_commands():
+    lines = []
+
+    async def both():
+        return await asyncio.gather(
+            run_command_async("sh -c 'sleep 0.5; echo one'", stdout=lines.append),
+            run_command_async("sh -c 'sleep 0.5; echo two'", stdout=lines.append),
+        )
+
+    start = time.monotonic()
+    assert asyncio.run(both()) == [0, 0]
+    assert time.monotonic() - start < 0.95
+    assert sorted(lines) == ["one\n", "two\n"]
+
+
+def test_cancel_stops_command(tmp_path):
+    marker = tmp_path / "pid"
+
+    async def cancelled():
+        command = "sleep 30 & echo $! > %s; wait" % marker
+        task = asyncio.ensure_future(
+            run_command_async(command, stdout=lambda line: None)
+        )
+        while not marker.exists() or not marker.read_text().strip():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(cancelled())
+    assert time.monotonic() - start < 10.0
+    # the children of the command were stopped too
+    pid = int(marker.read_text())
+    while alive(pid) and time.monotonic() - start < 10.0:
+        time.sleep(0.05)
+    assert not alive(pid)
@@ -0,0 +1,104 @@
+## \file test_kd_tree.py
+#  \brief tests of SU2.util.KDTree against a linear scan
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import numpy as np
+import pytest
+
+import SU2
+from SU2.util import KDTree
+
+
+def argmin_scan(points, point):
+    """closest point as SU2.opt.Project.closest_design() found it
+    before the index, config distances and numpy.argmin
+    """
+    config = SU2.io.Config()
+    config.DV_VALUE_NEW = list(point)
+    diffs = []
+    for this_point in points:
+        konfig = SU2.io.Config()
+        konfig.DV_VALUE_NEW = list(this_point)
+        diffs.append(config.dist(konfig, ["DV_VALUE_NEW"]))
+    i_min = np.argmin(diffs)
+    return diffs[i_min], i_min
+
+
+@pytest.mark.parametrize("n_dim", [1, 2, 5])
+def test_nearest_matches_scan(n_dim):
+    rng = np.random.RandomState(n_dim)
+    points = rng.uniform(-1.0, 1.0, (200, n_dim)).tolist()
+    tree = KDTree(points)
+    for point in rng.uniform(-1.2, 1.2, (50, n_dim)).tolist():
+        distance, value = tree.nearest(point)
+        scan_distance, scan_value = argmin_scan(points, point)
+        assert value == scan_value
+        assert distance == pytest.approx(scan_distance, rel=1e-12)
+
+
+def test_ties_go_to_first_point():
+    # grid points, queries at equal distance from several points
+    grid = [[x, y] for x in range(6) for y in range(6)]
+    rng = np.random.RandomState(0)
+    points = [grid[i] for i in rng.permutation(len(grid))]
+    points += points[:5]  # repeated designs
+    tree = KDTree()
+    for point in points:
+        tree.add(point)
+    for query in [[0.5, 0.5], [2.5, 3.0], [1.0, 1.5], [4.5, 4.5], [7.0, 2.5]]:
+        distance, value = tree.nearest(query)
+        scan_distance, scan_value = argmin_scan(points, query)
+        assert value == scan_value
+        assert distance == pytest.approx(scan_distance)
+
+
+def test_exact():
+    tree = KDTree()
+    tree.add([0.0, 1.0], "a")
+    tree.add([0.0, 1.0], "b")
+    tree.add([1.0, 1.0], "c")
+    assert tree.exact([0, 1]) == "a"
+    assert tree.exact([0.5, 1.0]) is None
+    assert tree.nearest([0.0, 1.0]) == (0.0, "a")
+    assert len(tree) == 3
+
+
+def test_empty_and_dimensions():
+    tree = KDTree()
+    assert tree.nearest([0.0]) == (None, None)
+    tree.add([0.0, 0.0])
+    with pytest.raises(ValueError):
+        tree.add([0.0])
+    with pytest.raises(ValueError):
+        tree.nearest([0.0, 0.0, 0.0])
+
+
+def test_repeated_coordinates_beyond_recursion_limit():
+    n_points = sys.getrecursionlimit() + 500
+    points = [[0.0, 1.0]] * n_points + [[0.0, float(i)] for i in range(n_points)]
+    tree = KDTree(points)
+    tree._build()
+    assert tree.depth > sys.getrecursionlimit()
+    assert tree.nearest([0.1, 1.0]) == (pytest.approx(0.1), 0)
+    assert tree.nearest([0.0, 40.2])[1] == n_points + 40
@@ -0,0 +1,162 @@
+## \file test_mp_eval.py
+#  \brief tests of SU2.util.EvalPool and SU2.util.mp_eval
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, time
+import pytest
+from concurrent.futures import CancelledError, TimeoutError
+
+from SU2.util import EvalPool, mp_eval
+
+
+def square(x):
+    return x * x
+
+
+def fail(x):
+    raise ValueError("bad input %s" % x)
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def die():
+    os._exit(3)
+
+
+def test_results_in_order():
+    with EvalPool(3) as pool:
+        futures = [pool.submit(square, x) for x in range(10)]
+        assert [future.result() for future in futures] == [x * x for x in range(10)]
+        assert list(pool.map(square, range(5))) == [0, 1, 4, 9, 16]
+
+
+def test_task_exception_with_remote_traceback():
+    with EvalPool(2) as pool:
+        future = pool.submit(fail, 7)
+        with pytest.raises(ValueError, match="bad input 7") as info:
+            future.result()
+    assert "fail" in str(info.value.__cause__)
+
+
+def test_task_runs_in_own_process():
+    with EvalPool(2) as pool:
+        assert pool.submit(sleep, 0.0).result() != os.getpid()
+
+
+def test_dead_task():
+    with EvalPool(1) as pool:
+        with pytest.raises(RuntimeError, match="died"):
+            pool.submit(die).result()
+        # the pool keeps working
+        assert pool.submit(square, 3).result() == 9
+
+
+def test_timeout():
+    with EvalPool(2, timeout=0.5) as pool:
+        start = time.monotonic()
+        slow = pool.submit(sleep, 30.0)
+        fast = pool.schedule(square, (4,), timeout=10.0)
+        with pytest.raises(TimeoutError):
+            slow.result()
+        assert time.monotonic() - start < 10.0
+        assert fast.result() == 16
+
+
+def test_cancel_running_and_waiting():
+    with EvalPool(1) as pool:
+        running = pool.submit(sleep, 30.0)
+        waiting = pool.submit(square, 2)
+        while not running.running():
+            time.sleep(0.01)
+        assert pool.cancel(waiting)
+        assert pool.cancel(running)
+        with pytest.raises(CancelledError):
+            running.result(timeout=10.0)
+        assert waiting.cancelled()
+        done = pool.submit(square, 1)
+        assert done.result() == 1
+        assert not pool.cancel(done)
+
+
+def test_max_pending_blocks_submit():
+    pool = EvalPool(1, max_pending=1)
+    first = pool.submit(sleep, 0.5)
+    start = time.monotonic()
+    second = pool.submit(square, 5)
+    assert time.monotonic() - start > 0.2
+    assert first.done()
+    assert second.result() == 25
+    pool.shutdown()
+
+
+def fail_or_sleep(x):
+    if x == 1:
+        time.sleep(0.2)
+        raise ValueError("bad input %s" % x)
+    time.sleep(30.0)
+    return x
+
+
+def test_map_stops_on_failure():
+    with EvalPool(2) as pool:
+        start = time.monotonic()
+        with pytest.raises(ValueError, match="bad input 1"):
+            list(pool.map(fail_or_sleep, range(6)))
+        # the sleeping tasks were stopped, and free their slots
+        assert pool.submit(square, 3).result(timeout=10.0) == 9
+        assert pool.submit(square, 4).result(timeout=10.0) == 16
+        assert time.monotonic() - start < 20.0
+
+
+def test_shutdown():
+    pool = EvalPool(2)
+    future = pool.submit(square, 6)
+    pool.shutdown(wait=True)
+    assert future.result() == 36
+    with pytest.raises(RuntimeError):
+        pool.submit(square, 1)
+
+
+def test_shutdown_cancels_futures():
+    pool = EvalPool(1)
+    running = pool.submit(sleep, 30.0)
+    waiting = pool.submit(sleep, 30.0)
+    start = time.monotonic()
+    pool.shutdown(wait=True, cancel_futures=True)
+    assert time.monotonic() - start < 10.0
+    assert waiting.cancelled()
+    with pytest.raises(CancelledError):
+        running.result()
+
+
+def test_mp_eval():
+    func = mp_eval(square, num_procs=2)
+    assert func.__name__ == "square"
+    assert func([(x,) for x in range(6)]) == [0, 1, 4, 9, 16, 25]
+    with pytest.raises(ValueError):
+        mp_eval(fail, num_procs=2)([(1,), (2,)])
+    with pytest.raises(Exception):
+        func(3)
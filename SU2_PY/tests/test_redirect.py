@@ -0,0 +1,118 @@
+## \file test_redirect.py
+#  \brief tests of SU2.io.DirectorySnapshot and SU2.io.redirect_folder
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pytest
+
+from SU2 import io as su2io
+
+
+def write(name, text):
+    with open(name, "w") as f:
+        f.write(text)
+
+
+def read(name):
+    with open(name) as f:
+        return f.read()
+
+
+def counting_exists(monkeypatch):
+    """counts the os.path.exists() calls, by name"""
+    calls = []
+    exists = os.path.exists
+
+    def counted(path):
+        calls.append(os.path.basename(path))
+        return exists(path)
+
+    monkeypatch.setattr(os.path, "exists", counted)
+    return calls
+
+
+def test_snapshot_dangling_link(tmp_path):
+    write(tmp_path / "file", "data")
+    os.symlink(tmp_path / "file", tmp_path / "link")
+    os.symlink(tmp_path / "missing", tmp_path / "stale")
+    snapshot = su2io.DirectorySnapshot()
+    assert snapshot.exists(str(tmp_path / "link"))
+    assert not snapshot.exists(str(tmp_path / "stale"))
+    assert snapshot.dangling_link(str(tmp_path / "stale"))
+    assert not snapshot.dangling_link(str(tmp_path / "link"))
+    snapshot.add(str(tmp_path / "stale"))
+    assert snapshot.exists(str(tmp_path / "stale"))
+    assert not snapshot.dangling_link(str(tmp_path / "stale"))
+
+
+def test_snapshot_follows_queried_links_once(tmp_path, monkeypatch):
+    write(tmp_path / "file", "data")
+    for i in range(8):
+        os.symlink(tmp_path / "file", tmp_path / ("link%d" % i))
+    calls = counting_exists(monkeypatch)
+
+    snapshot = su2io.DirectorySnapshot()
+    assert snapshot.exists(str(tmp_path / "file"))
+    assert calls == []
+
+    assert snapshot.exists(str(tmp_path / "link3"))
+    assert not snapshot.dangling_link(str(tmp_path / "link3"))
+    assert snapshot.exists(str(tmp_path / "link3"))
+    assert calls == ["link3"]
+
+    snapshot.remove(str(tmp_path / "link5"))
+    assert not snapshot.exists(str(tmp_path / "link5"))
+    assert calls == ["link3"]
+
+
+@pytest.mark.parametrize("force", [True, False])
+def test_redirect_links(tmp_path, monkeypatch, force):
+    monkeypatch.chdir(tmp_path)
+    write("mesh.su2", "mesh")
+    os.mkdir("work")
+    os.symlink(str(tmp_path / "gone.su2"), "work/mesh.su2")
+
+    with su2io.redirect_folder("work", link=["mesh.su2", "missing.su2"], force=force):
+        assert os.path.islink("mesh.su2")
+        assert read("mesh.su2") == "mesh"
+        assert not os.path.lexists("missing.su2")
+
+
+def test_redirect_does_not_check_new_links(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write("mesh.su2", "mesh")
+    write("restart.dat", "restart")
+    os.mkdir("work")
+    for i in range(8):
+        os.symlink(str(tmp_path / "mesh.su2"), "work/other%d.su2" % i)
+    calls = counting_exists(monkeypatch)
+
+    with su2io.redirect_folder("work", link=["mesh.su2", "restart.dat"]):
+        assert read("mesh.su2") == "mesh"
+        assert read("restart.dat") == "restart"
+
+    # only make_link checks source and destination, no other link of
+    # the folder is followed
+    assert not [name for name in calls if name.startswith("other")]
+    assert calls.count("mesh.su2") == 2
+    assert calls.count("restart.dat") == 2
@@ -0,0 +1,194 @@
+## \file test_results.py
+#  \brief tests of SU2.opt.Results against the previous compile_results
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import math
+import numpy as np
+import pytest
+
+import SU2
+from SU2.opt import Results
+
+# ----------------------------------------------------------------------
+#  Reference, Project._compile_results() before SU2.opt.Results
+# ----------------------------------------------------------------------
+
+
+def compile_results(states, default=np.nan):
+    results = SU2.io.State()
+    results.VARIABLES = []
+    del results.FILES
+
+    for state in states:
+        for key in state.FUNCTIONS.keys():
+            results.FUNCTIONS[key] = []
+        for key in state.GRADIENTS.keys():
+            results.GRADIENTS[key] = []
+        for TYPE in state.HISTORY.keys():
+            if not TYPE in results.HISTORY:
+                results.HISTORY[TYPE] = SU2.util.ordered_bunch()
+            for key in state.HISTORY[TYPE].keys():
+                results.HISTORY[TYPE][key] = []
+
+    for state in states:
+        this_designvector = state.design_vector()
+        results.VARIABLES.append(this_designvector)
+        for key in results.FUNCTIONS.keys():
+            if key in state.FUNCTIONS:
+                new_func = state.FUNCTIONS[key]
+            else:
+                new_func = default
+            results.FUNCTIONS[key].append(new_func)
+        for key in results.GRADIENTS.keys():
+            if key in state.GRADIENTS:
+                new_grad = state.GRADIENTS[key]
+            else:
+                new_grad = [default] * len(this_designvector)
+            results.GRADIENTS[key].append(new_grad)
+        for TYPE in results.HISTORY.keys():
+            for key in results.HISTORY[TYPE].keys():
+                if key in results.FUNCTIONS.keys():
+                    new_func = results.FUNCTIONS[key][-1]
+                elif TYPE in state.HISTORY.keys() and key in state.HISTORY[TYPE].keys():
+                    new_func = state.HISTORY[TYPE][key][-1]
+                else:
+                    new_func = default
+                results.HISTORY[TYPE][key].append(new_func)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+#  Tests
+# ----------------------------------------------------------------------
+
+
+def make_state(dvs, functions=None, gradients=None, history=None):
+    state = SU2.io.State()
+    state.VARIABLES.DV_VALUE_NEW = list(dvs)
+    state.FUNCTIONS.update(functions or {})
+    state.GRADIENTS.update(gradients or {})
+    for TYPE, columns in (history or {}).items():
+        state.HISTORY[TYPE] = SU2.util.ordered_bunch(columns)
+    return state
+
+
+def same(a, b):
+    """equal values and types, nan equal to nan"""
+    if isinstance(a, dict):
+        return set(a.keys()) == set(b.keys()) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b and isinstance(a, int) == isinstance(b, int)
+
+
+def check_export(states, order=None):
+    results = Results()
+    for i_dsn in order or range(len(states)):
+        results.update(i_dsn, states[i_dsn])
+    expected = compile_results(states)
+    exported = results.export()
+    for key in ["VARIABLES", "FUNCTIONS", "GRADIENTS", "HISTORY"]:
+        assert same(exported[key], expected[key]), key
+        # keys are in order of the designs that have them
+        if order is None and key != "VARIABLES":
+            assert list(exported[key].keys()) == list(expected[key].keys())
+    for TYPE in expected.HISTORY.keys():
+        for key in expected.HISTORY[TYPE].keys():
+            assert same(exported.HISTORY[TYPE][key], expected.HISTORY[TYPE][key]), key
+    return results
+
+
+def test_history_of_functions_of_other_designs():
+    # designs 0 and 2 have LIFT only in their history
+    history = {"DIRECT": {"Inner_Iter": [0, 1, 2], "LIFT": [1.0, 2.0]}}
+    states = [
+        make_state([0.0], history=history),
+        make_state([1.0], functions={"LIFT": 0.3}, history=history),
+        make_state([2.0], history=history),
+        make_state([3.0], functions={"LIFT": 0.3}, history=history),
+    ]
+    results = check_export(states)
+    exported = results.export()
+    assert same(exported.HISTORY.DIRECT.LIFT, [np.nan, 0.3, np.nan, 0.3])
+    assert exported.HISTORY.DIRECT.Inner_Iter == [2, 2, 2, 2]
+    assert all(type(i) is int for i in exported.HISTORY.DIRECT.Inner_Iter)
+    assert results.HISTORY.DIRECT.LIFT.mask.tolist() == [True, False, True, False]
+
+
+def test_matches_previous_compile_results():
+    states = [
+        make_state(
+            [0.1, 0.2],
+            functions={"DRAG": 0.01, "LIFT": 0.5},
+            gradients={"DRAG": [1.0, 2.0]},
+            history={"DIRECT": {"Inner_Iter": [0, 99], "DRAG": [0.02, 0.011]}},
+        ),
+        make_state(
+            [0.3, 0.4],
+            functions={"DRAG": 0.02, "MOMENT_Z": -0.1},
+            history={
+                "DIRECT": {"Inner_Iter": [0, 50], "CL": [0.1, 0.4]},
+                "ADJOINT_DRAG": {"Inner_Iter": [0, 10], "Sens_AoA": [1.0, 3.0]},
+            },
+        ),
+        make_state(
+            [0.5, 0.6],
+            functions={"LIFT": 0.7},
+            gradients={"DRAG": [3.0, 4.0], "LIFT": [-1.0, 0.5]},
+        ),
+    ]
+    check_export(states)
+    # the result does not depend on the order of updates
+    check_export(states, order=[2, 0, 1])
+
+
+def test_update_replaces_row():
+    results = Results()
+    results.update(0, make_state([0.0], functions={"DRAG": 1.0}))
+    results.update(0, make_state([1.0], functions={"LIFT": 2.0}))
+    exported = results.export()
+    assert exported.VARIABLES == [[1.0]]
+    assert same(exported.FUNCTIONS.DRAG, [np.nan])
+    assert exported.FUNCTIONS.LIFT == [2.0]
+
+
+def test_columns_grow(tmp_path):
+    results = Results()
+    n = 100
+    for i_dsn in range(n):
+        results.update(
+            i_dsn, make_state([i_dsn, -i_dsn], functions={"DRAG": i_dsn * 0.5})
+        )
+    assert results.n_designs == n
+    assert results.FUNCTIONS.DRAG.tolist() == [i * 0.5 for i in range(n)]
+    assert results.VARIABLES.shape == (n, 2)
+
+    filename = str(tmp_path / "history_project.csv")
+    results.write_plot(filename, "CSV")
+    with open(filename) as plot_file:
+        lines = plot_file.read().splitlines()
+    assert len(lines) == n + 1
+    assert "DRAG" in lines[0]
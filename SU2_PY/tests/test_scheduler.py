@@ -0,0 +1,150 @@
+## \file test_scheduler.py
+#  \brief tests of the core scheduler of SU2.run
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pytest
+
+from SU2.run import scheduler
+from SU2.run.scheduler import Scheduler, SchedulerBackend
+
+
+class FakeBackend(SchedulerBackend):
+    """two domains of four cores of this machine"""
+
+    def slots(self):
+        return [("", i) for i in range(8)]
+
+    def domains(self):
+        slots = self.slots()
+        return [slots[:4], slots[4:]]
+
+    def command(self, the_Command, processes, reservation):
+        return the_Command
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        SchedulerBackend()
+
+    class NoCommand(SchedulerBackend):
+        def slots(self):
+            return []
+
+    with pytest.raises(TypeError):
+        NoCommand()
+
+
+def test_reserve_prefers_one_domain(tmp_path):
+    sched = Scheduler(FakeBackend(), 8, str(tmp_path))
+    with sched.reserve(3) as first:
+        assert first.cpus == [0, 1, 2]
+        # the domain with the fewest free cores that fits
+        with sched.reserve(1) as second:
+            assert second.cpus == [3]
+        with sched.reserve(2) as third:
+            assert third.cpus == [4, 5]
+            with sched.reserve(3) as fourth:
+                assert sorted(fourth.cpus) == [3, 6, 7]
+    assert first.hosts == {"": 3}
+
+
+def test_reservations_are_shared(tmp_path):
+    one = Scheduler(FakeBackend(), 4, str(tmp_path), poll_interval=0.01)
+    two = Scheduler(FakeBackend(), 4, str(tmp_path), poll_interval=0.01)
+    assert len(one) == 4
+    reservation = one.reserve(3)
+    assert two._try_reserve(2) is None
+    with two.reserve(1) as other:
+        assert other.cpus == [3]
+    reservation.release()
+    with two.reserve(4) as other:
+        assert other.cpus == [0, 1, 2, 3]
+
+
+def test_oversubscribed_launch_takes_all_cores(tmp_path):
+    sched = Scheduler(FakeBackend(), 2, str(tmp_path))
+    with sched.reserve(16) as reservation:
+        assert reservation.cpus == [0, 1]
+
+
+def test_local_command_binds_with_taskset(tmp_path):
+    backend = scheduler.LocalBackend("mpirun -n %i %s")
+    backend.taskset = "/usr/bin/taskset"
+    sched = Scheduler(FakeBackend(), 8, str(tmp_path))
+    with sched.reserve(2) as reservation:
+        command = backend.command("SU2_CFD config.cfg", 2, reservation)
+        assert command == "taskset -c 0,1 mpirun -n 2 SU2_CFD config.cfg"
+        assert backend.command("SU2_DEF config.cfg", 1, reservation) == (
+            "taskset -c 0,1 SU2_DEF config.cfg"
+        )
+
+    backend.taskset = None
+    with sched.reserve(1) as reservation:
+        assert backend.command("SU2_DEF config.cfg", 1, reservation) == (
+            "SU2_DEF config.cfg"
+        )
+
+
+def test_hostfile_backend(tmp_path, monkeypatch):
+    hostfile = tmp_path / "hosts"
+    hostfile.write_text("# cluster\nnode1 slots=2\nnode2:3\nnode3\n")
+    monkeypatch.setenv("SU2_HOSTFILE", str(hostfile))
+    backend = scheduler.HostfileBackend()
+    assert backend.slots() == [
+        ("node1", 0),
+        ("node1", 1),
+        ("node2", 0),
+        ("node2", 1),
+        ("node2", 2),
+        ("node3", 0),
+    ]
+
+    sched = Scheduler(backend, 6, str(tmp_path / "locks"))
+    with sched.reserve(3) as reservation:
+        assert reservation.cpus is None
+        assert reservation.hosts == {"node2": 3}
+        assert backend.command("SU2_CFD config.cfg", 3, reservation) == (
+            "mpirun -n 3 --host node2:3 --bind-to core SU2_CFD config.cfg"
+        )
+
+
+def test_get_scheduler(tmp_path, monkeypatch):
+    monkeypatch.delenv("SU2_CORES", raising=False)
+    assert scheduler.get_scheduler() is None
+
+    monkeypatch.setenv("SU2_CORES", "2")
+    monkeypatch.setenv("SU2_SCHEDULER", "local")
+    monkeypatch.setenv("SU2_SCHEDULER_DIR", str(tmp_path))
+    sched = scheduler.get_scheduler("mpirun -n %i %s")
+    assert isinstance(sched.backend, scheduler.LocalBackend)
+    assert sched is scheduler.get_scheduler("mpirun -n %i %s")
+
+    monkeypatch.setenv("SU2_SCHEDULER", "PBS")
+    with pytest.raises(ValueError):
+        scheduler.get_scheduler()
+
+
+def test_parse_cpulist():
+    assert scheduler._parse_cpulist("0-3,8-9,12\n") == {0, 1, 2, 3, 8, 9, 12}
+    assert scheduler._parse_cpulist("") == set()
@@ -0,0 +1,190 @@
+## \file test_store.py
+#  \brief tests of the design store of projects
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, copy, pickle, sqlite3
+import pytest
+
+import SU2
+from SU2.io import DesignStore
+from SU2.opt.project import Project
+
+
+class Design(object):
+    """stand-in of SU2.eval.Design"""
+
+    def __init__(self, folder, value):
+        self.folder = folder
+        self.value = value
+
+
+def test_append_and_load(tmp_path):
+    store = DesignStore(str(tmp_path / "designs.db"))
+    assert store.load() == []
+    assert store.count() == 0
+    with pytest.raises(KeyError):
+        store.load(0)
+
+    store.append([(0, Design("DSN_001", 1.0)), (1, Design("DSN_002", 2.0))])
+    store.append([(0, Design("DSN_001", 1.5))])
+    store.append([])
+
+    assert store.count() == 2
+    assert [d.value for d in store.load()] == [1.5, 2.0]
+    assert store.load(1).folder == "DSN_002"
+
+
+def test_compact_keeps_current_versions(tmp_path):
+    store = DesignStore(str(tmp_path / "designs.db"))
+    for version in range(5):
+        store.append(
+            [(0, Design("DSN_001", version)), (1, Design("DSN_002", -version))]
+        )
+    store.compact()
+    assert [d.value for d in store.load()] == [4, -4]
+    store.append([(2, Design("DSN_003", 9))])
+    assert [d.value for d in store.load()] == [4, -4, 9]
+
+
+def bare_project(folder):
+    """a project with its designs, without a config and a mesh"""
+    project = Project.__new__(Project)
+    project.config = SU2.io.Config()
+    project.state = SU2.io.State()
+    project.files = project.state.FILES
+    project.designs = [Design("DESIGNS/DSN_%03i" % i, float(i)) for i in range(1, 4)]
+    project.folder = folder
+    project._results = None
+    project.filename = "project.pkl"
+    project.results_filename = "results.pkl"
+    project.store_filename = "designs.db"
+    project._n_stored = 0
+    return project
+
+
+def test_project_file_loads_from_anywhere(tmp_path, monkeypatch):
+    run = tmp_path / "run"
+    run.mkdir()
+    monkeypatch.chdir(run)
+    project = bare_project("./")
+    project._store_designs()
+    project._save_project()
+
+    monkeypatch.chdir(tmp_path)
+    loaded = SU2.io.load_data(os.path.join("run", "project.pkl"))
+    assert [d.value for d in loaded.designs] == [1.0, 2.0, 3.0]
+    assert loaded._n_stored == 3
+
+    # the moved project folder is found relative to the working directory
+    os.rename(str(run), str(tmp_path / "moved"))
+    monkeypatch.chdir(tmp_path / "moved")
+    loaded = SU2.io.load_data("project.pkl")
+    assert [d.value for d in loaded.designs] == [1.0, 2.0, 3.0]
+
+    # the project file does not hold the designs
+    os.remove("designs.db")
+    with pytest.warns(UserWarning, match="3 designs missing"):
+        loaded = SU2.io.load_data("project.pkl")
+    assert loaded.designs == []
+
+
+def test_copy_does_not_read_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = bare_project("./")
+    project._store_designs()
+    project.designs.append(Design("DESIGNS/DSN_004", 4.0))
+    os.remove("designs.db")
+
+    for clone in [copy.deepcopy(project), pickle.loads(pickle.dumps(project))]:
+        assert [d.value for d in clone.designs] == [1.0, 2.0, 3.0, 4.0]
+        assert clone._n_stored == 3
+    assert not os.path.exists("designs.db")
+
+
+def n_records(filename):
+    connection = sqlite3.connect(filename)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_store_stays_bounded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = bare_project("./")
+    project._store_designs()
+    assert n_records("designs.db") == 3
+
+    # every update appends a record, older versions are removed
+    # once they outnumber the designs
+    for version in range(20):
+        design = project.designs[version % 3]
+        design.value = version
+        project._store_designs([design])
+        assert n_records("designs.db") <= 2 * len(project.designs) + 1
+    assert [d.value for d in DesignStore("designs.db").load()] == [18.0, 19.0, 17.0]
+
+    # saving removes all older versions
+    project.designs[0].value = 20.0
+    project._store_designs([project.designs[0]])
+    monkeypatch.setattr(Project, "compile_results", lambda self: None)
+    project.save()
+    assert n_records("designs.db") == 3
+    assert project._n_stale == 0
+    loaded = SU2.io.load_data("project.pkl")
+    assert [d.value for d in loaded.designs] == [20.0, 19.0, 17.0]
+
+
+class EvalDesign(Design):
+    """stand-in of SU2.eval.Design that updates its state"""
+
+    def __init__(self, folder, config):
+        Design.__init__(self, folder, 0.0)
+        self.config = config
+        self.state = SU2.io.State()
+
+    def _eval(self, func, *args):
+        value = func(*args)
+        self.state.FUNCTIONS.DRAG = value
+        self.state.set_timestamp()
+        return value
+
+
+def test_eval_writes_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = bare_project("./")
+    project.designs = []
+    project.config.TABULAR_FORMAT = "CSV"
+    project._store_designs()
+
+    def new_design(self, konfig):
+        design = EvalDesign("DESIGNS/DSN_%03i" % (len(self.designs) + 1), konfig)
+        self.designs.append(design)
+        return design
+
+    monkeypatch.setattr(Project, "new_design", new_design)
+    project.config.CONSOLE = "QUIET"
+    for i in range(3):
+        assert project._eval(SU2.io.Config(), lambda x: 2.0 * x, i) == 2.0 * i
+        results = SU2.io.load_data("results.pkl")
+        assert list(results.FUNCTIONS.DRAG) == [2.0 * x for x in range(i + 1)]
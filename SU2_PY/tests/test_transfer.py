@@ -0,0 +1,159 @@
+## \file test_transfer.py
+#  \brief tests of the file transfers of SU2.io.redirect_folder
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import os, errno
+import pytest
+
+from SU2 import io as su2io
+
+
+def write(name, text):
+    with open(name, "w") as f:
+        f.write(text)
+
+
+def read(name):
+    with open(name) as f:
+        return f.read()
+
+
+@pytest.fixture
+def transfer(tmp_path, monkeypatch):
+    """a source folder and a work folder, hard links for any size"""
+    monkeypatch.setattr(su2io.transfer, "_linkSize", 0)
+    monkeypatch.setattr(su2io.transfer, "_failed", {})
+    monkeypatch.setenv("SU2_TRANSFER", "HARDLINK,COPY")
+    os.mkdir(tmp_path / "work")
+    pairs = []
+    for i in range(3):
+        name = "restart_%i.dat" % i
+        write(tmp_path / name, "restart %i" % i)
+        pairs.append((str(tmp_path / name), str(tmp_path / "work" / name)))
+    return pairs
+
+
+def test_transfer_methods(monkeypatch):
+    monkeypatch.delenv("SU2_TRANSFER", raising=False)
+    assert su2io.transfer_methods() == ["REFLINK", "HARDLINK", "COPY"]
+    monkeypatch.setenv("SU2_TRANSFER", "hardlink")
+    assert su2io.transfer_methods() == ["HARDLINK", "COPY"]
+    monkeypatch.setenv("SU2_TRANSFER", "SYMLINK")
+    with pytest.raises(Exception, match="unknown transfer method"):
+        su2io.transfer_methods()
+
+
+def test_transfer_hardlinks(transfer):
+    report = su2io.transfer_files(transfer)
+    for source, destination in transfer:
+        assert os.path.samefile(source, destination)
+    assert report.HARDLINK == report.BYTES_AVOIDED == 3 * len("restart 0")
+    assert report.COPY == 0
+
+
+def test_transfer_copies_small_files(transfer, monkeypatch):
+    monkeypatch.setattr(su2io.transfer, "_linkSize", 1 << 20)
+    report = su2io.transfer_files(transfer)
+    for source, destination in transfer:
+        assert not os.path.samefile(source, destination)
+        assert read(destination) == read(source)
+    assert report.COPY == 3 * len("restart 0")
+    assert report.BYTES_AVOIDED == 0
+
+
+def failing_link(error, names):
+    """os.link that fails with error for the sources in names"""
+    link = os.link
+    calls = []
+
+    def failing(source, destination):
+        calls.append(source)
+        if os.path.basename(source) in names:
+            raise OSError(error, os.strerror(error))
+        return link(source, destination)
+
+    return failing, calls
+
+
+@pytest.mark.parametrize("error", [errno.EPERM, errno.EMLINK])
+def test_transfer_file_link_error(transfer, monkeypatch, error):
+    link, calls = failing_link(error, ["restart_0.dat"])
+    monkeypatch.setattr(su2io.transfer.os, "link", link)
+
+    report = su2io.transfer_files(transfer)
+
+    # copied the file that could not be linked, linked the others
+    source, destination = transfer[0]
+    assert not os.path.samefile(source, destination)
+    assert read(destination) == "restart 0"
+    for source, destination in transfer[1:]:
+        assert os.path.samefile(source, destination)
+    assert len(calls) == 3
+    assert report.COPY == len("restart 0")
+    assert report.HARDLINK == 2 * len("restart 0")
+    assert not any(su2io.transfer._failed.values())
+
+
+@pytest.mark.parametrize("error", [errno.EXDEV, errno.ENOTSUP])
+def test_transfer_file_system_link_error(transfer, monkeypatch, error):
+    link, calls = failing_link(error, ["restart_0.dat"])
+    monkeypatch.setattr(su2io.transfer.os, "link", link)
+
+    report = su2io.transfer_files(transfer)
+
+    # hard links are not tried again between the devices
+    for source, destination in transfer:
+        assert not os.path.samefile(source, destination)
+        assert read(destination) == read(source)
+    assert len(calls) == 1
+    assert report.COPY == 3 * len("restart 0")
+    assert list(su2io.transfer._failed.values()) == [set(["HARDLINK"])]
+
+
+def test_transfer_keeps_existing(transfer):
+    source, destination = transfer[0]
+    write(destination, "kept")
+    su2io.transfer_files(transfer[:1], force=False)
+    assert read(destination) == "kept"
+    su2io.transfer_files(transfer[:1], force=True)
+    assert read(destination) == "restart 0"
+
+
+@pytest.mark.parametrize("method", ["HARDLINK", "COPY"])
+@pytest.mark.parametrize("force", [True, False])
+def test_transfer_replaces_stale_link(tmp_path, monkeypatch, method, force):
+    monkeypatch.setenv("SU2_TRANSFER", method)
+    monkeypatch.setattr(su2io.transfer, "_linkSize", 0)
+    source = tmp_path / "source.dat"
+    destination = tmp_path / "work" / "source.dat"
+    target = tmp_path / "target.dat"
+    write(source, "restart")
+    os.mkdir(tmp_path / "work")
+    os.symlink(target, destination)
+
+    report = su2io.transfer_files([(str(source), str(destination))], force)
+
+    assert not os.path.islink(destination)
+    assert read(destination) == "restart"
+    assert not os.path.exists(target)
+    assert report[method] == len("restart")
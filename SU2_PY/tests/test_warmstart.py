@@ -0,0 +1,153 @@
+## \file test_warmstart.py
+#  \brief tests of the warm starts of new designs
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+from types import SimpleNamespace
+
+import SU2
+from SU2.io import warmstart
+from SU2.opt.project import Project
+
+
+def write_ascii_restart(filename, n_points, metadata=(), sep="\t"):
+    with open(filename, "w") as restart_file:
+        restart_file.write(sep.join(['"PointID"', '"x"', '"y"', '"Density"']) + "\n")
+        for i in range(n_points):
+            restart_file.write(sep.join(["%i" % i, "0.5", "-1.25", "1.0"]) + "\n")
+        for line in metadata:
+            restart_file.write(line + "\n")
+
+
+def test_restart_points_ascii(tmp_path):
+    name = str(tmp_path / "restart_flow.dat")
+    write_ascii_restart(name, 7)
+    assert warmstart.restart_points(name) == 7
+
+    # legacy restarts end with metadata lines
+    metadata = [
+        "EXT_ITER= 250",
+        "AOA= 1.25",
+        "SIDESLIP_ANGLE= 0",
+        "",
+        "DCD_DCL_VALUE= 0",
+    ]
+    write_ascii_restart(name, 7, metadata)
+    assert warmstart.restart_points(name) == 7
+
+    name = str(tmp_path / "restart_flow.csv")
+    write_ascii_restart(name, 5, sep=", ")
+    assert warmstart.restart_points(name) == 5
+
+
+def test_restart_points_binary(tmp_path):
+    name = str(tmp_path / "restart_flow.dat")
+    with open(name, "wb") as restart_file:
+        restart_file.write(struct.pack("3i", warmstart._binaryRestart, 4, 1234))
+    assert warmstart.restart_points(name) == 1234
+    assert warmstart.restart_points(str(tmp_path / "missing.dat")) is None
+
+
+def test_restart_points_read_once(tmp_path, monkeypatch):
+    name = str(tmp_path / "restart_flow.dat")
+    write_ascii_restart(name, 7)
+    reads = []
+    read_restart_points = warmstart._read_restart_points
+
+    def counted(filename):
+        reads.append(filename)
+        return read_restart_points(filename)
+
+    monkeypatch.setattr(warmstart, "_read_restart_points", counted)
+    assert warmstart.restart_points(name) == 7
+    assert warmstart.restart_points(name) == 7
+    assert len(reads) == 1
+
+    # a new restart of the same name is read again
+    write_ascii_restart(name, 9)
+    assert warmstart.restart_points(name) == 9
+    assert len(reads) == 2
+
+
+def converged_state(converged):
+    state = SU2.io.State()
+    config = SU2.io.Config()
+    config.ITER = 100
+    history = {"Inner_Iter": [0, 1, 2, 98 if converged else 99]}
+    warmstart.record_warm_start(state, "DIRECT", history, False, config)
+    return state
+
+
+def test_record_converged():
+    assert SU2.io.warm_start_converged(converged_state(True))
+    assert not SU2.io.warm_start_converged(converged_state(False))
+    assert converged_state(True).WARM_START.DIRECT.ITERATIONS == 99
+
+    # unknown without the config, and in the time domain
+    state = SU2.io.State()
+    warmstart.record_warm_start(state, "DIRECT", {"Inner_Iter": [0, 1]}, False)
+    assert state.WARM_START.DIRECT.CONVERGED is None
+    assert not SU2.io.warm_start_converged(state)
+    config = SU2.io.Config()
+    config.ITER = 100
+    config.TIME_DOMAIN = "YES"
+    assert warmstart.config_iterations(config) is None
+
+
+def test_seed_drops_unconverged_solutions():
+    seed_state = converged_state(True)
+    seed_state.WARM_START.ADJOINT_DRAG = SU2.util.ordered_bunch(CONVERGED=False)
+    state = SU2.io.State()
+    state.FILES.DIRECT = "DSN_001/restart_flow.dat"
+    state.FILES.ADJOINT_DRAG = "DSN_001/restart_adj_cd.dat"
+    config = SU2.io.Config()
+
+    warmstart.seed_warm_start(config, state, seed_state, "DSN_001")
+
+    assert list(state.FILES.keys()) == ["DIRECT"]
+    assert state.WARM_START.DIRECT.SEED == "DSN_001"
+    assert config.RESTART_SOL == "YES"
+
+
+def design(dvs, converged):
+    config = SU2.io.Config()
+    config.DV_VALUE_NEW = dvs
+    return SimpleNamespace(config=config, state=converged_state(converged))
+
+
+def test_nearest_converged_design():
+    designs = [
+        design([0.0, 0.0], True),
+        design([1.0, 1.0], False),
+        design([2.0, 2.0], True),
+    ]
+    project = SimpleNamespace(designs=designs)
+    config = SU2.io.Config()
+    config.DV_VALUE_NEW = [1.2, 1.2]
+
+    seed = Project._converged_design(project, config, designs[1])
+    assert seed is designs[2]
+    assert Project._converged_design(project, config, designs[0]) is designs[0]
+
+    project.designs = designs[1:2]
+    assert Project._converged_design(project, config, designs[1]) is None
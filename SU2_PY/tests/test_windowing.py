@@ -0,0 +1,151 @@
+## \file test_windowing.py
+#  \brief tests of SU2.util.windowing against CWindowingTools of SU2_CFD
+#  \version 8.1.0 "Harrier"
+#
+# SU2 Project Website: https://su2code.github.io
+#
+# The SU2 Project is maintained by the SU2 Foundation
+# (http://su2foundation.org)
+#
+# Copyright 2012-2024, SU2 Contributors (cf. AUTHORS.md)
+#
+# SU2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# SU2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with SU2. If not, see <http://www.gnu.org/licenses/>.
+
+import math
+import numpy as np
+import pytest
+
+from SU2.util import windowing
+
+# ----------------------------------------------------------------------
+#  Reference, line by line port of SU2_CFD/src/output/tools/CWindowingTools.cpp
+# ----------------------------------------------------------------------
+
+
+def get_wnd_weight(wnd_fct, cur_time_iter, end_time_iter):
+    if wnd_fct == "HANN":
+        if end_time_iter == 0:
+            return 0.0
+        tau = float(cur_time_iter) / float(end_time_iter)
+        return 1.0 - math.cos(2 * math.pi * tau)
+    if wnd_fct == "HANN_SQUARE":
+        if end_time_iter == 0:
+            return 0.0
+        tau = float(cur_time_iter) / float(end_time_iter)
+        return 2.0 / 3.0 * (1 - math.cos(2 * math.pi * tau)) ** 2
+    if wnd_fct == "BUMP":
+        if cur_time_iter == 0:
+            return 0.0
+        if cur_time_iter == end_time_iter:
+            return 0.0
+        tau = float(cur_time_iter) / float(end_time_iter)
+        return 1.0 / 0.00702986 * math.exp(-1 / (tau - tau * tau))
+    return 1.0
+
+
+class WindowedAverage(object):
+    """CWindowedAverage, samples added one time iteration at a time"""
+
+    def __init__(self, wnd_fct):
+        self.wnd_fct = wnd_fct
+        self.val = 0.0
+        self.cached_sum = 0.0
+        self.values = [0.0] if wnd_fct == "SQUARE" else []
+        self.last_time_iter = None
+
+    def add_value(self, val_in, cur_time_iter, start_iter=0):
+        if cur_time_iter < start_iter:
+            return
+        window_width = cur_time_iter - start_iter + 1
+        if cur_time_iter != self.last_time_iter:
+            if cur_time_iter > start_iter:
+                self.cached_sum = self.update_cached_sum(window_width - 1)
+            self.last_time_iter = cur_time_iter
+            if self.wnd_fct != "SQUARE":
+                self.values.append(val_in)
+        else:
+            self.values[-1] = val_in
+        weight = get_wnd_weight(self.wnd_fct, window_width - 1, window_width - 1)
+        self.val = (self.cached_sum + val_in * weight) / float(window_width)
+
+    def update_cached_sum(self, window_width):
+        if self.wnd_fct == "SQUARE":
+            return self.val * window_width
+        return sum(
+            value * get_wnd_weight(self.wnd_fct, i, window_width)
+            for i, value in enumerate(self.values)
+        )
+
+
+# ----------------------------------------------------------------------
+#  Tests
+# ----------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("wnd_fct", windowing.window_functions)
+@pytest.mark.parametrize("n_samples", [1, 2, 3, 10, 101])
+def test_weights_match_cpp(wnd_fct, n_samples):
+    weights = windowing.window_weights(wnd_fct, n_samples)
+    expected = [
+        get_wnd_weight(wnd_fct, i, n_samples - 1) if wnd_fct != "SQUARE" else 1.0
+        for i in range(n_samples)
+    ]
+    assert np.allclose(weights, expected, rtol=1e-13, atol=1e-15)
+
+
+def test_weights_values():
+    assert np.allclose(windowing.window_weights("HANN", 3), [0.0, 2.0, 0.0])
+    assert np.allclose(
+        windowing.window_weights("HANN_SQUARE", 3), [0.0, 8.0 / 3.0, 0.0]
+    )
+    assert np.allclose(
+        windowing.window_weights("BUMP", 3)[1], math.exp(-4) / 0.00702986
+    )
+
+
+@pytest.mark.parametrize("wnd_fct", windowing.window_functions)
+def test_average_matches_cpp(wnd_fct):
+    values = np.sin(np.linspace(0.0, 7.0, 57)) + 0.25
+    reference = WindowedAverage(wnd_fct)
+    for i, value in enumerate(values):
+        reference.add_value(value, i)
+    average = windowing.windowed_average(values, wnd_fct)
+    assert average == pytest.approx(reference.val, rel=1e-12, abs=1e-14)
+
+
+@pytest.mark.parametrize("wnd_fct", windowing.window_functions)
+def test_average_last_samples_matches_cpp(wnd_fct):
+    values = np.cos(np.linspace(0.0, 5.0, 40))
+    start_iter = 15
+    reference = WindowedAverage(wnd_fct)
+    for i, value in enumerate(values):
+        reference.add_value(value, i, start_iter)
+    n_avg = len(values) - start_iter
+    average = windowing.windowed_average(values, wnd_fct, n_avg)
+    assert average == pytest.approx(reference.val, rel=1e-12, abs=1e-14)
+
+
+def test_windowed_history_stacks_columns():
+    history = {"LIFT": np.linspace(1.0, 2.0, 20), "DRAG": np.linspace(0.1, 0.3, 20)}
+    averages = windowing.windowed_history(history, wnd_fct="HANN", n_avg=10)
+    assert list(averages.keys()) == ["LIFT", "DRAG"]
+    for key, value in history.items():
+        assert averages[key] == pytest.approx(
+            windowing.windowed_average(value, "HANN", 10)
+        )
+
+
+def test_unknown_window():
+    with pytest.raises(ValueError):
+        windowing.window_weights("TRIANGLE", 4)